@@ -15,134 +15,43 @@ Requisitos: Python 3.8+ (Tkinter já vem com o Python padrão no Windows).
 
 from __future__ import annotations
 
+import collections                      # deque: buffer circular do log na tela
+import csv                              # Leitura do CSV de clientes (modo lote)
+import os
+import queue                            # Fila de eventos: thread de trabalho -> interface
+import sys
+import threading
+import time
 import tkinter as tk                    # Toolkit básico da interface
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path                # Manipulação elegante de caminhos (Windows/Linux/Mac)
-from typing import Callable, Iterable, Mapping, Union
-
-# ------------------------------------------------------------
-# MODELO DE ESTRUTURA
-# ------------------------------------------------------------
-# Representa a árvore de pastas que será criada.
-# • Dicionário = pasta com filhos (subpastas).
-# • {} (dict vazio) = pasta “folha” (sem filhos).
-# • Você pode renomear, adicionar ou remover nós livremente.
-ESTRUTURA_PADRAO: Mapping[str, Union[dict, list]] = {
-    "00. Editais_ANALISAR": {},
-    "01. Licitacao": {
-        "01. Participar": {
-            "01. JANEIRO": {},
-            "02. FEVEREIRO": {},
-            "03. MARCO": {},
-            "04. ABRIL": {},
-            "05. MAIO": {},
-            "06. JUNHO": {},
-            "07. JULHO": {},
-            "08. AGOSTO": {},
-            "09. SETEMBRO": {},
-            "10. OUTUBRO": {},
-            "11. NOVEMBRO": {},
-            "12. DEZEMBRO": {},
-        },
-        "02. Vencedora": {},
-        "03. Declinada": {},
-        "04. Suspensa": {},
-        "05. Modelos_Padrao": {
-            "DECLARACAO": {},
-            "PROPOSTA": {},
-            "PLANILHA": {},
-        },
-    },
-    "02. Empresa": {
-        "01. CNPJ": {},
-        "02. Socios": {},
-        "03. Alvara": {},
-        "04. Dados_Bancarios": {},
-        "05. Contrato_Social": {},
-        "06. Balanco_Patrimonial": {},
-        "07. Certidoes": {},
-        "08. Acessos": {},
-        "09. CAF_Digital_BA": {},
-        "10. SICAF": {},
-        "11. Compras_Salvador": {},
-        "12. Encargos_Tributacao": {},
-        "13. SMS": {},
-        "14. Compras_FIEB": {},
-        "15. Impostos": {},
-        "16. Juridico": {},
-        "17. Financeiro": {},
-        "18. Antecipa_EMBASA": {},
-        "19. Inscricao_Estadual": {},
-        "20. Inscricao_Municipal": {},
-    },
-    "03. Qualificacao_Tecnica": {
-        "01. RT": {},
-        "02. ACT": {},
-        "03. CAT": {},
-        "04. CAO": {},
-        "05. CREA_PJ": {},
-        "06. CREA_PF": {},
-        "07. ART_CONTRATOS": {},
-    },
-    "04. Orcamentos_Propostas": {},
-    "05. Planejamento_Gestao": {},
-    "06. Biblioteca": {
-        "01. Logo_Marca": {},
-        "02. Carimbos": {},
-        "03. Assinatura": {},
-        "04. Modelos_Administrativos": {
-            "01. Recurso": {},
-            "02. Contrarrazao": {},
-            "03. Impugnacao": {},
-            "04. Esclarecimento": {},
-        },
-    },
-}
-
-
-# ------------------------------------------------------------
-# FUNÇÕES DE LÓGICA (independentes da interface)
-# ------------------------------------------------------------
-def criar_arvore(
-    base: Path,
-    modelo: Union[Mapping[str, Union[dict, list]], Iterable[str]],
-    log: Callable[[str], None] = lambda _msg: None,
-    nivel: int = 0,
-) -> None:
-    """
-    Cria diretórios recursivamente a partir de um 'modelo'.
-
-    Parâmetros:
-    • base: pasta raiz onde a estrutura será criada.
-    • modelo: dict (pastas -> filhos) OU lista (pastas folhas).
-    • log: função de logging (para imprimir na UI).
-    • nivel: profundidade atual (apenas para formatação do log).
-
-    Observações:
-    • Se a pasta já existir, não dá erro (exist_ok=True).
-    • Mantém a ordem declarada (Python 3.7+ preserva ordem de dict).
-    """
-    # Se vier um dict, iteramos pelos pares (nome, subárvore).
-    if isinstance(modelo, Mapping):
-        itens = modelo.items()
-    else:
-        # Se vier uma lista, cada item é uma pasta “folha”.
-        itens = [(nome, {}) for nome in modelo]
-
-    for nome, sub in itens:
-        destino = base / str(nome)
-
-        try:
-            # Cria a pasta atual (e qualquer pai ausente)
-            destino.mkdir(parents=True, exist_ok=True)
-            log(f"{'  ' * nivel}Criado: {destino}")
-        except Exception as e:
-            # Registra e continua (não aborta a execução inteira)
-            log(f"{'  ' * nivel}[ERRO] {destino} -> {e}")
-
-        # Caso haja filhos (subpastas), chamamos recursivamente
-        if isinstance(sub, (Mapping, list)) and sub:
-            criar_arvore(destino, sub, log, nivel + 1)
+from typing import Any, Callable, List, Optional, Sequence
+
+# Toda a lógica (sem Tkinter) fica no pacote licitagov_estruturas, que também
+# pode ser usado sem interface: python -m licitagov_estruturas --help
+# ESTRUTURA_PADRAO e criar_arvore continuam acessíveis por este módulo
+# (scripts antigos fazem "from LicitagovEstruturasApp import ...").
+from licitagov_estruturas import (
+    ESTRUTURA_PADRAO,  # noqa: F401 (reexportado)
+    TIPO_PADRAO,
+    ErroModelo,
+    ModeloCarregado,
+    Progresso,
+    TokenCancelamento,
+    carregar_modelo,
+    criar_arvore,
+    ler_clientes_csv,
+    listar_tipos,
+    planos_por_tipo,
+    provisionar_lote,
+)
+from licitagov_estruturas.perfil import Perfil
+from licitagov_estruturas.registro import abrir_log_arquivo, caminho_log
+from licitagov_estruturas.residente import ServidorResidente, atender_relancamento
+
+# Usada por medir_inicializacao.py: arquivo onde anotar a hora em que a
+# janela apareceu (o aplicativo fecha logo em seguida).
+VARIAVEL_MEDIR_INICIO = "LICITAGOV_MEDIR_INICIO"
 
 
 # ------------------------------------------------------------
@@ -154,11 +63,50 @@ class App(tk.Tk):
     Optamos por uma classe para:
     • Encapsular estados (ex.: campo de caminho, caixa de log).
     • Manter o código organizado e fácil de evoluir.
+
+    A criação roda em uma thread separada; o log chega por uma fila que a
+    janela esvazia periodicamente (after), inserindo as linhas em blocos.
+    Assim a janela não congela nem redesenha a cada pasta.
+
+    A caixa de log mostra só as últimas 'linhas_log' linhas (buffer circular);
+    o log completo vai para um arquivo rotativo (ver registro.py). Memória e
+    custo de inserção ficam constantes, não importa o tamanho da execução.
+
+    Diagnóstico (oculto): clique direito na caixa de log ou Ctrl+Shift+P liga
+    o perfilamento (cProfile) das próximas execuções; o mesmo que iniciar
+    com --profile. Os arquivos vão para a pasta de logs.
+
+    Modo residente (--residente): fechar a janela só a esconde; aberturas
+    seguintes (com ou sem --residente) a trazem de volta (ver residente.py). Para sair de verdade,
+    use o menu oculto ou abra com --encerrar.
     """
 
-    def __init__(self) -> None:
+    INTERVALO_FILA_MS = 50        # De quanto em quanto tempo a fila de log é esvaziada
+    MAX_LINHAS_POR_CICLO = 5000   # Limite por ciclo (a janela continua respondendo)
+    LINHAS_LOG = 1000             # Linhas mantidas na caixa de log (padrão)
+    INTERVALO_PROGRESSO_MS = 250  # Frequência fixa de atualização da barra de progresso
+
+    def __init__(
+        self,
+        linhas_log: int = LINHAS_LOG,
+        perfilar: bool = False,
+        residente: bool = False,
+        caminho: str = "",
+    ) -> None:
         super().__init__()
 
+        # Buffer circular com as linhas visíveis + log completo em disco
+        self._linhas_log = max(1, linhas_log)
+        self._buffer_log: "collections.deque[str]" = collections.deque(maxlen=self._linhas_log)
+        self._linhas_na_tela = 0
+        self._arquivo_log = abrir_log_arquivo()
+
+        # Eventos vindos da thread de trabalho: ("log", texto) ou ("fim", callback, resultado, erro)
+        self._fila: "queue.Queue[tuple]" = queue.Queue()
+        self._trabalho: Optional[threading.Thread] = None
+        self._progresso: Optional[Progresso] = None
+        self._cancelamento: Optional[TokenCancelamento] = None
+
         # --- Metadados da janela ---
         self.title("Licitagov — Criador de Estruturas")
         self.geometry("760x460")   # Tamanho inicial da janela
@@ -178,10 +126,21 @@ class App(tk.Tk):
         ttk.Label(
             root,
             text="Cole o caminho da pasta do cliente ou selecione:",
-        ).grid(row=0, column=0, columnspan=3, sticky="w", pady=(0, 8))
+        ).grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 8))
+
+        # Tipo de cliente = modelo (modelos/<tipo>.json|.toml; "padrao" = embutido)
+        frm_tipo = ttk.Frame(root)
+        frm_tipo.grid(row=0, column=2, sticky="e", pady=(0, 8))
+        ttk.Label(frm_tipo, text="Tipo:").pack(side="left", padx=(0, 4))
+        self.var_tipo = tk.StringVar(value=TIPO_PADRAO)
+        self.cmb_tipo = ttk.Combobox(
+            frm_tipo, textvariable=self.var_tipo, state="readonly", width=16,
+            values=list(listar_tipos()), postcommand=self._atualizar_tipos,
+        )
+        self.cmb_tipo.pack(side="left")
 
         # --- Linha 1: Campo de caminho + botão "Selecionar pasta..." ---
-        self.var_path = tk.StringVar()
+        self.var_path = tk.StringVar(value=caminho)
         self.entry_path = ttk.Entry(root, textvariable=self.var_path)
         self.entry_path.grid(row=1, column=0, columnspan=2, sticky="ew", padx=(0, 8))
         root.columnconfigure(0, weight=1)  # Permite expandir a coluna 0
@@ -193,12 +152,56 @@ class App(tk.Tk):
         ).grid(row=1, column=2, sticky="ew")
 
         # --- Linha 2: Botões de ação ---
-        self.btn_criar = ttk.Button(root, text="Criar estrutura", command=self.acao_criar)
-        self.btn_criar.grid(row=2, column=0, sticky="w", pady=(12, 8))
+        frm_acoes = ttk.Frame(root)
+        frm_acoes.grid(row=2, column=0, columnspan=2, sticky="w", pady=(12, 8))
+
+        self.btn_criar = ttk.Button(frm_acoes, text="Criar estrutura", command=self.acao_criar)
+        self.btn_criar.pack(side="left")
+
+        self.btn_lote = ttk.Button(frm_acoes, text="Criar em lote (CSV)…", command=self.acao_lote)
+        self.btn_lote.pack(side="left", padx=(8, 0))
 
-        ttk.Button(root, text="Limpar log", command=self.limpar_log).grid(
-            row=2, column=1, sticky="w", pady=(12, 8)
+        # Só fica ativo durante uma execução
+        self.btn_cancelar = ttk.Button(
+            frm_acoes, text="Cancelar", command=self.acao_cancelar, state="disabled"
         )
+        self.btn_cancelar.pack(side="left", padx=(8, 0))
+
+        ttk.Button(frm_acoes, text="Limpar log", command=self.limpar_log).pack(
+            side="left", padx=(8, 0)
+        )
+
+        # Lista antes e só cria as pastas que faltam (desmarcado: mkdir em todas)
+        self.var_incremental = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            frm_acoes, text="Só o que falta", variable=self.var_incremental
+        ).pack(side="left", padx=(12, 0))
+
+        # Grava o marcador (.licitagov_estrutura.json) e pula clientes que já o têm
+        self.var_marcador = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            frm_acoes, text="Usar marcador", variable=self.var_marcador
+        ).pack(side="left", padx=(12, 0))
+
+        # Ignora o marcador e confere pasta a pasta (se alguém apagou pastas à mão)
+        self.var_verificar = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            frm_acoes, text="Forçar verificação", variable=self.var_verificar
+        ).pack(side="left", padx=(12, 0))
+
+        # Quantas pastas criar ao mesmo tempo (acima de 1 ajuda em \\Servidor\...)
+        frm_par = ttk.Frame(root)
+        frm_par.grid(row=2, column=2, sticky="e", pady=(12, 8))
+        ttk.Label(frm_par, text="Em paralelo:").pack(side="left", padx=(0, 4))
+        self.var_trabalhadores = tk.IntVar(value=1)
+        ttk.Spinbox(
+            frm_par, from_=1, to=32, width=4, textvariable=self.var_trabalhadores
+        ).pack(side="left")
+        # Ajusta o paralelismo ao servidor (o número acima vira o teto)
+        self.var_adaptativo = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            frm_par, text="Automático", variable=self.var_adaptativo
+        ).pack(side="left", padx=(8, 0))
 
         # --- Linha 3: Caixa de log + Scrollbar ---
         self.txt_log = tk.Text(root, height=14, wrap="word")
@@ -209,25 +212,264 @@ class App(tk.Tk):
         sb.grid(row=3, column=3, sticky="ns")
         self.txt_log.configure(yscrollcommand=sb.set)
 
-        # --- Linha 4: Rodapé (uma dica de uso) ---
+        # Menu oculto de diagnóstico (clique direito no log / Ctrl+Shift+P)
+        self.var_perfilar = tk.BooleanVar(value=perfilar)
+        self.menu_diagnostico = tk.Menu(self, tearoff=0)
+        self.menu_diagnostico.add_checkbutton(
+            label="Perfilar execuções (cProfile)", variable=self.var_perfilar,
+            command=self._avisar_perfil,
+        )
+        self.txt_log.bind("<Button-3>", self._abrir_menu_diagnostico)
+        self.bind_all("<Control-Shift-P>", self._alternar_perfil)
+
+        # Modo residente: atende as próximas aberturas e só esconde ao fechar
+        self._residente: Optional[ServidorResidente] = None
+        if residente:
+            servidor = ServidorResidente(lambda argv: self._fila.put(("ativar", argv)))
+            if servidor.iniciar():
+                self._residente = servidor
+                self.protocol("WM_DELETE_WINDOW", self.withdraw)
+                self.menu_diagnostico.add_separator()
+                self.menu_diagnostico.add_command(label="Sair do modo residente", command=self.encerrar)
+
+        # --- Linha 4: Progresso (barra + pastas/s + tempo restante) ---
+        self.barra = ttk.Progressbar(root, mode="determinate", maximum=1)
+        self.barra.grid(row=4, column=0, columnspan=2, sticky="ew", pady=(8, 0), padx=(0, 8))
+        self.var_progresso = tk.StringVar(value="")
+        ttk.Label(root, textvariable=self.var_progresso, width=38).grid(
+            row=4, column=2, columnspan=2, sticky="w", pady=(8, 0)
+        )
+
+        # --- Linha 5: Rodapé (uma dica de uso) ---
         ttk.Label(
             root,
             text="Dica: caminhos como C:\\Clientes\\EmpresaX ou \\\\Servidor\\Compartilhamento são aceitos.",
             foreground="#555",
-        ).grid(row=4, column=0, columnspan=3, sticky="w", pady=(8, 0))
+        ).grid(row=5, column=0, columnspan=3, sticky="w", pady=(8, 0))
+
+        # Começa a esvaziar a fila de log
+        self.after(self.INTERVALO_FILA_MS, self._drenar_fila)
+        arquivo = caminho_log(self._arquivo_log)
+        if arquivo is not None:
+            self.log(f"Log completo em: {arquivo}")
+
+        if os.environ.get(VARIAVEL_MEDIR_INICIO):
+            self.bind("<Map>", self._medir_inicio, add="+")
 
     # ---------------------------
     # Utilitários de interface
     # ---------------------------
     def log(self, msg: str) -> None:
-        """Escreve uma linha na caixa de log e rola até o fim."""
-        self.txt_log.insert("end", msg + "\n")
+        """
+        Grava a linha no arquivo de log e a enfileira para a caixa de log.
+
+        Pode ser chamado de qualquer thread; quem escreve no widget é sempre
+        _drenar_fila, na thread da interface.
+        """
+        self._arquivo_log.info(msg)
+        self._fila.put(("log", msg))
+
+    def _drenar_fila(self) -> None:
+        """Insere em bloco as linhas pendentes e trata o fim das execuções."""
+        linhas = []
+        fins = []
+        try:
+            while len(linhas) < self.MAX_LINHAS_POR_CICLO:
+                evento = self._fila.get_nowait()
+                if evento[0] == "log":
+                    linhas.append(evento[1])
+                elif evento[0] == "ativar":
+                    self._ativar(evento[1])
+                else:
+                    fins.append(evento)
+                    break  # Mostra o log até aqui antes de tratar o fim
+        except queue.Empty:
+            pass
+
+        if linhas:
+            self._mostrar_linhas(linhas)
+
+        for _tipo, ao_terminar, resultado, erro in fins:
+            self._trabalho = None
+            self._cancelamento = None
+            self._habilitar_acoes(True)
+            self._atualizar_progresso()  # Última leitura (100% se terminou)
+            self._progresso = None
+            ao_terminar(resultado, erro)
+
+        self.after(self.INTERVALO_FILA_MS, self._drenar_fila)
+
+    def _mostrar_linhas(self, linhas) -> None:
+        """Acrescenta linhas à caixa de log, descartando as mais antigas além do limite."""
+        self._buffer_log.extend(linhas)
+
+        if len(linhas) >= self._linhas_log:
+            # O bloco sozinho já enche a tela: redesenha só o final do buffer
+            self.txt_log.delete("1.0", "end")
+            self.txt_log.insert("end", "\n".join(self._buffer_log) + "\n")
+            self._linhas_na_tela = len(self._buffer_log)
+        else:
+            self.txt_log.insert("end", "\n".join(linhas) + "\n")
+            self._linhas_na_tela += len(linhas)
+            excesso = self._linhas_na_tela - self._linhas_log
+            if excesso > 0:
+                self.txt_log.delete("1.0", f"{excesso + 1}.0")
+                self._linhas_na_tela -= excesso
+
         self.txt_log.see("end")
-        self.update_idletasks()
+
+    def _atualizar_progresso(self) -> None:
+        """Atualiza barra, vazão e tempo restante; reagenda-se enquanto houver execução."""
+        progresso = self._progresso
+        if progresso is None:
+            return
+
+        feitos, taxa, restante = progresso.medir()
+        self.barra.config(maximum=max(1, progresso.total), value=feitos)
+        texto = f"{feitos}/{progresso.total} pastas — {taxa:.1f} pastas/s".replace(".", ",")
+        if feitos >= progresso.total:
+            texto += " — concluído"
+        elif restante is not None:
+            minutos, segundos = divmod(int(restante + 0.5), 60)
+            texto += f" — faltam {minutos:02d}:{segundos:02d}"
+        elif taxa == 0 and feitos:
+            texto += " — sem avanço"
+        self.var_progresso.set(texto)
+
+        if self._trabalho is not None:
+            self.after(self.INTERVALO_PROGRESSO_MS, self._atualizar_progresso)
+
+    def _ativar(self, argv: List[str]) -> None:
+        """Outra abertura (modo residente) chegou: mostra a janela e aplica os argumentos."""
+        if "--encerrar" in argv:
+            self.encerrar()
+            return
+        caminho = caminho_dos_argumentos(argv)
+        if caminho and self._trabalho is None:
+            self.var_path.set(caminho)
+        if "--profile" in argv:
+            self.var_perfilar.set(True)
+        self.deiconify()
+        self.lift()
+        self.focus_force()
+
+    def encerrar(self) -> None:
+        """Fecha de verdade (inclusive no modo residente)."""
+        if self._residente is not None:
+            self._residente.encerrar()
+            self._residente = None
+        self.destroy()
+
+    def _medir_inicio(self, evento) -> None:
+        """Anota quando a janela principal apareceu e encerra (medir_inicializacao.py)."""
+        if evento.widget is not self:
+            return
+        self.unbind("<Map>")
+        try:
+            with open(os.environ[VARIAVEL_MEDIR_INICIO], "w", encoding="utf-8") as f:
+                f.write(repr(time.time()))
+        finally:
+            self.after(0, self.encerrar)
+
+    def _abrir_menu_diagnostico(self, evento) -> None:
+        try:
+            self.menu_diagnostico.tk_popup(evento.x_root, evento.y_root)
+        finally:
+            self.menu_diagnostico.grab_release()
+
+    def _alternar_perfil(self, _evento=None) -> None:
+        self.var_perfilar.set(not self.var_perfilar.get())
+        self._avisar_perfil()
+
+    def _avisar_perfil(self) -> None:
+        if self.var_perfilar.get():
+            self.log("Perfilamento ligado: as próximas execuções gravam .pstats/.txt na pasta de logs.")
+        else:
+            self.log("Perfilamento desligado.")
+
+    def _habilitar_acoes(self, habilitar: bool) -> None:
+        """Liga/desliga os botões que iniciam uma execução."""
+        estado = "normal" if habilitar else "disabled"
+        self.btn_criar.config(state=estado)
+        self.btn_lote.config(state=estado)
+        self.btn_cancelar.config(state="disabled" if habilitar else "normal")
+
+    def _em_segundo_plano(
+        self,
+        tarefa: Callable[[], Any],
+        ao_terminar: Callable[[Any, Optional[BaseException]], None],
+        progresso: Optional[Progresso] = None,
+        cancelamento: Optional[TokenCancelamento] = None,
+    ) -> None:
+        """
+        Executa 'tarefa' em uma thread de trabalho.
+
+        Ao final, 'ao_terminar(resultado, erro)' é chamado na thread da
+        interface (depois de todo o log da tarefa ter sido exibido). Se
+        'progresso' for informado, a barra é atualizada em ritmo fixo; o botão
+        "Cancelar" aciona 'cancelamento'. Com o perfilamento ligado, a
+        tarefa roda sob cProfile (dentro da própria thread de trabalho).
+        """
+        perfil = Perfil("gui") if self.var_perfilar.get() else None
+
+        def executar() -> None:
+            try:
+                if perfil is None:
+                    resultado, erro = tarefa(), None
+                else:
+                    with perfil:
+                        resultado, erro = tarefa(), None
+            except Exception as e:
+                resultado, erro = None, e
+            if perfil is not None:
+                if perfil.arquivos:
+                    self.log(f"Perfil gravado em: {perfil.arquivos[0]} (resumo: {perfil.arquivos[1]})")
+                else:
+                    self.log(f"[AVISO] Não foi possível gravar o perfil -> {perfil.erro}")
+            self._fila.put(("fim", ao_terminar, resultado, erro))
+
+        self._habilitar_acoes(False)
+        self._progresso = progresso
+        self._cancelamento = cancelamento
+        self.var_progresso.set("")
+        self.barra.config(value=0)
+        self._trabalho = threading.Thread(target=executar, name="licitagov-criacao", daemon=True)
+        self._trabalho.start()
+        self._atualizar_progresso()
 
     def limpar_log(self) -> None:
-        """Limpa todo o conteúdo da caixa de log."""
+        """Limpa a caixa de log (o arquivo de log completo é mantido)."""
         self.txt_log.delete("1.0", "end")
+        self._buffer_log.clear()
+        self._linhas_na_tela = 0
+
+    def _trabalhadores(self) -> int:
+        """Lê o campo "Em paralelo" (valores inválidos viram 1)."""
+        try:
+            return max(1, int(self.var_trabalhadores.get()))
+        except (tk.TclError, ValueError):
+            return 1
+
+    def _atualizar_tipos(self) -> None:
+        """Relista os modelos ao abrir a caixa (arquivos novos aparecem sem reiniciar)."""
+        self.cmb_tipo.configure(values=list(listar_tipos()))
+
+    def _modelo(self) -> Optional[ModeloCarregado]:
+        """Modelo do tipo escolhido (None, com aviso, se o arquivo for inválido)."""
+        try:
+            modelo = carregar_modelo(self.var_tipo.get() or TIPO_PADRAO)
+        except ErroModelo as e:
+            messagebox.showerror("Modelo inválido", str(e))
+            return None
+        self.log(f"Modelo: {modelo.tipo} ({len(modelo.plano)} pastas, {modelo.origem})")
+        return modelo
+
+    def acao_cancelar(self) -> None:
+        """Pede para a execução em andamento parar (entre uma pasta e outra)."""
+        if self._cancelamento is not None and not self._cancelamento.cancelado:
+            self._cancelamento.cancelar()
+            self.btn_cancelar.config(state="disabled")
+            self.log("Cancelando… (aguardando a pasta em andamento terminar)")
 
     def selecionar_pasta(self) -> None:
         """Abre um seletor de pastas e preenche o campo com o caminho escolhido."""
@@ -240,8 +482,9 @@ class App(tk.Tk):
     # ---------------------------
     def acao_criar(self) -> None:
         """
-        Valida o caminho informado, garante que exista (cria se necessário)
-        e dispara a criação recursiva da estrutura.
+        Valida o caminho informado e dispara, em segundo plano, a criação
+        da estrutura — criando a pasta base se necessário. "Só o que falta"
+        e "Usar marcador" ligam os modos incremental e de marcador.
         """
         caminho = self.var_path.get().strip()
 
@@ -249,38 +492,190 @@ class App(tk.Tk):
             messagebox.showwarning("Atenção", "Informe ou selecione a pasta do cliente.")
             return
 
+        modelo = self._modelo()
+        if modelo is None:
+            return
         base = Path(caminho)
+        trabalhadores = self._trabalhadores()
+        incremental = self.var_incremental.get()
+        marcador = self.var_marcador.get()
+        verificar = self.var_verificar.get()
+        adaptativo = self.var_adaptativo.get()
+        # Total conhecido antes de começar: nós do modelo (plano compilado)
+        progresso = Progresso(total=len(modelo.plano))
+        cancelamento = TokenCancelamento()
+
+        def tarefa():
+            # Se a pasta base não existir, tentamos criá-la (com pais, se preciso)
+            if not base.exists():
+                try:
+                    base.mkdir(parents=True, exist_ok=True)
+                    self.log(f"Pasta base inexistente — criada: {base}")
+                except Exception as e:
+                    raise RuntimeError(f"Não foi possível criar a pasta base:\n{e}") from e
+
+            self.log(f"Iniciando criação em: {base}")
+            return criar_arvore(
+                base,
+                modelo.plano,
+                log=self.log,
+                incremental=incremental,
+                trabalhadores=trabalhadores,
+                marcador=marcador,
+                tipo_modelo=modelo.tipo,
+                verificar=verificar,
+                progresso=progresso,
+                cancelamento=cancelamento,
+                adaptativo=adaptativo,
+            )
+
+        self._em_segundo_plano(tarefa, self._fim_criar, progresso, cancelamento)
+
+    def _fim_criar(self, resultado, erro: Optional[BaseException]) -> None:
+        """Mostra o resultado de acao_criar (na thread da interface)."""
+        if erro is not None:
+            # Qualquer erro inesperado é mostrado e registrado
+            self.log(f"[ERRO] {erro}")
+            messagebox.showerror("Erro", f"Ocorreu um erro:\n{erro}")
+            return
 
-        # Se a pasta base não existir, tentamos criá-la (com pais, se preciso)
-        if not base.exists():
-            try:
-                base.mkdir(parents=True, exist_ok=True)
-                self.log(f"Pasta base inexistente — criada: {base}")
-            except Exception as e:
-                messagebox.showerror("Erro", f"Não foi possível criar a pasta base:\n{e}")
-                return
+        if resultado.cancelado:
+            messagebox.showinfo(
+                "Cancelado",
+                f"Execução cancelada: {len(resultado.criadas)} pasta(s) criada(s).\n"
+                "Rode \"Criar estrutura\" de novo para completar a partir daí.",
+            )
+            return
+        if resultado.pulado:
+            self.log("Concluído: estrutura já estava completa (marcador).")
+        else:
+            self.log(
+                f"Concluído: {len(resultado.criadas)} criadas, "
+                f"{len(resultado.existentes)} já existiam, {len(resultado.erros)} erros."
+            )
+        if resultado.concorrencia is not None:
+            c = resultado.concorrencia
+            self.log(
+                f"Paralelismo automático: terminou em {c['final']} (pico {c['pico']}); "
+                f"{c['retentativas']} nova(s) tentativa(s)."
+            )
+        if resultado.ok:
+            messagebox.showinfo("Pronto", "Estrutura criada com sucesso!")
+        else:
+            messagebox.showwarning(
+                "Atenção", f"Estrutura criada com {len(resultado.erros)} erro(s). Veja o log."
+            )
 
-        # Feedback visual: desabilita o botão enquanto executa
-        self.btn_criar.config(state="disabled")
-        self.log(f"Iniciando criação em: {base}")
+    # ---------------------------
+    # Ação em lote (CSV)
+    # ---------------------------
+    def acao_lote(self) -> None:
+        """
+        Lê um CSV de clientes (nome;cnpj;raiz[;tipo]), cria em segundo plano a
+        estrutura de todos e grava um relatório "<csv>_relatorio.csv" ao
+        lado do arquivo.
+        """
+        arquivo = filedialog.askopenfilename(
+            title="Selecione o CSV de clientes",
+            filetypes=[("CSV", "*.csv"), ("Todos os arquivos", "*.*")],
+        )
+        if not arquivo:
+            return
 
         try:
-            # Cria toda a árvore e faz log em cada passo
-            criar_arvore(base, ESTRUTURA_PADRAO, log=self.log)
-            self.log("Concluído.")
-            messagebox.showinfo("Pronto", "Estrutura criada com sucesso!")
-        except Exception as e:
-            # Qualquer erro inesperado é mostrado e registrado
-            self.log(f"[ERRO] {e}")
-            messagebox.showerror("Erro", f"Ocorreu um erro:\n{e}")
-        finally:
-            # Reabilita o botão, independente do resultado
-            self.btn_criar.config(state="normal")
+            clientes = ler_clientes_csv(Path(arquivo))
+        except (OSError, ValueError, csv.Error) as e:
+            messagebox.showerror("Erro", f"Não foi possível ler o CSV:\n{e}")
+            return
+        if not clientes:
+            messagebox.showwarning("Atenção", "O CSV não tem nenhum cliente.")
+            return
+
+        modelo = self._modelo()
+        if modelo is None:
+            return
+        destino = Path(arquivo).with_name(Path(arquivo).stem + "_relatorio.csv")
+        trabalhadores = self._trabalhadores()
+        incremental = self.var_incremental.get()
+        marcador = self.var_marcador.get()
+        verificar = self.var_verificar.get()
+        adaptativo = self.var_adaptativo.get()
+        # Coluna "tipo" do CSV: cada tipo é carregado uma vez (inválido = clientes dele falham)
+        planos = planos_por_tipo(clientes, modelo.plano)
+        for tipo, plano in planos.items():
+            if isinstance(plano, ErroModelo):
+                self.log(f"[AVISO] Tipo '{tipo}' inválido: {plano}")
+        progresso = Progresso(
+            total=sum(len(p) for p in (planos[c.tipo] for c in clientes) if not isinstance(p, ErroModelo))
+        )
+        cancelamento = TokenCancelamento()
+        self.log(f"Iniciando lote com {len(clientes)} cliente(s): {arquivo}")
+
+        def tarefa():
+            relatorio = provisionar_lote(
+                clientes,
+                modelo.plano,
+                log=self.log,
+                incremental=incremental,
+                trabalhadores=trabalhadores,
+                marcador=marcador,
+                tipo_modelo=modelo.tipo,
+                verificar=verificar,
+                progresso=progresso,
+                cancelamento=cancelamento,
+                adaptativo=adaptativo,
+            )
+            relatorio.escrever_csv(destino)
+            return relatorio
+
+        def ao_terminar(relatorio, erro: Optional[BaseException]) -> None:
+            if erro is not None:
+                self.log(f"[ERRO] {erro}")
+                messagebox.showerror("Erro", f"Ocorreu um erro:\n{erro}")
+                return
+            resumo = (
+                f"{relatorio.contar('OK')} OK, {relatorio.contar('COM ERROS')} com erros, "
+                f"{relatorio.contar('FALHOU')} falharam."
+            )
+            if relatorio.contar("CANCELADO"):
+                resumo += f" {relatorio.contar('CANCELADO')} cancelados."
+            self.log(f"Lote concluído: {resumo} Relatório: {destino}")
+            messagebox.showinfo("Lote concluído", f"{resumo}\n\nRelatório salvo em:\n{destino}")
+
+        self._em_segundo_plano(tarefa, ao_terminar, progresso, cancelamento)
 
 
 # ------------------------------------------------------------
 # PONTO DE ENTRADA
 # ------------------------------------------------------------
-if __name__ == "__main__":
+def caminho_dos_argumentos(argv: Sequence[str]) -> str:
+    """Primeiro argumento que não é opção (pasta do cliente para preencher o campo)."""
+    return next((a for a in argv if not a.startswith("--")), "")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Abre o aplicativo. Opções (também valem no .exe):
+
+    • caminho: já abre com a pasta do cliente preenchida.
+    • --profile: perfila todas as execuções.
+    • --residente: fica em segundo plano.
+    • --encerrar: fecha a instância residente.
+
+    Com uma instância residente aberta, qualquer abertura (com estas
+    opções ou nenhuma) entrega os argumentos a ela e termina na hora,
+    antes de criar a janela (ver atender_relancamento).
+    """
+    argumentos = list(sys.argv[1:] if argv is None else argv)
+    if atender_relancamento(argumentos):
+        return
     # Inicia a aplicação. O mainloop mantém a janela “viva” até o usuário fechar.
-    App().mainloop()
\ No newline at end of file
+    App(
+        perfilar="--profile" in argumentos,
+        residente="--residente" in argumentos,
+        caminho=caminho_dos_argumentos(argumentos),
+    ).mainloop()
+
+
+if __name__ == "__main__":
+    main()
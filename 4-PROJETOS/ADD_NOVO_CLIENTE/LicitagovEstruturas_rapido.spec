@@ -0,0 +1,98 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Perfil de build voltado para a INICIALIZAÇÃO (alternativa ao
+# LicitagovEstruturas.spec, que gera um .exe único com UPX):
+#
+# • Pasta (one-dir) em vez de arquivo único: nada é extraído para %TEMP% a
+#   cada abertura, e o antivírus examina os arquivos uma vez só.
+# • optimize=2: bytecode sem docstrings/asserts (o app não usa __doc__).
+# • Módulos da biblioteca padrão que o app não usa ficam de fora.
+# • UPX desligado nas DLLs grandes (Python, Tcl/Tk, runtime do VC), que
+#   custam mais para descompactar na carga do que economizam em disco.
+#
+#   pyinstaller LicitagovEstruturas_rapido.spec
+#   -> dist\LicitagovEstruturas_rapido\LicitagovEstruturas.exe
+#
+# Para escolher entre os dois builds com dados: medir_inicializacao.py.
+
+import sys
+
+# Nunca excluir aqui: sqlite3, cProfile/pstats (--profile), tracemalloc,
+# socket, pickle, tomllib, difflib, urllib (usado pelo pathlib).
+EXCLUIR = [
+    'asyncio',
+    'curses',
+    'distutils',
+    'doctest',
+    'email',
+    'ftplib',
+    'html',
+    'http',
+    'idlelib',
+    'lib2to3',
+    'multiprocessing',
+    'pdb',
+    'pydoc',
+    'pydoc_data',
+    'ssl',
+    'test',
+    'tkinter.test',
+    'turtle',
+    'turtledemo',
+    'unittest',
+    'xml',
+    'xmlrpc',
+]
+
+SEM_UPX = [
+    f'python{sys.version_info[0]}{sys.version_info[1]}.dll',
+    f'python{sys.version_info[0]}.dll',
+    'tcl86t.dll',
+    'tk86t.dll',
+    'vcruntime140.dll',
+    'vcruntime140_1.dll',
+    '_tkinter.pyd',
+]
+
+a = Analysis(
+    ['LicitagovEstruturasApp.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=EXCLUIR,
+    noarchive=False,
+    optimize=2,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='LicitagovEstruturas',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=True,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=['logo.ico'],
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=True,
+    upx_exclude=SEM_UPX,
+    name='LicitagovEstruturas_rapido',
+)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""
+Licitagov — Criador de Estruturas de Pastas (núcleo, sem interface)
+-------------------------------------------------------------------
+Tudo o que cria/verifica a árvore de pastas dos clientes, sem depender do
+Tkinter. É usado pela janela (LicitagovEstruturasApp.py) e pela linha de
+comando:
+
+    python -m licitagov_estruturas create "C:\\Clientes\\EmpresaX"
+    python -m licitagov_estruturas batch clientes.csv --jobs 8
+    python -m licitagov_estruturas auditar "\\\\Servidor\\Clientes" --saida auditoria.jsonl
+    python -m licitagov_estruturas migrar "\\\\Servidor\\Clientes" --ensaio
+    python -m licitagov_estruturas indice faltando "07. Certidoes"
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# Para IDEs e verificadores de tipo (e para o PyInstaller achar os
+# submódulos); em execução, ver __getattr__
+if TYPE_CHECKING:
+    from .auditoria import AuditoriaCliente, ResumoAuditoria, auditar_cliente, auditar_raiz
+    from .concorrencia import ControleConcorrencia, SistemaResiliente
+    from .indice import IndiceClientes, ResumoAtualizacao
+    from .instrumentacao import Instrumentacao, MedicaoNo
+    from .lote import (
+        COLUNAS_LOTE,
+        ClienteLote,
+        ItemLote,
+        RelatorioLote,
+        ler_clientes_csv,
+        planos_por_tipo,
+        provisionar_lote,
+    )
+    from .migracoes import (
+        MIGRACOES,
+        MigracaoCliente,
+        Passo,
+        ResumoMigracao,
+        adicionar,
+        migrar_cliente,
+        migrar_raiz,
+        mover,
+        renomear,
+    )
+    from .modelo import ESTRUTURA_PADRAO, TIPO_PADRAO, VERSAO_ESTRUTURA
+    from .modelos_externos import (
+        ErroModelo,
+        ModeloCarregado,
+        carregar_modelo,
+        estender,
+        listar_tipos,
+        validar_modelo,
+    )
+    from .motor import (
+        MARCADOR,
+        Progresso,
+        ResultadoCriacao,
+        TokenCancelamento,
+        criar_arvore,
+        gravar_marcador,
+        ler_marcador,
+    )
+    from .perfil import Perfil
+    from .plano import NoPlano, PlanoCriacao, compilar_plano, hash_modelo
+    from .sistema_arquivos import (
+        SISTEMA_LOCAL,
+        SistemaArquivos,
+        SistemaContador,
+        SistemaLatente,
+        SistemaLocal,
+        SistemaMemoria,
+    )
+
+# Os nomes abaixo são importados só no primeiro uso (ver __getattr__):
+# "import licitagov_estruturas" — e, com ele, a linha de comando — não
+# carrega sqlite3, pickle, difflib, cProfile... de comandos que não rodam.
+_ORIGEM = {
+    nome: modulo
+    for modulo, nomes in {
+        "auditoria": ("AuditoriaCliente", "ResumoAuditoria", "auditar_cliente", "auditar_raiz"),
+        "concorrencia": ("ControleConcorrencia", "SistemaResiliente"),
+        "indice": ("IndiceClientes", "ResumoAtualizacao"),
+        "instrumentacao": ("Instrumentacao", "MedicaoNo"),
+        "lote": (
+            "COLUNAS_LOTE", "ClienteLote", "ItemLote", "RelatorioLote",
+            "ler_clientes_csv", "planos_por_tipo", "provisionar_lote",
+        ),
+        "migracoes": (
+            "MIGRACOES", "MigracaoCliente", "Passo", "ResumoMigracao",
+            "adicionar", "migrar_cliente", "migrar_raiz", "mover", "renomear",
+        ),
+        "modelo": ("ESTRUTURA_PADRAO", "TIPO_PADRAO", "VERSAO_ESTRUTURA"),
+        "modelos_externos": (
+            "ErroModelo", "ModeloCarregado", "carregar_modelo", "estender", "listar_tipos", "validar_modelo",
+        ),
+        "motor": (
+            "MARCADOR", "Progresso", "ResultadoCriacao", "TokenCancelamento",
+            "criar_arvore", "gravar_marcador", "ler_marcador",
+        ),
+        "perfil": ("Perfil",),
+        "plano": ("NoPlano", "PlanoCriacao", "compilar_plano", "hash_modelo"),
+        "sistema_arquivos": (
+            "SISTEMA_LOCAL", "SistemaArquivos", "SistemaContador", "SistemaLatente", "SistemaLocal", "SistemaMemoria",
+        ),
+    }.items()
+    for nome in nomes
+}
+
+__all__ = [
+    "COLUNAS_LOTE",
+    "ESTRUTURA_PADRAO",
+    "MARCADOR",
+    "MIGRACOES",
+    "SISTEMA_LOCAL",
+    "TIPO_PADRAO",
+    "VERSAO_ESTRUTURA",
+    "AuditoriaCliente",
+    "ClienteLote",
+    "ControleConcorrencia",
+    "ErroModelo",
+    "IndiceClientes",
+    "Instrumentacao",
+    "ItemLote",
+    "MedicaoNo",
+    "MigracaoCliente",
+    "ModeloCarregado",
+    "NoPlano",
+    "Passo",
+    "Perfil",
+    "PlanoCriacao",
+    "Progresso",
+    "RelatorioLote",
+    "ResumoAtualizacao",
+    "ResumoAuditoria",
+    "ResumoMigracao",
+    "ResultadoCriacao",
+    "SistemaArquivos",
+    "SistemaContador",
+    "SistemaLatente",
+    "SistemaLocal",
+    "SistemaMemoria",
+    "SistemaResiliente",
+    "TokenCancelamento",
+    "adicionar",
+    "auditar_cliente",
+    "auditar_raiz",
+    "carregar_modelo",
+    "compilar_plano",
+    "criar_arvore",
+    "estender",
+    "gravar_marcador",
+    "hash_modelo",
+    "ler_clientes_csv",
+    "ler_marcador",
+    "listar_tipos",
+    "migrar_cliente",
+    "migrar_raiz",
+    "mover",
+    "planos_por_tipo",
+    "provisionar_lote",
+    "renomear",
+    "validar_modelo",
+]
+
+
+def __getattr__(nome: str) -> Any:
+    """Importa o submódulo de 'nome' no primeiro acesso (PEP 562) e guarda o valor."""
+    modulo = _ORIGEM.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+"""Permite executar: python -m licitagov_estruturas ..."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
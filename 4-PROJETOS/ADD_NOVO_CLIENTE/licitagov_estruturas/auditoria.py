@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+
+"""
+Auditoria: confere todas as pastas de cliente sob uma raiz contra o modelo.
+
+    python -m licitagov_estruturas auditar "\\\\Servidor\\Clientes" --saida auditoria.jsonl
+
+Para cada cliente (subpasta direta da raiz) a auditoria aponta:
+• faltando: pastas do modelo que não existem;
+• extras: subpastas que o modelo não prevê, nas pastas que ele descreve;
+• nome_errado: uma pasta "a mais" que é quase igual a uma "faltando"
+  (acento, maiúsculas, espaço, erro de digitação: "02. Socio" x "02. Socios").
+
+Só são listadas as pastas que o modelo descreve (nada de varrer documentos
+dos clientes). Vários clientes são auditados ao mesmo tempo e cada um é
+entregue assim que termina: a memória não cresce com o número de clientes.
+"""
+
+from __future__ import annotations
+
+import difflib                          # Pastas com nome parecido (nome_errado)
+import os
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, TypeVar, Union
+
+from .concorrencia import mapear_limitado
+from .motor import TokenCancelamento, ler_marcador
+from .plano import PlanoCriacao, compilar_plano
+from .sistema_arquivos import SISTEMA_LOCAL, SistemaArquivos
+
+TRABALHADORES = 16           # Clientes auditados ao mesmo tempo
+SEMELHANCA_MINIMA = 0.8      # difflib: a partir daqui "a mais" + "faltando" = nome errado
+LIMITE_EXTRAS = 200          # Extras listados por cliente (o total vai em extras_total)
+
+T = TypeVar("T")
+
+
+def _normalizar(nome: str) -> str:
+    """Nome sem acentos, maiúsculas e separadores (para achar nomes errados)."""
+    sem_acento = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode("ascii")
+    return "".join(c for c in sem_acento.casefold() if c.isalnum())
+
+
+@dataclass
+class AuditoriaCliente:
+    """Divergências de um cliente em relação ao modelo (caminhos relativos à pasta dele)."""
+
+    pasta: Path
+    faltando: List[str] = field(default_factory=list)
+    extras: List[str] = field(default_factory=list)
+    nome_errado: List[Tuple[str, str]] = field(default_factory=list)  # (esperado, encontrado)
+    extras_total: int = 0
+    listagens: int = 0
+    versao: Optional[str] = None     # Versão do modelo no marcador (None = sem marcador)
+    erro: str = ""                   # Pasta do cliente ilegível
+
+    @property
+    def situacao(self) -> str:
+        if self.erro:
+            return "ERRO"
+        if self.faltando or self.extras_total or self.nome_errado:
+            return "DIVERGENTE"
+        return "CONFORME"
+
+    def como_dict(self) -> Dict[str, Any]:
+        """Uma linha do JSONL de auditoria."""
+        return {
+            "cliente": self.pasta.name,
+            "pasta": str(self.pasta),
+            "situacao": self.situacao,
+            "versao": self.versao,
+            "faltando": self.faltando,
+            "extras": self.extras,
+            "extras_total": self.extras_total,
+            "nome_errado": [{"esperado": e, "encontrado": n} for e, n in self.nome_errado],
+            "listagens": self.listagens,
+            "erro": self.erro,
+        }
+
+
+@dataclass
+class ResumoAuditoria:
+    """Totais de uma auditoria (os detalhes de cada cliente saem em ao_auditar)."""
+
+    raiz: Path
+    clientes: int = 0
+    conformes: int = 0
+    divergentes: int = 0
+    erros: int = 0
+    listagens: int = 0
+    segundos: float = 0.0
+    cancelado: bool = False
+
+    def contar(self, item: AuditoriaCliente) -> None:
+        self.clientes += 1
+        self.listagens += item.listagens
+        if item.situacao == "ERRO":
+            self.erros += 1
+        elif item.situacao == "DIVERGENTE":
+            self.divergentes += 1
+        else:
+            self.conformes += 1
+
+    def como_dict(self) -> Dict[str, Any]:
+        return {
+            "raiz": str(self.raiz),
+            "clientes": self.clientes,
+            "conformes": self.conformes,
+            "divergentes": self.divergentes,
+            "erros": self.erros,
+            "listagens": self.listagens,
+            "segundos": round(self.segundos, 3),
+            "cancelado": self.cancelado,
+        }
+
+
+class Esperado:
+    """Filhos de cada pasta do plano, indexados para a comparação (montado uma vez por auditoria)."""
+
+    def __init__(self, plano: PlanoCriacao) -> None:
+        self.plano = plano
+        # pai (-1 = base) -> {nome normalizado pelo SO: índice do nó}
+        self.filhos: Dict[int, Dict[str, int]] = {}
+        for i, no in enumerate(plano.nos):
+            self.filhos.setdefault(no.pai, {})[os.path.normcase(no.nome)] = i
+
+
+def _subarvore(plano: PlanoCriacao, i: int) -> Iterable[int]:
+    """O nó i e seus descendentes (no plano, em pré-ordem, eles vêm logo depois de i)."""
+    yield i
+    nivel = plano.nos[i].nivel
+    j = i + 1
+    while j < len(plano.nos) and plano.nos[j].nivel > nivel:
+        yield j
+        j += 1
+
+
+def _parear(faltando: List[int], extras: List[str], plano: PlanoCriacao) -> List[Tuple[int, str]]:
+    """Casa pastas faltando com extras de nome equivalente ou muito parecido."""
+    pares: List[Tuple[int, str]] = []
+    livres = {_normalizar(nome): nome for nome in extras}
+    for i in list(faltando):
+        alvo = _normalizar(plano.nos[i].nome)
+        if alvo in livres:
+            encontrado = livres.pop(alvo)
+        else:
+            parecidos = difflib.get_close_matches(alvo, list(livres), n=1, cutoff=SEMELHANCA_MINIMA)
+            if not parecidos:
+                continue
+            encontrado = livres.pop(parecidos[0])
+        pares.append((i, encontrado))
+    return pares
+
+
+def auditar_cliente(
+    base: Path,
+    modelo: Union[Mapping[str, Union[dict, list]], Iterable[str], PlanoCriacao],
+    sistema: SistemaArquivos = SISTEMA_LOCAL,
+) -> AuditoriaCliente:
+    """
+    Compara a pasta de um cliente com o modelo.
+
+    Um scandir por pasta do modelo que existe e tem filhas no modelo — as
+    demais (documentos, pastas extras) não são abertas.
+    """
+    return auditar_esperado(Path(base), Esperado(compilar_plano(modelo)), sistema)
+
+
+def auditar_esperado(base: Path, esperado: Esperado, sistema: SistemaArquivos) -> AuditoriaCliente:
+    """
+    auditar_cliente com o modelo já indexado (Esperado) — para quem audita
+    muitos clientes com o mesmo modelo (ver auditar_raiz).
+    """
+    plano = esperado.plano
+    item = AuditoriaCliente(base)
+    marcador = ler_marcador(base, sistema)
+    if marcador is not None:
+        item.versao = str(marcador.get("versao", "?"))
+
+    pendentes: List[int] = [-1]
+    while pendentes:
+        pai = pendentes.pop()
+        pasta = base if pai < 0 else base / plano.nos[pai].relativo
+        try:
+            presentes = {e.nome for e in sistema.scandir(pasta) if e.pasta}
+        except OSError as e:
+            if pai < 0:
+                item.erro = str(e)
+                return item
+            continue  # Pasta do modelo ilegível: aparece como existente, sem detalhe
+        item.listagens += 1
+
+        esperados = esperado.filhos.get(pai, {})
+        achados: Set[str] = set()
+        extras: List[str] = []
+        for nome in presentes:
+            chave = os.path.normcase(nome)
+            i = esperados.get(chave)
+            if i is None:
+                if not nome.startswith("."):  # Ocultas (ex.: montagem em andamento)
+                    extras.append(nome)
+                continue
+            achados.add(chave)
+            if i in esperado.filhos:
+                pendentes.append(i)
+        faltando = [i for chave, i in esperados.items() if chave not in achados]
+        extras.sort()
+
+        for i, encontrado in _parear(faltando, extras, plano):
+            item.nome_errado.append((str(plano.nos[i].relativo), encontrado))
+            faltando.remove(i)
+            extras.remove(encontrado)
+        for i in faltando:
+            # Tudo abaixo de uma pasta que falta também falta
+            item.faltando.extend(str(plano.nos[j].relativo) for j in _subarvore(plano, i))
+        item.extras_total += len(extras)
+        espaco = LIMITE_EXTRAS - len(item.extras)
+        if espaco > 0:
+            relativo = pasta.relative_to(base)
+            item.extras.extend(str(relativo / n) for n in extras[:espaco])
+
+    item.faltando.sort()
+    item.extras.sort()
+    return item
+
+
+def listar_clientes(raiz: Path, sistema: SistemaArquivos = SISTEMA_LOCAL) -> Iterable[Path]:
+    """Pastas de cliente: subpastas diretas da raiz (ocultas e de montagem ficam de fora)."""
+    for entrada in sistema.iterar(raiz):
+        if entrada.pasta and not entrada.nome.startswith("."):
+            yield Path(raiz) / entrada.nome
+
+
+def ate_cancelar(itens: Iterable[T], cancelamento: Optional[TokenCancelamento], resumo: Any) -> Iterator[T]:
+    """Repassa os itens até o cancelamento (e então marca resumo.cancelado)."""
+    for item in itens:
+        if cancelamento is not None and cancelamento.cancelado:
+            resumo.cancelado = True
+            return
+        yield item
+
+
+def auditar_raiz(
+    raiz: Path,
+    modelo: Union[Mapping[str, Union[dict, list]], Iterable[str], PlanoCriacao],
+    ao_auditar: Callable[[AuditoriaCliente], None] = lambda _item: None,
+    *,
+    trabalhadores: int = TRABALHADORES,
+    sistema: SistemaArquivos = SISTEMA_LOCAL,
+    cancelamento: Optional[TokenCancelamento] = None,
+) -> ResumoAuditoria:
+    """
+    Audita todos os clientes sob 'raiz', 'trabalhadores' ao mesmo tempo.
+
+    'ao_auditar' recebe cada cliente assim que ele termina (na thread de
+    quem chamou; a ordem é a de término). No máximo 2 x trabalhadores
+    clientes ficam em memória ao mesmo tempo, e a raiz é lida aos poucos.
+    Com cancelamento, nenhum cliente novo é iniciado.
+    """
+    esperado = Esperado(compilar_plano(modelo))
+    resumo = ResumoAuditoria(Path(raiz))
+    inicio = time.perf_counter()
+    trabalhadores = max(1, trabalhadores)
+    pastas = ate_cancelar(listar_clientes(Path(raiz), sistema), cancelamento, resumo)
+
+    with ThreadPoolExecutor(max_workers=trabalhadores) as pool:
+        auditar = partial(auditar_esperado, esperado=esperado, sistema=sistema)
+        for _pasta, futuro in mapear_limitado(pool, auditar, pastas, 2 * trabalhadores):
+            item = futuro.result()
+            resumo.contar(item)
+            ao_auditar(item)
+
+    resumo.segundos = time.perf_counter() - inicio
+    return resumo
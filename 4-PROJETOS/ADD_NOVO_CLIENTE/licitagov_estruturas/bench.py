@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks do motor de criação, com comparação contra uma linha de base.
+
+    python -m licitagov_estruturas bench --saida bench.json
+    python -m licitagov_estruturas bench --baseline bench_base.json
+
+Antes de publicar um novo LicitagovEstruturas.exe, rode o bench na mesma
+máquina com --baseline apontando para o JSON da versão anterior: o comando
+sai com código 1 se algum cenário piorou além da tolerância.
+
+Métricas de cada cenário:
+• pastas_por_s: pastas criadas por segundo (melhor de N repetições).
+• chamadas_por_pasta: primitivas do SistemaArquivos (mkdir, scandir,
+  stat...) por pasta criada — cada uma é uma chamada ao sistema operacional
+  ou uma ida e volta na rede.
+• componentes_por_pasta: componentes de caminho entregues ao SO por pasta
+  (cada um é um passo de resolução no kernel). Os cenários "_descritor"
+  mostram quanto a criação relativa à pasta-pai economiza.
+• pico_memoria_kb: pico de memória alocada pelo Python (tracemalloc).
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc                      # Pico de memória de cada cenário
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .lote import ClienteLote, provisionar_lote
+from .modelo import ESTRUTURA_PADRAO
+from .motor import criar_arvore
+from .plano import compilar_plano
+from .sistema_arquivos import SISTEMA_LOCAL, SistemaArquivos, SistemaContador, SistemaLatente, SistemaMemoria
+
+FORMATO_RESULTADO = 1
+
+# Tolerância padrão na comparação com a linha de base (fração)
+TOLERANCIA = 0.25
+# Diferenças de memória abaixo disso são ruído do interpretador
+RUIDO_MEMORIA_KB = 64.0
+
+Ambiente = Callable[[], ContextManager[Tuple[SistemaArquivos, Path]]]
+
+
+class Cenario(NamedTuple):
+    """
+    Um caso medido.
+
+    • ambiente: context manager que entrega (sistema, raiz) vazios a cada
+      repetição e limpa tudo no final (fora da medição de tempo).
+    • executar: roda o caso e devolve quantas pastas criou.
+    • com_falhas: o ambiente injeta falhas — as novas tentativas dependem
+      da ordem das threads, então chamadas/pasta varia de uma execução
+      para outra e não é comparado com a linha de base.
+    """
+
+    nome: str
+    descricao: str
+    ambiente: Ambiente
+    executar: Callable[[SistemaArquivos, Path], int]
+    com_falhas: bool = False
+
+
+# ------------------------------------------------------------
+# MODELOS E AMBIENTES
+# ------------------------------------------------------------
+def modelo_sintetico(pastas: int, largura: int = 10) -> Dict[str, dict]:
+    """Modelo artificial com exatamente 'pastas' nós e até 'largura' filhos por pasta."""
+    raiz: Dict[str, dict] = {}
+    fila = deque([raiz])
+    criadas = 0
+    while criadas < pastas:
+        atual = fila.popleft()
+        for j in range(min(largura, pastas - criadas)):
+            criadas += 1
+            filho: Dict[str, dict] = {}
+            atual[f"{j + 1:02d}. Pasta_{criadas}"] = filho
+            fila.append(filho)
+    return raiz
+
+
+def modelo_profundo(niveis: int, irmaos: int = 2) -> Dict[str, dict]:
+    """Modelo em "corrente": 'niveis' de profundidade, com 'irmaos' folhas em cada nível."""
+    raiz: Dict[str, dict] = {}
+    atual = raiz
+    for nivel in range(niveis):
+        for j in range(irmaos):
+            atual[f"{nivel:03d}.{j} Folha"] = {}
+        atual[f"{nivel:03d} Nivel"] = atual = {}
+    return raiz
+
+
+def pasta_tmpfs() -> Optional[str]:
+    """/dev/shm (memória, sem disco) quando existe; senão a pasta temporária padrão."""
+    shm = Path("/dev/shm")
+    return str(shm) if shm.is_dir() else None
+
+
+@contextmanager
+def _em_tmpfs() -> Iterator[Tuple[SistemaArquivos, Path]]:
+    pasta = Path(tempfile.mkdtemp(prefix="licitagov_bench_", dir=pasta_tmpfs()))
+    try:
+        yield SISTEMA_LOCAL, pasta
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+@contextmanager
+def _em_memoria() -> Iterator[Tuple[SistemaArquivos, Path]]:
+    sistema = SistemaMemoria()
+    raiz = Path(Path.cwd().anchor) / "bench"
+    sistema.mkdir(raiz)
+    yield sistema, raiz
+
+
+def _latente(latencia: float, taxa_falha: float = 0.0) -> Ambiente:
+    """
+    Disco em memória com 'latencia' segundos por chamada (compartilhamento
+    lento) e, opcionalmente, uma fração de chamadas com timeout.
+    """
+
+    @contextmanager
+    def ambiente() -> Iterator[Tuple[SistemaArquivos, Path]]:
+        with _em_memoria() as (sistema, raiz):
+            yield SistemaLatente(sistema, latencia=latencia, taxa_falha=taxa_falha, semente=1), raiz
+
+    return ambiente
+
+
+# ------------------------------------------------------------
+# CASOS
+# ------------------------------------------------------------
+def _criar(modelo: Any, **opcoes: Any) -> Callable[[SistemaArquivos, Path], int]:
+    """Um cliente novo: cria a pasta base e a árvore inteira."""
+    plano = compilar_plano(modelo)  # Compilado fora da medição (e já em cache)
+
+    def executar(sistema: SistemaArquivos, raiz: Path) -> int:
+        base = raiz / "Cliente"
+        if not opcoes.get("montagem"):
+            sistema.mkdir(base)  # Com montagem, a pasta base chega pelo rename
+        resultado = criar_arvore(base, plano, sistema=sistema, **opcoes)
+        if not resultado.ok:
+            raise RuntimeError(f"{len(resultado.erros)} erro(s), ex.: {resultado.erros[0]}")
+        return len(resultado.criadas)
+
+    return executar
+
+
+def _lote(clientes: int, **opcoes: Any) -> Callable[[SistemaArquivos, Path], int]:
+    """Vários clientes novos pelo modo lote."""
+    plano = compilar_plano(ESTRUTURA_PADRAO)
+
+    def executar(sistema: SistemaArquivos, raiz: Path) -> int:
+        lista = [ClienteLote(f"Cliente {i:05d}", "", raiz) for i in range(clientes)]
+        relatorio = provisionar_lote(lista, plano, sistema=sistema, **opcoes)
+        if relatorio.contar("OK") != clientes:
+            raise RuntimeError(f"{clientes - relatorio.contar('OK')} cliente(s) sem sucesso")
+        return sum(len(item.resultado.criadas) for item in relatorio.itens if item.resultado)
+
+    return executar
+
+
+def cenarios(rapido: bool = False) -> List[Cenario]:
+    """
+    Cenários padrão. Com rapido=True, os maiores são reduzidos (para rodar
+    em poucos segundos, ex.: antes de um commit).
+    """
+    nos_sintetico = 2_000 if rapido else 10_000
+    clientes = 100 if rapido else 1_000
+    return [
+        Cenario("padrao_tmpfs_completo", "ESTRUTURA_PADRAO, mkdir em todas as pastas, serial",
+                _em_tmpfs, _criar(ESTRUTURA_PADRAO)),
+        Cenario("padrao_tmpfs_incremental", "ESTRUTURA_PADRAO, incremental, serial",
+                _em_tmpfs, _criar(ESTRUTURA_PADRAO, incremental=True)),
+        Cenario("padrao_tmpfs_descritor", "ESTRUTURA_PADRAO, mkdir relativo à pasta-pai, serial",
+                _em_tmpfs, _criar(ESTRUTURA_PADRAO, por_descritor=True)),
+        Cenario("padrao_tmpfs_montagem", "ESTRUTURA_PADRAO, montada à parte e renomeada, serial",
+                _em_tmpfs, _criar(ESTRUTURA_PADRAO, incremental=True, montagem=True)),
+        Cenario("padrao_tmpfs_paralelo", "ESTRUTURA_PADRAO, incremental, 8 trabalhadores",
+                _em_tmpfs, _criar(ESTRUTURA_PADRAO, incremental=True, trabalhadores=8)),
+        Cenario("padrao_latente_serial", "ESTRUTURA_PADRAO, 2 ms por chamada, serial",
+                _latente(0.002), _criar(ESTRUTURA_PADRAO, incremental=True)),
+        Cenario("padrao_latente_montagem", "ESTRUTURA_PADRAO, 2 ms por chamada, montada à parte e renomeada",
+                _latente(0.002), _criar(ESTRUTURA_PADRAO, incremental=True, montagem=True)),
+        Cenario("padrao_latente_paralelo", "ESTRUTURA_PADRAO, 2 ms por chamada, 8 trabalhadores",
+                _latente(0.002), _criar(ESTRUTURA_PADRAO, incremental=True, trabalhadores=8)),
+        Cenario("padrao_instavel_adaptativo", "ESTRUTURA_PADRAO, 2 ms por chamada, 3% de timeouts, adaptativo",
+                _latente(0.002, taxa_falha=0.03), _criar(ESTRUTURA_PADRAO, incremental=True, adaptativo=True),
+                com_falhas=True),
+        Cenario(f"sintetico_{nos_sintetico}_tmpfs", f"modelo sintético de {nos_sintetico} pastas, serial",
+                _em_tmpfs, _criar(modelo_sintetico(nos_sintetico), incremental=True)),
+        Cenario(f"sintetico_{nos_sintetico}_tmpfs_descritor",
+                f"modelo sintético de {nos_sintetico} pastas, mkdir relativo à pasta-pai",
+                _em_tmpfs, _criar(modelo_sintetico(nos_sintetico), incremental=True, por_descritor=True)),
+        Cenario("profundo_100_tmpfs", "modelo com 100 níveis de profundidade, caminho completo",
+                _em_tmpfs, _criar(modelo_profundo(100), incremental=True)),
+        Cenario("profundo_100_tmpfs_descritor", "modelo com 100 níveis de profundidade, mkdir relativo à pasta-pai",
+                _em_tmpfs, _criar(modelo_profundo(100), incremental=True, por_descritor=True)),
+        Cenario(f"sintetico_{nos_sintetico}_memoria", f"modelo sintético de {nos_sintetico} pastas, em memória",
+                _em_memoria, _criar(modelo_sintetico(nos_sintetico), incremental=True)),
+        Cenario("profundo_500_memoria", "modelo com 500 níveis de profundidade, em memória",
+                _em_memoria, _criar(modelo_profundo(500), incremental=True)),
+        Cenario(f"lote_{clientes}_memoria", f"{clientes} clientes (ESTRUTURA_PADRAO), 8 em paralelo, em memória",
+                _em_memoria, _lote(clientes, clientes_em_paralelo=8, incremental=True, marcador=True)),
+    ]
+
+
+# ------------------------------------------------------------
+# MEDIÇÃO
+# ------------------------------------------------------------
+def medir(cenario: Cenario, repeticoes: int = 3) -> Dict[str, Any]:
+    """
+    Mede um cenário.
+
+    O tempo é o melhor de 'repeticoes' execuções sem instrumentação. Uma
+    execução extra, com SistemaContador e tracemalloc ligados, fornece as
+    chamadas por pasta e o pico de memória.
+    """
+    tempos: List[float] = []
+    pastas = 0
+    for _ in range(max(1, repeticoes)):
+        with cenario.ambiente() as (sistema, raiz):
+            inicio = time.perf_counter()
+            pastas = cenario.executar(sistema, raiz)
+            tempos.append(time.perf_counter() - inicio)
+
+    with cenario.ambiente() as (sistema, raiz):
+        contador = SistemaContador(sistema)
+        tracemalloc.start()
+        try:
+            cenario.executar(contador, raiz)
+            _atual, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    melhor = min(tempos)
+    return {
+        "descricao": cenario.descricao,
+        "pastas": pastas,
+        "repeticoes": len(tempos),
+        "segundos": round(melhor, 6),
+        "pastas_por_s": round(pastas / melhor, 1) if melhor > 0 else 0.0,
+        "chamadas_por_pasta": round(contador.total / pastas, 3) if pastas else 0.0,
+        "componentes_por_pasta": round(contador.componentes / pastas, 2) if pastas else 0.0,
+        "chamadas": dict(sorted(contador.chamadas.items())),
+        "pico_memoria_kb": round(pico / 1024, 1),
+        "com_falhas": cenario.com_falhas,
+    }
+
+
+def executar_benchmarks(
+    lista: Sequence[Cenario],
+    repeticoes: int = 3,
+    log: Callable[[str], None] = lambda _msg: None,
+) -> Dict[str, Any]:
+    """Mede todos os cenários; devolve o documento JSON de resultados."""
+    resultados: Dict[str, Any] = {}
+    for cenario in lista:
+        resultados[cenario.nome] = dados = medir(cenario, repeticoes)
+        log(
+            f"{cenario.nome:<28} {dados['pastas']:>8} pastas  {dados['pastas_por_s']:>11.1f} pastas/s  "
+            f"{dados['chamadas_por_pasta']:>6.2f} chamadas/pasta  "
+            f"{dados['componentes_por_pasta']:>7.2f} componentes/pasta  {dados['pico_memoria_kb']:>9.1f} KB"
+        )
+    return {
+        "formato": FORMATO_RESULTADO,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "tmpfs": pasta_tmpfs() or tempfile.gettempdir(),
+        "cenarios": resultados,
+    }
+
+
+def comparar(
+    atual: Dict[str, Any],
+    base: Dict[str, Any],
+    tolerancia: float = TOLERANCIA,
+) -> List[str]:
+    """
+    Compara dois resultados de executar_benchmarks; devolve as regressões.
+
+    • pastas/s: regressão se cair mais que 'tolerancia' (o tempo varia).
+    • chamadas/pasta e componentes/pasta: regressão se subir mais de 1% (é
+      determinístico). Linhas de base sem componentes não são comparadas,
+      nem cenários com falhas injetadas (as novas tentativas variam).
+    • memória: regressão se subir mais que 'tolerancia' e RUIDO_MEMORIA_KB.
+    Cenários presentes em só um dos lados são ignorados.
+    """
+    regressoes: List[str] = []
+    cen_base = base.get("cenarios", {})
+    for nome, novo in atual.get("cenarios", {}).items():
+        antigo = cen_base.get(nome)
+        if not antigo:
+            continue
+        if novo["pastas_por_s"] < antigo["pastas_por_s"] * (1 - tolerancia):
+            regressoes.append(
+                f"{nome}: pastas/s caiu de {antigo['pastas_por_s']:.1f} para {novo['pastas_por_s']:.1f}"
+            )
+        deterministico = not (novo.get("com_falhas") or antigo.get("com_falhas"))
+        if deterministico and novo["chamadas_por_pasta"] > antigo["chamadas_por_pasta"] * 1.01:
+            regressoes.append(
+                f"{nome}: chamadas/pasta subiu de {antigo['chamadas_por_pasta']:.2f} "
+                f"para {novo['chamadas_por_pasta']:.2f}"
+            )
+        componentes = antigo.get("componentes_por_pasta")
+        if deterministico and componentes is not None and novo["componentes_por_pasta"] > componentes * 1.01:
+            regressoes.append(
+                f"{nome}: componentes/pasta subiu de {componentes:.2f} "
+                f"para {novo['componentes_por_pasta']:.2f}"
+            )
+        aumento = novo["pico_memoria_kb"] - antigo["pico_memoria_kb"]
+        if aumento > RUIDO_MEMORIA_KB and novo["pico_memoria_kb"] > antigo["pico_memoria_kb"] * (1 + tolerancia):
+            regressoes.append(
+                f"{nome}: pico de memória subiu de {antigo['pico_memoria_kb']:.1f} KB "
+                f"para {novo['pico_memoria_kb']:.1f} KB"
+            )
+    return regressoes
+
+
+def ler_resultado(caminho: Path) -> Dict[str, Any]:
+    """Lê um JSON gravado pelo bench (ValueError se não for um)."""
+    with open(caminho, encoding="utf-8") as f:
+        dados = json.load(f)
+    if not isinstance(dados, dict) or not isinstance(dados.get("cenarios"), dict):
+        raise ValueError("não é um resultado de benchmark")
+    return dados
@@ -0,0 +1,692 @@
+# -*- coding: utf-8 -*-
+
+"""
+Linha de comando (sem interface gráfica e sem importar o Tkinter).
+
+Exemplos:
+    python -m licitagov_estruturas create "\\\\Servidor\\Clientes\\EmpresaX" --jobs 8
+    python -m licitagov_estruturas create C:\\Clientes\\EmpresaX --template modelo.json --json
+    python -m licitagov_estruturas create C:\\Clientes\\EmpresaY --template bahia
+    python -m licitagov_estruturas modelos --validar
+    python -m licitagov_estruturas batch clientes.csv --clientes 8
+    python -m licitagov_estruturas create C:\\Clientes\\EmpresaX --profile
+    python -m licitagov_estruturas bench --baseline bench_base.json --saida bench.json
+    python -m licitagov_estruturas auditar "\\\\Servidor\\Clientes" --saida auditoria.jsonl
+    python -m licitagov_estruturas indice atualizar "\\\\Servidor\\Clientes"
+    python -m licitagov_estruturas indice faltando "07. Certidoes"
+    python -m licitagov_estruturas migrar "\\\\Servidor\\Clientes" --ensaio
+
+Códigos de saída:
+    0  tudo certo
+    1  a execução terminou, mas alguma pasta (ou cliente) falhou
+       (no bench: algum cenário piorou em relação à linha de base;
+       na auditoria: algum cliente diverge do modelo ou não pôde ser lido;
+       na migração: algum passo falhou; em modelos --validar: algum modelo é inválido)
+    2  uso inválido (argumentos, modelo ou CSV ilegíveis)
+    3  não foi possível nem começar (ex.: pasta base inacessível)
+    130  cancelado com Ctrl+C (o que já foi criado fica; rode de novo para continuar)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import signal
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence
+
+# Cada comando importa os módulos de que precisa dentro do seu _cmd_*: abrir
+# a linha de comando não carrega sqlite3 (índice), tracemalloc (bench),
+# cProfile (--profile), difflib (auditoria)... de comandos que não rodam.
+if TYPE_CHECKING:
+    from .auditoria import AuditoriaCliente
+    from .indice import IndiceClientes
+    from .instrumentacao import Instrumentacao
+    from .migracoes import MigracaoCliente
+    from .modelos_externos import ModeloCarregado
+    from .motor import TokenCancelamento
+    from .sistema_arquivos import SistemaArquivos
+
+SAIDA_OK = 0
+SAIDA_COM_ERROS = 1
+SAIDA_USO = 2
+SAIDA_FALHA = 3
+SAIDA_CANCELADO = 130
+
+
+class ErroUso(Exception):
+    """Erro de entrada do usuário (vira código de saída 2)."""
+
+
+def _carregar_modelo(origem: Optional[str]) -> ModeloCarregado:
+    """Modelo do --template: arquivo JSON/TOML ou tipo de cliente (padrão: ESTRUTURA_PADRAO)."""
+    from .modelo import TIPO_PADRAO
+    from .modelos_externos import ErroModelo, carregar_modelo
+
+    try:
+        return carregar_modelo(origem or TIPO_PADRAO)
+    except ErroModelo as e:
+        raise ErroUso(str(e)) from e
+
+
+def _log(args: argparse.Namespace):
+    """Função de log: linhas humanas vão para stderr (stdout fica para o --json)."""
+    if args.silencioso:
+        return lambda _msg: None
+    return lambda msg: print(msg, file=sys.stderr)
+
+
+@contextmanager
+def _ctrl_c_cancela() -> Iterator[TokenCancelamento]:
+    """
+    Durante o bloco, o primeiro Ctrl+C pede cancelamento cooperativo (o motor
+    para entre duas pastas); um segundo Ctrl+C interrompe na hora.
+    """
+    from .motor import TokenCancelamento
+
+    token = TokenCancelamento()
+
+    def ao_interromper(_sinal, _quadro) -> None:
+        print("Cancelando… (Ctrl+C de novo para interromper na hora)", file=sys.stderr)
+        token.cancelar()
+        signal.signal(signal.SIGINT, anterior)
+
+    try:
+        anterior = signal.signal(signal.SIGINT, ao_interromper)
+    except ValueError:
+        # Fora da thread principal não há como tratar sinais: só o token vale
+        yield token
+        return
+    try:
+        yield token
+    finally:
+        signal.signal(signal.SIGINT, anterior)
+
+
+def _sistema(args: argparse.Namespace) -> SistemaArquivos:
+    """Disco local, ou disco local com latência/falhas simuladas (--simular-*)."""
+    from .sistema_arquivos import SISTEMA_LOCAL, SistemaLatente
+
+    if args.simular_latencia or args.simular_falhas:
+        return SistemaLatente(
+            SISTEMA_LOCAL,
+            latencia=args.simular_latencia / 1000.0,
+            taxa_falha=args.simular_falhas,
+        )
+    return SISTEMA_LOCAL
+
+
+def _instrumentacao(args: argparse.Namespace) -> Optional[Instrumentacao]:
+    if not args.instrumentar:
+        return None
+    from .instrumentacao import Instrumentacao
+
+    return Instrumentacao()
+
+
+def _gravar_instrumentacao(args: argparse.Namespace, instr: Optional[Instrumentacao], log) -> None:
+    """Grava o JSON do --instrumentar e resume no log onde o tempo foi gasto."""
+    if instr is None:
+        return
+    instr.encerrar()
+    resumo = instr.resumo()
+    chamadas = ", ".join(f"{op} {n}" for op, n in resumo["chamadas"].items()) or "nenhuma"
+    fases = ", ".join(f"{n} {d['segundos']:.3f}s" for n, d in resumo["fases"].items()) or "nenhuma"
+    log(
+        f"Instrumentação: {resumo['pastas']} pastas em {resumo['total_s']:.3f}s; "
+        f"chamadas: {chamadas}; fases: {fases}; "
+        f"log {resumo['log']['segundos']:.3f}s em {resumo['log']['linhas']} linhas "
+        f"(p50 {resumo['ms_por_pasta']['p50']} ms, p99 {resumo['ms_por_pasta']['p99']} ms por pasta)"
+    )
+    try:
+        instr.gravar_json(Path(args.instrumentar))
+    except OSError as e:
+        print(f"[AVISO] Não foi possível gravar {args.instrumentar} -> {e}", file=sys.stderr)
+
+
+def _resumo_concorrencia(dados: dict) -> str:
+    """Linha de log do modo --adaptativo."""
+    return (
+        f"Paralelismo adaptativo: terminou em {dados['final']} (pico {dados['pico']}, teto {dados['maximo']}, "
+        f"{dados['ajustes']} ajuste(s)); {dados['retentativas']} nova(s) tentativa(s) "
+        f"após {dados['falhas_transitorias']} falha(s) transitória(s)."
+    )
+
+
+def _opcoes_motor(
+    args: argparse.Namespace,
+    cancelamento: TokenCancelamento,
+    sistema: SistemaArquivos,
+    modelo: ModeloCarregado,
+    instrumentacao: Optional[Instrumentacao] = None,
+) -> dict:
+    """Opções comuns repassadas a criar_arvore."""
+    return {
+        "incremental": not args.completo,
+        "trabalhadores": max(1, args.jobs),
+        "marcador": not args.sem_marcador,
+        "tipo_modelo": modelo.tipo,
+        "verificar": args.verificar,
+        "cancelamento": cancelamento,
+        "sistema": sistema,
+        "instrumentacao": instrumentacao,
+        "por_descritor": args.por_descritor,
+        "montagem": args.montagem,
+        "adaptativo": args.adaptativo,
+    }
+
+
+def _cmd_create(args: argparse.Namespace) -> int:
+    from .motor import criar_arvore
+
+    modelo = _carregar_modelo(args.template)
+    log = _log(args)
+    base = Path(args.pasta)
+    sistema = _sistema(args)
+
+    if not args.montagem and not sistema.existe(base):
+        try:
+            sistema.criar_pasta(base, parents=True)
+            log(f"Pasta base inexistente — criada: {base}")
+        except OSError as e:
+            print(f"[ERRO] Não foi possível criar a pasta base {base} -> {e}", file=sys.stderr)
+            return SAIDA_FALHA
+
+    instr = _instrumentacao(args)
+    with _ctrl_c_cancela() as token:
+        resultado = criar_arvore(base, modelo.plano, log=log, **_opcoes_motor(args, token, sistema, modelo, instr))
+    _gravar_instrumentacao(args, instr, log)
+
+    if args.json:
+        print(json.dumps(resultado.como_dict(), ensure_ascii=False))
+    elif resultado.cancelado:
+        pass  # O motor já registrou o que foi criado
+    elif resultado.pulado:
+        log("Concluído: estrutura já estava completa (marcador).")
+    else:
+        log(
+            f"Concluído: {len(resultado.criadas)} criadas, "
+            f"{len(resultado.existentes)} já existiam, {len(resultado.erros)} erros."
+        )
+    if resultado.concorrencia is not None and not args.json:
+        log(_resumo_concorrencia(resultado.concorrencia))
+    if resultado.cancelado:
+        return SAIDA_CANCELADO
+    return SAIDA_OK if resultado.ok else SAIDA_COM_ERROS
+
+
+def _cmd_batch(args: argparse.Namespace) -> int:
+    import csv
+
+    from .lote import ler_clientes_csv, provisionar_lote
+
+    modelo = _carregar_modelo(args.template)
+    log = _log(args)
+    try:
+        clientes = ler_clientes_csv(Path(args.csv))
+    except (OSError, ValueError, csv.Error) as e:
+        raise ErroUso(f"Não foi possível ler o CSV '{args.csv}': {e}") from e
+
+    instr = _instrumentacao(args)
+    with _ctrl_c_cancela() as token:
+        relatorio = provisionar_lote(
+            clientes,
+            modelo.plano,
+            log=log,
+            clientes_em_paralelo=args.clientes,
+            **_opcoes_motor(args, token, _sistema(args), modelo, instr),
+        )
+    _gravar_instrumentacao(args, instr, log)
+
+    destino = Path(args.relatorio) if args.relatorio else Path(args.csv).with_name(
+        Path(args.csv).stem + "_relatorio.csv"
+    )
+    try:
+        relatorio.escrever_csv(destino)
+    except OSError as e:
+        print(f"[AVISO] Não foi possível gravar o relatório {destino} -> {e}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(relatorio.como_dict(), ensure_ascii=False))
+    else:
+        log(
+            f"Lote concluído: {relatorio.contar('OK')} OK, {relatorio.contar('COM ERROS')} com erros, "
+            f"{relatorio.contar('FALHOU')} falharam, {relatorio.contar('CANCELADO')} cancelados. "
+            f"Relatório: {destino}"
+        )
+    if relatorio.contar("CANCELADO"):
+        return SAIDA_CANCELADO
+    return SAIDA_OK if relatorio.contar("OK") == len(relatorio.itens) else SAIDA_COM_ERROS
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    from . import bench
+
+    log = _log(args)
+    base = None
+    if args.baseline:
+        try:
+            base = bench.ler_resultado(Path(args.baseline))
+        except (OSError, ValueError) as e:
+            raise ErroUso(f"Não foi possível ler a linha de base '{args.baseline}': {e}") from e
+
+    lista = bench.cenarios(rapido=args.rapido)
+    if args.cenario:
+        lista = [c for c in lista if any(filtro in c.nome for filtro in args.cenario)]
+        if not lista:
+            raise ErroUso("Nenhum cenário corresponde a --cenario.")
+
+    resultado = bench.executar_benchmarks(lista, repeticoes=max(1, args.repeticoes), log=log)
+    if args.saida:
+        try:
+            with open(args.saida, "w", encoding="utf-8") as f:
+                json.dump(resultado, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"[AVISO] Não foi possível gravar {args.saida} -> {e}", file=sys.stderr)
+    if args.json:
+        print(json.dumps(resultado, ensure_ascii=False))
+
+    if base is None:
+        return SAIDA_OK
+    tolerancia = bench.TOLERANCIA if args.tolerancia is None else args.tolerancia
+    regressoes = bench.comparar(resultado, base, tolerancia=tolerancia)
+    for linha in regressoes:
+        print(f"[REGRESSÃO] {linha}", file=sys.stderr)
+    if not regressoes:
+        log(f"Sem regressões em relação a {args.baseline}.")
+    return SAIDA_COM_ERROS if regressoes else SAIDA_OK
+
+
+def _cmd_audit(args: argparse.Namespace) -> int:
+    from .auditoria import TRABALHADORES, auditar_raiz
+
+    modelo = _carregar_modelo(args.template)
+    log = _log(args)
+    saida = None
+    if args.saida:
+        try:
+            saida = open(args.saida, "w", encoding="utf-8")
+        except OSError as e:
+            raise ErroUso(f"Não foi possível criar '{args.saida}': {e}") from e
+
+    def ao_auditar(item: AuditoriaCliente) -> None:
+        if saida is not None:
+            saida.write(json.dumps(item.como_dict(), ensure_ascii=False) + "\n")
+        if item.erro:
+            log(f"[ERRO] {item.pasta} -> {item.erro}")
+        elif item.situacao != "CONFORME":
+            log(
+                f"[DIVERGENTE] {item.pasta.name}: {len(item.faltando)} faltando, "
+                f"{item.extras_total} a mais, {len(item.nome_errado)} com nome errado"
+            )
+
+    try:
+        with _ctrl_c_cancela() as token:
+            resumo = auditar_raiz(
+                Path(args.raiz), modelo.plano, ao_auditar,
+                trabalhadores=TRABALHADORES if args.jobs is None else args.jobs,
+                sistema=_sistema(args), cancelamento=token,
+            )
+    except OSError as e:
+        print(f"[ERRO] Não foi possível listar {args.raiz} -> {e}", file=sys.stderr)
+        return SAIDA_FALHA
+    finally:
+        if saida is not None:
+            saida.close()
+
+    if args.json:
+        print(json.dumps(resumo.como_dict(), ensure_ascii=False))
+    log(
+        f"Auditoria {'cancelada' if resumo.cancelado else 'concluída'}: {resumo.clientes} cliente(s) "
+        f"em {resumo.segundos:.1f}s — {resumo.conformes} conformes, {resumo.divergentes} divergentes, "
+        f"{resumo.erros} com erro."
+        + (f" Detalhes: {args.saida}" if args.saida else "")
+    )
+    if resumo.cancelado:
+        return SAIDA_CANCELADO
+    return SAIDA_OK if resumo.conformes == resumo.clientes else SAIDA_COM_ERROS
+
+
+def _cmd_migrate(args: argparse.Namespace) -> int:
+    from .migracoes import TRABALHADORES, migrar_raiz
+
+    log = _log(args)
+    saida = None
+    if args.saida:
+        try:
+            saida = open(args.saida, "w", encoding="utf-8")
+        except OSError as e:
+            raise ErroUso(f"Não foi possível criar '{args.saida}': {e}") from e
+    prefixo = "[ENSAIO] " if args.ensaio else ""
+
+    def ao_migrar(item: MigracaoCliente) -> None:
+        if saida is not None:
+            saida.write(json.dumps(item.como_dict(), ensure_ascii=False) + "\n")
+        if item.erro:
+            log(f"[ERRO] {item.pasta} -> {item.erro}")
+            return
+        for passo in item.aplicados:
+            log(f"{prefixo}{item.pasta.name}: {passo}")
+        for passo, mensagem in item.erros:
+            log(f"[ERRO] {item.pasta.name}: {passo} -> {mensagem}")
+
+    try:
+        with _ctrl_c_cancela() as token:
+            resumo = migrar_raiz(
+                Path(args.raiz), ao_migrar,
+                trabalhadores=TRABALHADORES if args.jobs is None else args.jobs, sistema=_sistema(args),
+                assumir_versao=args.assumir_versao,
+                ensaio=args.ensaio, cancelamento=token,
+            )
+    except ValueError as e:
+        print(f"[ERRO] Registro de migrações inválido -> {e}", file=sys.stderr)
+        return SAIDA_FALHA
+    except OSError as e:
+        print(f"[ERRO] Não foi possível listar {args.raiz} -> {e}", file=sys.stderr)
+        return SAIDA_FALHA
+    finally:
+        if saida is not None:
+            saida.close()
+
+    if args.json:
+        print(json.dumps(resumo.como_dict(), ensure_ascii=False))
+    situacoes = ", ".join(f"{n} {s.lower()}" for s, n in sorted(resumo.por_situacao.items())) or "nenhum cliente"
+    log(
+        f"{prefixo}Migração para a versão {resumo.versao} "
+        f"{'cancelada' if resumo.cancelado else 'concluída'}: {resumo.clientes} cliente(s) "
+        f"em {resumo.segundos:.1f}s ({situacoes}); {resumo.passos} passo(s) aplicado(s)."
+        + (f" Detalhes: {args.saida}" if args.saida else "")
+    )
+    if resumo.cancelado:
+        return SAIDA_CANCELADO
+    return SAIDA_OK if resumo.ok else SAIDA_COM_ERROS
+
+
+def _cmd_modelos(args: argparse.Namespace) -> int:
+    from .modelos_externos import ErroModelo, carregar_modelo, listar_tipos
+
+    linhas = []
+    invalidos = 0
+    for tipo, arquivo in listar_tipos().items():
+        linha = {"tipo": tipo, "arquivo": str(arquivo) if arquivo else None}
+        if args.validar:
+            try:
+                modelo = carregar_modelo(arquivo or tipo, usar_cache=False)
+                linha.update(pastas=len(modelo.plano), descricao=modelo.descricao, erro="")
+            except ErroModelo as e:
+                invalidos += 1
+                linha["erro"] = str(e)
+        linhas.append(linha)
+    if args.json:
+        print(json.dumps(linhas, ensure_ascii=False))
+    else:
+        for linha in linhas:
+            detalhe = linha["arquivo"] or "(embutido)"
+            if linha.get("erro"):
+                detalhe += f"  [INVÁLIDO] {linha['erro']}"
+            elif "pastas" in linha:
+                detalhe += f"  {linha['pastas']} pastas" + (f" — {linha['descricao']}" if linha["descricao"] else "")
+            print(f"{linha['tipo']}\t{detalhe}")
+    return SAIDA_COM_ERROS if invalidos else SAIDA_OK
+
+
+def _abrir_indice(args: argparse.Namespace) -> IndiceClientes:
+    import sqlite3
+
+    from .indice import IndiceClientes
+
+    try:
+        return IndiceClientes(Path(args.banco) if args.banco else None)
+    except sqlite3.Error as e:
+        raise ErroUso(f"Não foi possível abrir o índice '{args.banco or 'padrão'}': {e}") from e
+
+
+def _cmd_indice_atualizar(args: argparse.Namespace) -> int:
+    from .auditoria import TRABALHADORES
+
+    modelo = _carregar_modelo(args.template)
+    log = _log(args)
+    with _abrir_indice(args) as indice:
+        try:
+            with _ctrl_c_cancela() as token:
+                resumo = indice.atualizar(
+                    Path(args.raiz), modelo.plano, log,
+                    trabalhadores=TRABALHADORES if args.jobs is None else args.jobs, sistema=_sistema(args),
+                    cancelamento=token,
+                )
+        except OSError as e:
+            print(f"[ERRO] Não foi possível listar {args.raiz} -> {e}", file=sys.stderr)
+            return SAIDA_FALHA
+    if args.json:
+        print(json.dumps(resumo.como_dict(), ensure_ascii=False))
+    log(
+        f"Índice {'parcialmente ' if resumo.cancelado else ''}atualizado: {resumo.clientes} cliente(s) "
+        f"em {resumo.segundos:.1f}s — {resumo.novos} novos, {resumo.reauditados} auditados de novo, "
+        f"{resumo.removidos} removidos."
+    )
+    return SAIDA_CANCELADO if resumo.cancelado else SAIDA_OK
+
+
+def _cmd_indice_faltando(args: argparse.Namespace) -> int:
+    with _abrir_indice(args) as indice:
+        linhas = indice.faltando(args.pasta)
+    if args.json:
+        print(json.dumps(linhas, ensure_ascii=False))
+    else:
+        for linha in linhas:
+            print(f"{linha['nome']}\t{linha['relativo']}\t{linha['pasta']}")
+    _log(args)(f"{len(linhas)} cliente(s) sem '{args.pasta}'.")
+    return SAIDA_OK
+
+
+def _cmd_indice_clientes(args: argparse.Namespace) -> int:
+    with _abrir_indice(args) as indice:
+        linhas = indice.clientes(situacao=args.situacao, versao=args.versao)
+    if args.json:
+        print(json.dumps(linhas, ensure_ascii=False))
+    else:
+        for linha in linhas:
+            print(
+                f"{linha['situacao']}\t{linha['versao'] or '-'}\t{linha['faltando']} faltando\t"
+                f"{linha['extras_total']} a mais\t{linha['pasta']}"
+            )
+    _log(args)(f"{len(linhas)} cliente(s).")
+    return SAIDA_OK
+
+
+def _cmd_indice_resumo(args: argparse.Namespace) -> int:
+    with _abrir_indice(args) as indice:
+        resumo = indice.resumo()
+    if args.json:
+        print(json.dumps(resumo, ensure_ascii=False))
+        return SAIDA_OK
+    print(f"Clientes: {resumo['clientes']}")
+    for situacao, n in sorted(resumo["por_situacao"].items()):
+        print(f"  {situacao}: {n}")
+    print("Versão do modelo:")
+    for versao, n in sorted(resumo["por_versao"].items()):
+        print(f"  {versao}: {n}")
+    if resumo["mais_faltando"]:
+        print("Pastas que mais faltam:")
+        for linha in resumo["mais_faltando"]:
+            print(f"  {linha['clientes']:>6}  {linha['relativo']}")
+    return SAIDA_OK
+
+
+def _parser() -> argparse.ArgumentParser:
+    # Opções repetidas entre comandos: declaradas uma vez e herdadas via parents=[...].
+    # --jobs dos comandos por raiz e --tolerancia do bench ficam None e cada
+    # _cmd_* usa o padrão do módulo (TRABALHADORES, bench.TOLERANCIA); a ajuda
+    # repete o valor para não importar esses módulos só para montar o parser.
+    opcao_modelo = argparse.ArgumentParser(add_help=False)
+    opcao_modelo.add_argument(
+        "--template", metavar="MODELO", help="modelo: arquivo JSON/TOML ou tipo de cliente (padrão: padrao)"
+    )
+
+    saida = argparse.ArgumentParser(add_help=False)
+    saida.add_argument("--json", action="store_true", help="imprime o resumo em JSON no stdout")
+    saida.add_argument("-q", "--silencioso", action="store_true", help="não imprime o log")
+
+    perfil = argparse.ArgumentParser(add_help=False)
+    perfil.add_argument(
+        "--profile", "--perfil", dest="perfil", action="store_true",
+        help="roda sob cProfile e grava .pstats + resumo .txt na pasta de logs",
+    )
+
+    simulacao = argparse.ArgumentParser(add_help=False)
+    simulacao.add_argument(
+        "--simular-latencia", type=float, default=0.0, metavar="MS",
+        help="acrescenta MS milissegundos a cada operação de disco (simula um compartilhamento lento)",
+    )
+    simulacao.add_argument(
+        "--simular-falhas", type=float, default=0.0, metavar="TAXA",
+        help="fração (0-1) de operações que falham com timeout simulado",
+    )
+
+    comum = argparse.ArgumentParser(add_help=False, parents=[opcao_modelo, saida, perfil, simulacao])
+    comum.add_argument("--jobs", type=int, default=1, metavar="N", help="pastas criadas em paralelo (padrão: 1)")
+    comum.add_argument(
+        "--adaptativo", action="store_true",
+        help="ajusta o paralelismo à latência/erros do servidor (--jobs vira o teto) e repete falhas transitórias",
+    )
+    comum.add_argument("--completo", action="store_true", help="chama mkdir em todas as pastas (sem listar antes)")
+    comum.add_argument("--verificar", action="store_true", help="ignora o marcador e confere pasta a pasta")
+    comum.add_argument("--sem-marcador", action="store_true", help="não lê nem grava o marcador")
+    comum.add_argument(
+        "--montagem", action="store_true",
+        help="cliente novo: monta a árvore à parte e a move para o lugar com um único rename",
+    )
+    comum.add_argument(
+        "--por-descritor", action="store_true",
+        help="cria cada pasta relativa à pasta-pai já aberta (menos resolução de caminhos; sem efeito no Windows)",
+    )
+    comum.add_argument(
+        "--instrumentar", metavar="ARQUIVO",
+        help="mede tempo e chamadas de disco de cada pasta e grava em JSON",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="python -m licitagov_estruturas",
+        description="Licitagov — Criador de Estruturas (linha de comando).",
+    )
+    sub = parser.add_subparsers(dest="comando", metavar="COMANDO")
+    sub.required = True
+
+    p_create = sub.add_parser(
+        "create", aliases=["criar"], parents=[comum], help="cria a estrutura em uma pasta de cliente"
+    )
+    p_create.add_argument("pasta", help="pasta do cliente (criada se não existir)")
+    p_create.set_defaults(func=_cmd_create)
+
+    p_batch = sub.add_parser(
+        "batch", aliases=["lote"], parents=[comum], help="cria a estrutura dos clientes de um CSV"
+    )
+    p_batch.add_argument("csv", help="CSV com as colunas nome;cnpj;raiz (e, opcional, tipo = modelo do cliente)")
+    p_batch.add_argument("--clientes", type=int, default=4, metavar="N", help="clientes em paralelo (padrão: 4)")
+    p_batch.add_argument("--relatorio", metavar="ARQUIVO", help="CSV de relatório (padrão: <csv>_relatorio.csv)")
+    p_batch.set_defaults(func=_cmd_batch)
+
+    p_audit = sub.add_parser(
+        "audit", aliases=["auditar"], parents=[opcao_modelo, saida, perfil, simulacao],
+        help="confere todos os clientes de uma raiz contra o modelo",
+    )
+    p_audit.add_argument("raiz", help="pasta que contém as pastas dos clientes")
+    p_audit.add_argument("--saida", metavar="ARQUIVO", help="grava uma linha JSON por cliente (JSONL)")
+    p_audit.add_argument("--jobs", type=int, metavar="N", help="clientes auditados em paralelo (padrão: 16)")
+    p_audit.set_defaults(func=_cmd_audit)
+
+    p_modelos = sub.add_parser(
+        "templates", aliases=["modelos"], help="lista os tipos de cliente (modelos JSON/TOML encontrados)"
+    )
+    p_modelos.add_argument("--validar", action="store_true", help="lê e valida cada modelo (ignora o cache)")
+    p_modelos.add_argument("--json", action="store_true", help="imprime a lista em JSON no stdout")
+    p_modelos.set_defaults(func=_cmd_modelos)
+
+    p_migrate = sub.add_parser(
+        "migrate", aliases=["migrar"], parents=[saida, perfil, simulacao],
+        help="aplica aos clientes de uma raiz os passos das versões novas do modelo padrão",
+        description=(
+            "Aplica aos clientes de uma raiz os passos das versões novas do modelo embutido (padrao). "
+            "Clientes de modelos externos (JSON/TOML) ficam como OUTRO MODELO: a mudança de um "
+            "arquivo de modelo não tem migração."
+        ),
+    )
+    p_migrate.add_argument("raiz", help="pasta que contém as pastas dos clientes")
+    p_migrate.add_argument("--ensaio", action="store_true", help="só mostra os passos pendentes (não altera nada)")
+    p_migrate.add_argument(
+        "--assumir-versao", type=int, metavar="N",
+        help="versão do modelo dos clientes sem marcador (sem isso, eles ficam de fora)",
+    )
+    p_migrate.add_argument("--saida", metavar="ARQUIVO", help="grava uma linha JSON por cliente (JSONL)")
+    p_migrate.add_argument("--jobs", type=int, metavar="N", help="clientes migrados em paralelo (padrão: 16)")
+    p_migrate.set_defaults(func=_cmd_migrate)
+
+    p_indice = sub.add_parser(
+        "indice", aliases=["index"], help="índice local (SQLite) dos clientes: atualiza e consulta"
+    )
+    p_indice.add_argument("--banco", metavar="ARQUIVO", help="arquivo do índice (padrão: na pasta de dados do usuário)")
+    sub_indice = p_indice.add_subparsers(dest="acao", metavar="AÇÃO")
+    sub_indice.required = True
+    p_atualizar = sub_indice.add_parser(
+        "atualizar", parents=[opcao_modelo, saida, perfil, simulacao],
+        help="audita os clientes de uma raiz e grava o resultado no índice",
+    )
+    p_atualizar.add_argument("raiz", help="pasta que contém as pastas dos clientes")
+    p_atualizar.add_argument("--jobs", type=int, metavar="N", help="clientes verificados em paralelo (padrão: 16)")
+    p_atualizar.set_defaults(func=_cmd_indice_atualizar)
+
+    p_faltando = sub_indice.add_parser(
+        "faltando", parents=[saida], help="clientes sem uma pasta do modelo (nome ou caminho relativo)"
+    )
+    p_faltando.add_argument("pasta", help='ex.: "07. Certidoes" ou "02. Empresa/07. Certidoes"')
+    p_faltando.set_defaults(func=_cmd_indice_faltando)
+
+    p_clientes = sub_indice.add_parser("clientes", parents=[saida], help="lista os clientes do índice")
+    p_clientes.add_argument("--situacao", choices=["CONFORME", "DIVERGENTE", "ERRO"], type=str.upper)
+    p_clientes.add_argument("--versao", metavar="VERSÃO", help="só clientes com esta versão do modelo no marcador")
+    p_clientes.set_defaults(func=_cmd_indice_clientes)
+
+    p_resumo = sub_indice.add_parser("resumo", parents=[saida], help="totais por situação e versão")
+    p_resumo.set_defaults(func=_cmd_indice_resumo)
+
+    p_bench = sub.add_parser("bench", help="mede o desempenho do motor (e compara com uma linha de base)")
+    p_bench.add_argument("--saida", metavar="ARQUIVO", help="grava o resultado em JSON")
+    p_bench.add_argument("--baseline", metavar="ARQUIVO", help="JSON de uma execução anterior para comparar")
+    p_bench.add_argument(
+        "--tolerancia", type=float, metavar="FRAÇÃO",
+        help="queda de desempenho aceita antes de acusar regressão (padrão: 0.25)",
+    )
+    p_bench.add_argument("--repeticoes", type=int, default=3, metavar="N", help="execuções por cenário (padrão: 3)")
+    p_bench.add_argument("--rapido", action="store_true", help="reduz os cenários grandes")
+    p_bench.add_argument("--cenario", action="append", metavar="TEXTO", help="só cenários cujo nome contém TEXTO")
+    p_bench.add_argument("--json", action="store_true", help="imprime o resultado em JSON no stdout")
+    p_bench.add_argument("-q", "--silencioso", action="store_true", help="não imprime a tabela")
+    p_bench.set_defaults(func=_cmd_bench)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Ponto de entrada da linha de comando; devolve o código de saída."""
+    args = _parser().parse_args(argv)
+    if not getattr(args, "perfil", False):
+        return _executar(args)
+    from .perfil import Perfil
+
+    with Perfil(args.comando) as perfil:
+        codigo = _executar(args)
+    if perfil.arquivos:
+        print(f"Perfil gravado em: {perfil.arquivos[0]} (resumo: {perfil.arquivos[1]})", file=sys.stderr)
+    else:
+        print(f"[AVISO] Não foi possível gravar o perfil -> {perfil.erro}", file=sys.stderr)
+    return codigo
+
+
+def _executar(args: argparse.Namespace) -> int:
+    try:
+        return args.func(args)
+    except ErroUso as e:
+        print(f"[ERRO] {e}", file=sys.stderr)
+        return SAIDA_USO
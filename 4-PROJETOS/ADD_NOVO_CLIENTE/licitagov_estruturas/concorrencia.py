@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+
+"""
+Concorrência adaptativa e novas tentativas para compartilhamentos instáveis.
+
+Um número fixo de threads ou subutiliza um servidor rápido ou afoga um
+lento em timeouts. Com criar_arvore(adaptativo=True):
+
+• ControleConcorrencia decide quantas pastas ficam em andamento ao mesmo
+  tempo (AIMD): dobra no começo e depois sobe de um em um enquanto a
+  latência se mantém; cai pela metade quando aparecem erros transitórios.
+• SistemaResiliente repete as chamadas que falharam por motivo transitório
+  (timeout, rede caiu por um instante), com espera exponencial aleatória.
+
+mapear_limitado é a janela de envio usada por auditoria, índice e
+migrações: muitos clientes, poucos em memória.
+"""
+
+from __future__ import annotations
+
+import errno
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, cast
+
+from .sistema_arquivos import Caminho, Entrada, Estado, SistemaArquivos
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+CONCORRENCIA_INICIAL = 2
+CONCORRENCIA_MAXIMA = 16     # Teto quando o chamador não informa um (trabalhadores=1)
+JANELA_MINIMA = 4            # Chamadas observadas antes de cada ajuste
+FOLGA_LATENCIA = 1.5         # Até 1,5x a latência de referência: ainda pode subir
+LATENCIA_SATURADA = 2.0      # Acima de 2x: o servidor está saturando, desce um
+
+TENTATIVAS = 4               # Novas tentativas por chamada (além da primeira)
+ESPERA_BASE_S = 0.05
+ESPERA_MAXIMA_S = 2.0
+
+# errno / winerror de falhas que costumam passar sozinhas
+_ERRNOS_TRANSITORIOS = {
+    errno.ETIMEDOUT, errno.EAGAIN, errno.EBUSY, errno.EINTR,
+    errno.ECONNRESET, errno.ECONNABORTED, errno.ENETDOWN, errno.ENETUNREACH,
+    errno.ENETRESET, errno.EHOSTUNREACH, errno.EHOSTDOWN,
+}
+_WINERRORS_TRANSITORIOS = {
+    53,    # ERROR_BAD_NETPATH
+    59,    # ERROR_UNEXP_NET_ERR
+    64,    # ERROR_NETNAME_DELETED
+    121,   # ERROR_SEM_TIMEOUT
+    1231,  # ERROR_NETWORK_UNREACHABLE
+}
+
+
+def erro_transitorio(erro: BaseException) -> bool:
+    """True se vale a pena tentar de novo (timeout, conexão perdida...)."""
+    if isinstance(erro, (TimeoutError, ConnectionError, InterruptedError, BlockingIOError)):
+        return True
+    if not isinstance(erro, OSError):
+        return False
+    return erro.errno in _ERRNOS_TRANSITORIOS or getattr(erro, "winerror", None) in _WINERRORS_TRANSITORIOS
+
+
+def espera_com_variacao(tentativa: int) -> float:
+    """Espera antes da nova tentativa nº 'tentativa' (0, 1, ...): exponencial, sorteada."""
+    return random.uniform(0, min(ESPERA_MAXIMA_S, ESPERA_BASE_S * (2 ** tentativa)))
+
+
+def mapear_limitado(
+    pool: Executor,
+    funcao: Callable[[T], R],
+    itens: Iterable[T],
+    janela: int,
+) -> Iterator[Tuple[T, "Future[R]"]]:
+    """
+    pool.submit(funcao, item) para cada item, com no máximo 'janela' em andamento.
+
+    Entrega (item, futuro) na ordem de término, na thread de quem itera.
+    'itens' é lido aos poucos — só quando abre uma vaga —, então um
+    gerador pode parar a qualquer momento (cancelamento) e a memória não
+    cresce com o número de itens.
+    """
+    janela = max(1, janela)
+    andamento: Dict["Future[R]", T] = {}
+
+    def prontos() -> Iterator[Tuple[T, "Future[R]"]]:
+        concluidos, _ = wait(andamento, return_when=FIRST_COMPLETED)
+        for futuro in concluidos:
+            yield andamento.pop(futuro), futuro
+
+    for item in itens:
+        if len(andamento) >= janela:
+            yield from prontos()
+        andamento[pool.submit(funcao, item)] = item
+    while andamento:
+        yield from prontos()
+
+
+class ControleConcorrencia:
+    """
+    Limite de pastas em andamento, ajustado pelo que o servidor responde.
+
+    As threads chamam entrar()/sair() em volta de cada pasta; o
+    SistemaResiliente informa cada chamada (latência, falha transitória)
+    com registrar(). A cada janela de chamadas o limite é revisto:
+    • houve falha transitória: limite cai pela metade;
+    • latência até FOLGA_LATENCIA x a referência: limite sobe — dobra até
+      o primeiro sinal de saturação ("partida lenta"), depois sobe um;
+    • latência acima de LATENCIA_SATURADA x a referência: limite desce um.
+    A referência é a menor latência mediana já vista (o servidor "folgado").
+    """
+
+    def __init__(self, maximo: int, inicial: int = CONCORRENCIA_INICIAL, minimo: int = 1) -> None:
+        self.minimo = max(1, minimo)
+        self.maximo = max(self.minimo, maximo)
+        self.limite = min(max(inicial, self.minimo), self.maximo)
+        self.pico = self.limite
+        self.ajustes = 0
+        self.retentativas = 0
+        self.falhas_transitorias = 0
+        self._referencia: Optional[float] = None
+        self._latencias: List[float] = []
+        self._falhas_janela = 0
+        self._partida_lenta = True
+        self._ativos = 0
+        self._condicao = threading.Condition()
+
+    # --- Vagas ---
+    def entrar(self) -> None:
+        """Espera uma vaga (bloqueia enquanto o limite estiver tomado)."""
+        with self._condicao:
+            while self._ativos >= self.limite:
+                self._condicao.wait()
+            self._ativos += 1
+
+    def sair(self) -> None:
+        with self._condicao:
+            self._ativos -= 1
+            self._condicao.notify()
+
+    # --- Observações ---
+    def registrar(self, segundos: float, falhou: bool = False) -> None:
+        """Uma chamada ao servidor terminou (falhou=True: erro transitório)."""
+        with self._condicao:
+            if falhou:
+                self.falhas_transitorias += 1
+                self._falhas_janela += 1
+            else:
+                self._latencias.append(segundos)
+            if len(self._latencias) + self._falhas_janela >= max(JANELA_MINIMA, self.limite):
+                self._ajustar()
+
+    def contar_retentativa(self) -> None:
+        with self._condicao:
+            self.retentativas += 1
+
+    def _ajustar(self) -> None:
+        anterior = self.limite
+        if self._falhas_janela:
+            self._partida_lenta = False
+            self.limite = max(self.minimo, self.limite // 2)
+        elif self._latencias:
+            mediana = statistics.median(self._latencias)
+            if self._referencia is None or mediana < self._referencia:
+                self._referencia = mediana
+            if mediana <= self._referencia * FOLGA_LATENCIA:
+                passo = self.limite if self._partida_lenta else 1
+                self.limite = min(self.maximo, self.limite + passo)
+            else:
+                self._partida_lenta = False
+                if mediana > self._referencia * LATENCIA_SATURADA:
+                    self.limite = max(self.minimo, self.limite - 1)
+        self._latencias.clear()
+        self._falhas_janela = 0
+        if self.limite != anterior:
+            self.ajustes += 1
+            self.pico = max(self.pico, self.limite)
+            self._condicao.notify_all()  # Limite maior: acorda quem esperava vaga
+
+    def como_dict(self) -> Dict[str, Any]:
+        """Resumo para o resultado da execução."""
+        return {
+            "final": self.limite,
+            "pico": self.pico,
+            "maximo": self.maximo,
+            "ajustes": self.ajustes,
+            "retentativas": self.retentativas,
+            "falhas_transitorias": self.falhas_transitorias,
+        }
+
+
+class SistemaResiliente(SistemaArquivos):
+    """
+    Envolve outro SistemaArquivos repetindo as falhas transitórias.
+
+    Cada chamada é repetida até 'tentativas' vezes, com espera exponencial
+    sorteada (espera_com_variacao) entre uma e outra; latência e falhas vão
+    para o ControleConcorrencia. Erros definitivos (FileExistsError,
+    permissão negada...) passam direto — exceto o FileExistsError de um
+    mkdir repetido após timeout, que conta como pasta criada.
+    """
+
+    def __init__(self, interno: SistemaArquivos, controle: ControleConcorrencia, tentativas: int = TENTATIVAS) -> None:
+        self.interno = interno
+        self.controle = controle
+        self.tentativas = tentativas
+
+    def _chamar(self, funcao: Callable[[], T], criacao: bool = False) -> T:
+        """
+        Chama 'funcao' repetindo as falhas transitórias.
+
+        criacao=True (mkdir): se uma tentativa anterior falhou por timeout e
+        a seguinte encontra a pasta, foi a anterior que a criou no servidor
+        (só a resposta se perdeu) — conta como criada, não como existente.
+        """
+        tentativa = 0
+        while True:
+            inicio = time.perf_counter()
+            try:
+                retorno = funcao()
+            except FileExistsError:
+                self.controle.registrar(time.perf_counter() - inicio)
+                if criacao and tentativa > 0:
+                    return cast(T, None)
+                raise
+            except OSError as e:
+                transitorio = erro_transitorio(e)
+                self.controle.registrar(time.perf_counter() - inicio, falhou=transitorio)
+                if not transitorio or tentativa >= self.tentativas:
+                    raise
+                self.controle.contar_retentativa()
+                time.sleep(espera_com_variacao(tentativa))
+                tentativa += 1
+            else:
+                self.controle.registrar(time.perf_counter() - inicio)
+                return retorno
+
+    def mkdir(self, caminho: Caminho) -> None:
+        self._chamar(lambda: self.interno.mkdir(caminho), criacao=True)
+
+    def rmdir(self, caminho: Caminho) -> None:
+        self._chamar(lambda: self.interno.rmdir(caminho))
+
+    def scandir(self, caminho: Caminho) -> List[Entrada]:
+        return self._chamar(lambda: self.interno.scandir(caminho))
+
+    def stat(self, caminho: Caminho) -> Estado:
+        return self._chamar(lambda: self.interno.stat(caminho))
+
+    def rename(self, origem: Caminho, destino: Caminho) -> None:
+        self._chamar(lambda: self.interno.rename(origem, destino))
+
+    def abrir_pasta(self, caminho: Caminho, pai: Any = None, nome: str = "") -> Any:
+        return self._chamar(lambda: self.interno.abrir_pasta(caminho, pai, nome))
+
+    def mkdir_em(self, pasta: Any, nome: str, caminho: Caminho) -> None:
+        self._chamar(lambda: self.interno.mkdir_em(pasta, nome, caminho), criacao=True)
+
+    def fechar_pasta(self, pasta: Any) -> None:
+        self.interno.fechar_pasta(pasta)
+
+    def ler_texto(self, caminho: Caminho) -> str:
+        return self._chamar(lambda: self.interno.ler_texto(caminho))
+
+    def escrever_texto(self, caminho: Caminho, texto: str, oculto: bool = False) -> None:
+        self._chamar(lambda: self.interno.escrever_texto(caminho, texto, oculto))
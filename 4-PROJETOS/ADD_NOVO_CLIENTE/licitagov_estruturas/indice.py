@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+
+"""
+Índice local (SQLite) dos clientes e da situação da estrutura de cada um.
+
+    python -m licitagov_estruturas indice atualizar "\\\\Servidor\\Clientes"
+    python -m licitagov_estruturas indice faltando "07. Certidoes"
+    python -m licitagov_estruturas indice clientes --situacao DIVERGENTE
+
+"atualizar" audita (ver auditoria.py) todos os clientes da raiz e grava o
+resultado. Não há atalho por mtime: conferir o mtime de cada pasta que a
+auditoria lista custa um stat por pasta — o mesmo número de idas ao
+servidor que a própria listagem — e o mtime da pasta do cliente só muda
+com as filhas diretas. As consultas ("quem não tem 07. Certidoes?") leem
+só o SQLite, sem tocar no compartilhamento.
+
+O arquivo fica na pasta de dados do usuário (ver registro.diretorio_dados).
+"""
+
+from __future__ import annotations
+
+import sqlite3                          # Índice local dos clientes
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path, PurePath
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Union
+
+from .auditoria import TRABALHADORES, AuditoriaCliente, auditar_raiz
+from .motor import TokenCancelamento
+from .plano import PlanoCriacao, compilar_plano
+from .registro import diretorio_dados
+from .sistema_arquivos import SISTEMA_LOCAL, SistemaArquivos
+
+ARQUIVO_INDICE = "indice_clientes.sqlite3"
+VERSAO_ESQUEMA = 2
+LOTE_GRAVACAO = 500          # Clientes por transação durante a atualização
+_TABELAS = ("faltando", "nome_errado", "extras", "mtimes", "clientes", "meta")  # Filhas antes de clientes
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS clientes (
+    id            INTEGER PRIMARY KEY,
+    pasta         TEXT NOT NULL UNIQUE,
+    raiz          TEXT NOT NULL,
+    nome          TEXT NOT NULL,
+    situacao      TEXT NOT NULL,      -- CONFORME / DIVERGENTE / ERRO (como na auditoria)
+    versao        TEXT,               -- Versão do modelo no marcador (NULL = sem marcador)
+    hash_modelo   TEXT NOT NULL,      -- Modelo usado na auditoria (outro modelo = auditar de novo)
+    extras_total  INTEGER NOT NULL,
+    erro          TEXT NOT NULL,
+    auditado_em   TEXT NOT NULL,
+    geracao       INTEGER NOT NULL    -- Atualização que viu o cliente pela última vez
+);
+CREATE INDEX IF NOT EXISTS clientes_raiz ON clientes (raiz, geracao);
+CREATE INDEX IF NOT EXISTS clientes_situacao ON clientes (situacao);
+CREATE TABLE IF NOT EXISTS faltando (
+    cliente  INTEGER NOT NULL REFERENCES clientes (id) ON DELETE CASCADE,
+    relativo TEXT NOT NULL,
+    nome     TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (cliente, relativo)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS faltando_nome ON faltando (nome);
+CREATE INDEX IF NOT EXISTS faltando_relativo ON faltando (relativo COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS nome_errado (
+    cliente    INTEGER NOT NULL REFERENCES clientes (id) ON DELETE CASCADE,
+    esperado   TEXT NOT NULL,
+    encontrado TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nome_errado_cliente ON nome_errado (cliente);
+CREATE TABLE IF NOT EXISTS extras (
+    cliente  INTEGER NOT NULL REFERENCES clientes (id) ON DELETE CASCADE,
+    relativo TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS extras_cliente ON extras (cliente);
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+
+
+def caminho_indice() -> Path:
+    """Arquivo padrão do índice (na pasta de dados do usuário)."""
+    return diretorio_dados() / ARQUIVO_INDICE
+
+
+@dataclass
+class ResumoAtualizacao:
+    """O que uma atualização do índice fez."""
+
+    raiz: Path
+    novos: int = 0
+    reauditados: int = 0
+    removidos: int = 0
+    segundos: float = 0.0
+    cancelado: bool = False
+
+    @property
+    def clientes(self) -> int:
+        return self.novos + self.reauditados
+
+    def como_dict(self) -> Dict[str, Any]:
+        return {
+            "raiz": str(self.raiz),
+            "clientes": self.clientes,
+            "novos": self.novos,
+            "reauditados": self.reauditados,
+            "removidos": self.removidos,
+            "segundos": round(self.segundos, 3),
+            "cancelado": self.cancelado,
+        }
+
+
+class IndiceClientes:
+    """
+    O índice em SQLite. Use como gerenciador de contexto:
+
+        with IndiceClientes() as indice:
+            indice.atualizar(Path(r"\\\\Servidor\\Clientes"), ESTRUTURA_PADRAO)
+            print(indice.faltando("07. Certidoes"))
+
+    Só a thread que o abriu deve usá-lo (as auditorias rodam em outras
+    threads, mas as gravações acontecem todas na de quem chamou).
+    """
+
+    def __init__(self, caminho: Optional[Path] = None) -> None:
+        self.caminho = Path(caminho) if caminho else caminho_indice()
+        self._conexao = sqlite3.connect(str(self.caminho))
+        self._conexao.row_factory = sqlite3.Row
+        self._conexao.execute("PRAGMA foreign_keys = ON")
+        self._conexao.execute("PRAGMA journal_mode = WAL")
+        self._preparar_esquema()
+
+    def _preparar_esquema(self) -> None:
+        """Cria as tabelas; um índice de outra versão do esquema é descartado (basta atualizar de novo)."""
+        c = self._conexao
+        tem_meta = c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta'").fetchone()
+        versao = c.execute("SELECT valor FROM meta WHERE chave = 'esquema'").fetchone() if tem_meta else None
+        if versao is not None and versao[0] != str(VERSAO_ESQUEMA):
+            for tabela in _TABELAS:
+                c.execute(f"DROP TABLE IF EXISTS {tabela}")
+        c.executescript(_ESQUEMA)
+        c.execute("INSERT OR IGNORE INTO meta (chave, valor) VALUES ('esquema', ?)", (str(VERSAO_ESQUEMA),))
+        c.commit()
+
+    def fechar(self) -> None:
+        self._conexao.close()
+
+    def __enter__(self) -> "IndiceClientes":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.fechar()
+
+    # --- Atualização ---
+    def _gravar(self, raiz: str, item: AuditoriaCliente, hash_modelo: str, geracao: int, agora: str) -> None:
+        c = self._conexao
+        pasta = str(item.pasta)
+        c.execute("DELETE FROM clientes WHERE pasta = ?", (pasta,))  # Detalhes saem em cascata
+        cursor = c.execute(
+            "INSERT INTO clientes (pasta, raiz, nome, situacao, versao, hash_modelo, extras_total, erro,"
+            " auditado_em, geracao) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (pasta, raiz, item.pasta.name, item.situacao, item.versao, hash_modelo, item.extras_total,
+             item.erro, agora, geracao),
+        )
+        cliente = cursor.lastrowid
+        c.executemany(
+            "INSERT OR IGNORE INTO faltando (cliente, relativo, nome) VALUES (?, ?, ?)",
+            ((cliente, r, PurePath(r).name) for r in item.faltando),
+        )
+        c.executemany(
+            "INSERT INTO nome_errado (cliente, esperado, encontrado) VALUES (?, ?, ?)",
+            ((cliente, e, n) for e, n in item.nome_errado),
+        )
+        c.executemany("INSERT INTO extras (cliente, relativo) VALUES (?, ?)", ((cliente, r) for r in item.extras))
+
+    def atualizar(
+        self,
+        raiz: Path,
+        modelo: Union[Mapping[str, Union[dict, list]], Iterable[str], PlanoCriacao],
+        log: Callable[[str], None] = lambda _msg: None,
+        *,
+        trabalhadores: int = TRABALHADORES,
+        sistema: SistemaArquivos = SISTEMA_LOCAL,
+        cancelamento: Optional[TokenCancelamento] = None,
+    ) -> ResumoAtualizacao:
+        """
+        Audita todos os clientes sob 'raiz' e grava o resultado no índice.
+
+        • As auditorias rodam em paralelo (auditar_raiz); as gravações, na
+          thread de quem chamou, em transações de LOTE_GRAVACAO clientes.
+        • Clientes que sumiram da raiz saem do índice (exceto se cancelado).
+        """
+        plano = compilar_plano(modelo)
+        raiz = Path(raiz)
+        raiz_txt = str(raiz)
+        resumo = ResumoAtualizacao(raiz)
+        inicio = time.perf_counter()
+        agora = datetime.now().isoformat(timespec="seconds")
+        c = self._conexao
+        geracao = (c.execute("SELECT MAX(geracao) FROM clientes").fetchone()[0] or 0) + 1
+        pendentes_gravacao = 0
+
+        def registrar(item: AuditoriaCliente) -> None:
+            nonlocal pendentes_gravacao
+            if c.execute("SELECT 1 FROM clientes WHERE pasta = ?", (str(item.pasta),)).fetchone() is None:
+                resumo.novos += 1
+            else:
+                resumo.reauditados += 1
+            self._gravar(raiz_txt, item, plano.hash, geracao, agora)
+            if item.situacao != "CONFORME":
+                log(f"[{item.situacao}] {item.pasta.name}")
+            pendentes_gravacao += 1
+            if pendentes_gravacao >= LOTE_GRAVACAO:
+                c.commit()
+                pendentes_gravacao = 0
+
+        auditoria = auditar_raiz(
+            raiz, plano, registrar, trabalhadores=trabalhadores, sistema=sistema, cancelamento=cancelamento
+        )
+        resumo.cancelado = auditoria.cancelado
+        if not resumo.cancelado:
+            resumo.removidos = c.execute(
+                "DELETE FROM clientes WHERE raiz = ? AND geracao < ?", (raiz_txt, geracao)
+            ).rowcount
+        c.execute(
+            "INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", (f"atualizado_em:{raiz_txt}", agora)
+        )
+        c.commit()
+        resumo.segundos = time.perf_counter() - inicio
+        return resumo
+
+    # --- Consultas (só SQLite) ---
+    def faltando(self, pasta: str) -> List[Dict[str, Any]]:
+        """
+        Clientes sem a pasta 'pasta' do modelo.
+
+        'pasta' pode ser o nome ("07. Certidoes") ou o caminho relativo
+        ("02. Empresa/07. Certidoes"); maiúsculas não importam.
+        """
+        relativo = str(PurePath(pasta))
+        linhas = self._conexao.execute(
+            "SELECT c.pasta, c.nome, c.versao, c.auditado_em, f.relativo FROM faltando f"
+            " JOIN clientes c ON c.id = f.cliente"
+            " WHERE f.nome = ? OR f.relativo = ? COLLATE NOCASE ORDER BY c.nome, f.relativo",
+            (pasta, relativo),
+        )
+        return [dict(linha) for linha in linhas]
+
+    def clientes(
+        self,
+        situacao: Optional[str] = None,
+        versao: Optional[str] = None,
+        raiz: Optional[Path] = None,
+    ) -> List[Dict[str, Any]]:
+        """Clientes do índice, filtrados por situação, versão do modelo e/ou raiz."""
+        filtros: List[str] = []
+        valores: List[Any] = []
+        if situacao:
+            filtros.append("situacao = ?")
+            valores.append(situacao.upper())
+        if versao:
+            filtros.append("versao = ?")
+            valores.append(versao)
+        if raiz is not None:
+            filtros.append("raiz = ?")
+            valores.append(str(raiz))
+        onde = f" WHERE {' AND '.join(filtros)}" if filtros else ""
+        linhas = self._conexao.execute(
+            "SELECT pasta, nome, situacao, versao, extras_total, erro, auditado_em,"
+            " (SELECT COUNT(*) FROM faltando f WHERE f.cliente = clientes.id) AS faltando,"
+            " (SELECT COUNT(*) FROM nome_errado n WHERE n.cliente = clientes.id) AS nome_errado"
+            f" FROM clientes{onde} ORDER BY nome",
+            valores,
+        )
+        return [dict(linha) for linha in linhas]
+
+    def detalhes(self, pasta: str) -> Optional[Dict[str, Any]]:
+        """Tudo o que o índice sabe de um cliente (None se não estiver nele)."""
+        c = self._conexao
+        linha = c.execute("SELECT * FROM clientes WHERE pasta = ?", (str(pasta),)).fetchone()
+        if linha is None:
+            return None
+        dados = dict(linha)
+        cliente = dados.pop("id")
+        dados.pop("geracao")
+        dados["faltando"] = [r[0] for r in c.execute(
+            "SELECT relativo FROM faltando WHERE cliente = ? ORDER BY relativo", (cliente,))]
+        dados["extras"] = [r[0] for r in c.execute(
+            "SELECT relativo FROM extras WHERE cliente = ? ORDER BY relativo", (cliente,))]
+        dados["nome_errado"] = [
+            {"esperado": r[0], "encontrado": r[1]}
+            for r in c.execute("SELECT esperado, encontrado FROM nome_errado WHERE cliente = ?", (cliente,))
+        ]
+        return dados
+
+    def resumo(self) -> Dict[str, Any]:
+        """Totais por situação e por versão do modelo, e as pastas que mais faltam."""
+        c = self._conexao
+        return {
+            "clientes": c.execute("SELECT COUNT(*) FROM clientes").fetchone()[0],
+            "por_situacao": dict(c.execute("SELECT situacao, COUNT(*) FROM clientes GROUP BY situacao").fetchall()),
+            "por_versao": {
+                (v if v is not None else "sem marcador"): n
+                for v, n in c.execute("SELECT versao, COUNT(*) FROM clientes GROUP BY versao")
+            },
+            "mais_faltando": [
+                {"relativo": r, "clientes": n}
+                for r, n in c.execute(
+                    "SELECT relativo, COUNT(*) AS n FROM faltando GROUP BY relativo ORDER BY n DESC, relativo LIMIT 10"
+                )
+            ],
+        }
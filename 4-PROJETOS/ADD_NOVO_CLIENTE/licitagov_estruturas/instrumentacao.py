@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+"""
+Instrumentação opcional do motor: tempo e chamadas de disco por pasta.
+
+Responde a "a ferramenta está lenta no nosso servidor": o tempo foi para o
+mkdir, para as listagens (verificação do que já existe) ou para o log?
+
+    instr = Instrumentacao()
+    criar_arvore(base, ESTRUTURA_PADRAO, log=log, instrumentacao=instr)
+    instr.encerrar()
+    instr.gravar_json(Path("medicao.json"))
+
+Sem instrumentacao (o padrão), o motor só faz um teste "is None" por pasta.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+from .sistema_arquivos import Caminho, Entrada, Estado, SistemaArquivos
+
+T = TypeVar("T")
+
+# Faixas do histograma de tempo por pasta (limite superior, em ms)
+FAIXAS_MS = (0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0, 500.0, 1000.0)
+
+
+class MedicaoNo(NamedTuple):
+    """Uma pasta medida."""
+
+    caminho: str
+    situacao: str     # criada / existente / listada / erro (como no motor)
+    segundos: float   # Tempo de parede do mkdir (e do que mais a pasta exigiu)
+    chamadas: int     # Primitivas do SistemaArquivos feitas para esta pasta
+    mensagem: str = ""
+
+
+class _SistemaMedido(SistemaArquivos):
+    """Repassa tudo ao sistema interno, contando as chamadas por thread."""
+
+    def __init__(self, interno: SistemaArquivos, instrumentacao: "Instrumentacao") -> None:
+        self.interno = interno
+        self._instr = instrumentacao
+
+    def mkdir(self, caminho: Caminho) -> None:
+        self._instr._contar("mkdir")
+        self.interno.mkdir(caminho)
+
+    def rmdir(self, caminho: Caminho) -> None:
+        self._instr._contar("rmdir")
+        self.interno.rmdir(caminho)
+
+    def scandir(self, caminho: Caminho) -> List[Entrada]:
+        self._instr._contar("scandir")
+        return self.interno.scandir(caminho)
+
+    def stat(self, caminho: Caminho) -> Estado:
+        self._instr._contar("stat")
+        return self.interno.stat(caminho)
+
+    def rename(self, origem: Caminho, destino: Caminho) -> None:
+        self._instr._contar("rename")
+        self.interno.rename(origem, destino)
+
+    def abrir_pasta(self, caminho: Caminho, pai: Any = None, nome: str = "") -> Any:
+        self._instr._contar("abrir_pasta")
+        return self.interno.abrir_pasta(caminho, pai, nome)
+
+    def mkdir_em(self, pasta: Any, nome: str, caminho: Caminho) -> None:
+        self._instr._contar("mkdir")
+        self.interno.mkdir_em(pasta, nome, caminho)
+
+    def fechar_pasta(self, pasta: Any) -> None:
+        self.interno.fechar_pasta(pasta)
+
+    def ler_texto(self, caminho: Caminho) -> str:
+        self._instr._contar("ler_texto")
+        return self.interno.ler_texto(caminho)
+
+    def escrever_texto(self, caminho: Caminho, texto: str, oculto: bool = False) -> None:
+        self._instr._contar("escrever_texto")
+        self.interno.escrever_texto(caminho, texto, oculto)
+
+
+class Instrumentacao:
+    """
+    Coletor de medições de uma ou mais execuções de criar_arvore.
+
+    Pode ser compartilhado entre threads (ex.: todos os clientes de um lote).
+    • nos: MedicaoNo de cada pasta, na ordem do log.
+    • fases: tempo e chamadas de etapas que não pertencem a uma pasta só
+      ("listagem" do modo incremental, "marcador").
+    • log: quantas linhas foram entregues à função de log e o tempo gasto nela.
+    """
+
+    def __init__(self) -> None:
+        self.inicio = time.perf_counter()
+        self.fim: Optional[float] = None
+        self.nos: List[MedicaoNo] = []
+        self.chamadas: Dict[str, int] = {}
+        self.fases: Dict[str, Dict[str, float]] = {}
+        self.linhas_log = 0
+        self.segundos_log = 0.0
+        self._trava = threading.Lock()
+        self._local = threading.local()
+        self._medidas: Dict[str, Tuple[float, int]] = {}
+
+    # --- Coleta (chamada pelo motor) ---
+    def _contar(self, operacao: str) -> None:
+        self._local.chamadas = getattr(self._local, "chamadas", 0) + 1
+        with self._trava:
+            self.chamadas[operacao] = self.chamadas.get(operacao, 0) + 1
+
+    def _chamadas_da_thread(self) -> int:
+        return getattr(self._local, "chamadas", 0)
+
+    def sistema(self, interno: SistemaArquivos) -> SistemaArquivos:
+        """Envolve 'interno' para que cada chamada seja contada."""
+        return _SistemaMedido(interno, self)
+
+    def envolver_log(self, log: Callable[[str], None]) -> Callable[[str], None]:
+        """Devolve uma função de log que mede o tempo gasto em 'log'."""
+
+        def medido(msg: str) -> None:
+            inicio = time.perf_counter()
+            log(msg)
+            gasto = time.perf_counter() - inicio
+            with self._trava:
+                self.linhas_log += 1
+                self.segundos_log += gasto
+
+        return medido
+
+    def cronometrar(self, caminho: Path, funcao: Callable[[], T]) -> T:
+        """Executa o trabalho de uma pasta guardando tempo e chamadas (até registrar_no)."""
+        antes = self._chamadas_da_thread()
+        inicio = time.perf_counter()
+        try:
+            return funcao()
+        finally:
+            medida = (time.perf_counter() - inicio, self._chamadas_da_thread() - antes)
+            with self._trava:
+                self._medidas[str(caminho)] = medida
+
+    def registrar_no(self, caminho: Path, situacao: str, mensagem: str = "") -> None:
+        """Fecha a medição de uma pasta (as não cronometradas contam zero)."""
+        chave = str(caminho)
+        with self._trava:
+            segundos, chamadas = self._medidas.pop(chave, (0.0, 0))
+            self.nos.append(MedicaoNo(chave, situacao, segundos, chamadas, mensagem))
+
+    @contextmanager
+    def fase(self, nome: str) -> Iterator[None]:
+        """Mede uma etapa do motor que não pertence a uma pasta específica."""
+        antes = self._chamadas_da_thread()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            gasto = time.perf_counter() - inicio
+            chamadas = self._chamadas_da_thread() - antes
+            with self._trava:
+                dados = self.fases.setdefault(nome, {"vezes": 0, "segundos": 0.0, "chamadas": 0})
+                dados["vezes"] += 1
+                dados["segundos"] += gasto
+                dados["chamadas"] += chamadas
+
+    def encerrar(self) -> None:
+        """Marca o fim da medição (o tempo total para de correr)."""
+        self.fim = time.perf_counter()
+
+    # --- Consolidação ---
+    def histograma(self) -> List[Dict[str, Any]]:
+        """
+        Quantas pastas caíram em cada faixa de tempo (ver FAIXAS_MS).
+
+        Só entram as pastas que exigiram chamadas próprias (as confirmadas
+        pela listagem do modo incremental não têm tempo individual).
+        """
+        contagem = [0] * (len(FAIXAS_MS) + 1)
+        for no in self.nos:
+            if no.chamadas:
+                contagem[bisect.bisect_left(FAIXAS_MS, no.segundos * 1000.0)] += 1
+        return [
+            {"ate_ms": FAIXAS_MS[i] if i < len(FAIXAS_MS) else None, "pastas": n}
+            for i, n in enumerate(contagem)
+        ]
+
+    def resumo(self) -> Dict[str, Any]:
+        """Totais por situação, por operação e por fase, mais o histograma."""
+        por_situacao: Dict[str, Dict[str, float]] = {}
+        for no in self.nos:
+            dados = por_situacao.setdefault(no.situacao, {"pastas": 0, "segundos": 0.0, "chamadas": 0})
+            dados["pastas"] += 1
+            dados["segundos"] += no.segundos
+            dados["chamadas"] += no.chamadas
+
+        tempos = sorted(no.segundos for no in self.nos if no.chamadas)
+
+        def percentil(p: float) -> Optional[float]:
+            if not tempos:
+                return None
+            return round(tempos[min(len(tempos) - 1, int(p * len(tempos)))] * 1000.0, 3)
+
+        fim = self.fim if self.fim is not None else time.perf_counter()
+        return {
+            "total_s": round(fim - self.inicio, 6),
+            "pastas": len(self.nos),
+            "por_situacao": {
+                s: {"pastas": d["pastas"], "segundos": round(d["segundos"], 6), "chamadas": d["chamadas"]}
+                for s, d in sorted(por_situacao.items())
+            },
+            "chamadas": dict(sorted(self.chamadas.items())),
+            "fases": {
+                n: {"vezes": d["vezes"], "segundos": round(d["segundos"], 6), "chamadas": d["chamadas"]}
+                for n, d in sorted(self.fases.items())
+            },
+            "log": {"linhas": self.linhas_log, "segundos": round(self.segundos_log, 6)},
+            "ms_por_pasta": {"p50": percentil(0.50), "p90": percentil(0.90), "p99": percentil(0.99),
+                             "max": round(tempos[-1] * 1000.0, 3) if tempos else None},
+            "histograma": self.histograma(),
+        }
+
+    def como_dict(self, incluir_nos: bool = True) -> Dict[str, Any]:
+        """Resumo e, opcionalmente, a medição de cada pasta (serializável em JSON)."""
+        dados = self.resumo()
+        if incluir_nos:
+            dados["nos"] = [
+                {"caminho": n.caminho, "situacao": n.situacao, "ms": round(n.segundos * 1000.0, 3),
+                 "chamadas": n.chamadas, **({"mensagem": n.mensagem} if n.mensagem else {})}
+                for n in self.nos
+            ]
+        return dados
+
+    def gravar_json(self, caminho: Path, incluir_nos: bool = True) -> None:
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.como_dict(incluir_nos), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+"""
+Modo lote: cria a estrutura de vários clientes listados em um CSV.
+"""
+
+from __future__ import annotations
+
+import csv                              # Leitura da lista de clientes (modo lote)
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .modelos_externos import ErroModelo, carregar_modelo, erro_nome_pasta
+from .motor import ResultadoCriacao, criar_arvore
+from .plano import PlanoCriacao, compilar_plano
+from .sistema_arquivos import SISTEMA_LOCAL
+
+
+# ------------------------------------------------------------
+# MODO LOTE (vários clientes a partir de um CSV)
+# ------------------------------------------------------------
+# O CSV (exportado do Excel, separado por ";" ou ",") precisa das colunas:
+#   nome;cnpj;raiz
+#   Empresa X;12.345.678/0001-90;\\Servidor\Clientes
+# A pasta de cada cliente é <raiz>\<nome> — o nome é uma pasta só (sem
+# "\", "/", ".." nem caracteres que o Windows recusa). Uma coluna "tipo"
+# (opcional) escolhe o modelo de cada cliente (ver modelos_externos.py);
+# vazia = o modelo do lote.
+COLUNAS_LOTE = ("nome", "cnpj", "raiz")
+COLUNA_TIPO = "tipo"
+
+
+@dataclass(frozen=True)
+class ClienteLote:
+    """Uma linha do CSV de clientes."""
+
+    nome: str
+    cnpj: str
+    raiz: Path
+    tipo: str = ""      # Tipo de cliente (modelo); "" = o modelo do lote
+
+    @property
+    def pasta(self) -> Path:
+        """Pasta do cliente (raiz + nome)."""
+        return self.raiz / self.nome
+
+
+@dataclass
+class ItemLote:
+    """Resultado de um cliente dentro do lote."""
+
+    cliente: ClienteLote
+    resultado: Optional[ResultadoCriacao] = None
+    erro: str = ""          # Falha que impediu o cliente inteiro (ex.: raiz inacessível)
+    cancelado: bool = False  # Lote cancelado antes de este cliente começar
+
+    @property
+    def situacao(self) -> str:
+        if self.cancelado or (self.resultado is not None and self.resultado.cancelado):
+            return "CANCELADO"
+        if self.erro:
+            return "FALHOU"
+        if self.resultado is not None and not self.resultado.ok:
+            return "COM ERROS"
+        return "OK"
+
+
+@dataclass
+class RelatorioLote:
+    """Resumo de um lote: um ItemLote por cliente, na ordem em que terminaram."""
+
+    itens: List[ItemLote] = field(default_factory=list)
+
+    def contar(self, situacao: str) -> int:
+        return sum(1 for item in self.itens if item.situacao == situacao)
+
+    def como_dict(self) -> Dict[str, Any]:
+        """Resumo serializável em JSON (usado pela linha de comando)."""
+        return {
+            "clientes": len(self.itens),
+            "ok": self.contar("OK"),
+            "com_erros": self.contar("COM ERROS"),
+            "falharam": self.contar("FALHOU"),
+            "cancelados": self.contar("CANCELADO"),
+            "itens": [
+                {
+                    "nome": item.cliente.nome,
+                    "cnpj": item.cliente.cnpj,
+                    "tipo": item.cliente.tipo,
+                    "situacao": item.situacao,
+                    "erro": item.erro,
+                    **(item.resultado.como_dict() if item.resultado else {"base": str(item.cliente.pasta)}),
+                }
+                for item in self.itens
+            ],
+        }
+
+    def escrever_csv(self, destino: Path) -> None:
+        """Grava o relatório (um cliente por linha) em CSV separado por ";"."""
+        with open(destino, "w", encoding="utf-8-sig", newline="") as f:
+            w = csv.writer(f, delimiter=";")
+            w.writerow(["nome", "cnpj", "pasta", "situacao", "criadas", "existentes", "erros", "mensagem", "tipo"])
+            for item in self.itens:
+                r = item.resultado
+                w.writerow([
+                    item.cliente.nome,
+                    item.cliente.cnpj,
+                    str(item.cliente.pasta),
+                    item.situacao,
+                    len(r.criadas) if r else 0,
+                    len(r.existentes) if r else 0,
+                    len(r.erros) if r else 0,
+                    item.erro or "; ".join(f"{p} -> {m}" for p, m in (r.erros if r else [])),
+                    item.cliente.tipo,
+                ])
+
+
+def ler_clientes_csv(caminho: Path) -> List[ClienteLote]:
+    """
+    Lê o CSV de clientes (colunas nome, cnpj, raiz e, opcional, tipo;
+    maiúsculas são ignoradas).
+
+    Lança ValueError com o número da linha quando algo estiver faltando ou
+    o nome não servir como nome de pasta (ex.: "..\\x", "a/b", "C:\\x") —
+    antes de criar qualquer pasta do lote.
+    """
+    with open(caminho, encoding="utf-8-sig", newline="") as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=";,")
+        except csv.Error:
+            dialeto = csv.excel
+        leitor = csv.DictReader(f, dialect=dialeto)
+
+        colunas = {(c or "").strip().lower(): c for c in (leitor.fieldnames or [])}
+        ausentes = [c for c in COLUNAS_LOTE if c not in colunas]
+        if ausentes:
+            raise ValueError(f"Colunas ausentes no CSV: {', '.join(ausentes)}")
+
+        clientes: List[ClienteLote] = []
+        for linha in leitor:
+            valores = {c: (linha.get(colunas[c]) or "").strip() for c in COLUNAS_LOTE}
+            if not any(valores.values()):
+                continue  # Linha em branco
+            if not valores["nome"] or not valores["raiz"]:
+                raise ValueError(f"Linha {leitor.line_num}: 'nome' e 'raiz' são obrigatórios.")
+            motivo = erro_nome_pasta(valores["nome"])
+            if motivo:
+                raise ValueError(f"Linha {leitor.line_num}: nome de cliente {valores['nome']!r} {motivo}.")
+            tipo = (linha.get(colunas[COLUNA_TIPO]) or "").strip() if COLUNA_TIPO in colunas else ""
+            clientes.append(ClienteLote(valores["nome"], valores["cnpj"], Path(valores["raiz"]), tipo))
+    return clientes
+
+
+def planos_por_tipo(
+    clientes: Iterable[ClienteLote],
+    modelo: Union[Mapping[str, Union[dict, list]], Iterable[str], PlanoCriacao],
+) -> Dict[str, Union[PlanoCriacao, ErroModelo]]:
+    """
+    Plano de cada tipo de cliente presente no lote ("" = 'modelo').
+
+    Cada tipo é carregado (e a herança resolvida) uma vez só; um tipo
+    inválido vira o ErroModelo no lugar do plano (os clientes dele falham,
+    os demais seguem).
+    """
+    planos: Dict[str, Union[PlanoCriacao, ErroModelo]] = {"": compilar_plano(modelo)}
+    for cliente in clientes:
+        if cliente.tipo not in planos:
+            try:
+                planos[cliente.tipo] = carregar_modelo(cliente.tipo).plano
+            except ErroModelo as e:
+                planos[cliente.tipo] = e
+    return planos
+
+
+def _provisionar_cliente(
+    cliente: ClienteLote,
+    plano: Union[PlanoCriacao, ErroModelo],
+    opcoes: Dict[str, Any],
+) -> Tuple[ItemLote, List[str]]:
+    """Cria a estrutura de um cliente; devolve o item e as linhas de log."""
+    linhas: List[str] = []
+    item = ItemLote(cliente)
+    cancelamento = opcoes.get("cancelamento")
+    if cancelamento is not None and cancelamento.cancelado:
+        item.cancelado = True  # Verificado entre um cliente e outro
+        return item, linhas
+    if isinstance(plano, ErroModelo):
+        item.erro = f"modelo '{cliente.tipo}': {plano}"
+        return item, linhas
+    if cliente.tipo:
+        opcoes = {**opcoes, "tipo_modelo": cliente.tipo}  # Vai para o marcador
+    sistema = opcoes.get("sistema", SISTEMA_LOCAL)
+    try:
+        if not opcoes.get("montagem") and not sistema.existe(cliente.pasta):
+            try:
+                sistema.criar_pasta(cliente.pasta, parents=True)
+            except FileExistsError:
+                pass  # Criada por outro processo nesse meio-tempo
+            linhas.append(f"Pasta base inexistente — criada: {cliente.pasta}")
+        item.resultado = criar_arvore(cliente.pasta, plano, log=linhas.append, **opcoes)
+    except Exception as e:
+        item.erro = str(e)
+        progresso = opcoes.get("progresso")
+        if progresso is not None and item.resultado is None:
+            progresso.avancar(len(plano))  # Cliente inteiro conta como processado
+    return item, linhas
+
+
+def provisionar_lote(
+    clientes: Iterable[ClienteLote],
+    modelo: Union[Mapping[str, Union[dict, list]], Iterable[str], PlanoCriacao],
+    log: Callable[[str], None] = lambda _msg: None,
+    *,
+    clientes_em_paralelo: int = 4,
+    **opcoes: Any,
+) -> RelatorioLote:
+    """
+    Cria a estrutura de vários clientes, vários ao mesmo tempo.
+
+    • clientes_em_paralelo: tamanho do pool (um cliente por thread).
+    • opcoes: repassadas a criar_arvore (ex.: incremental=True; tipo_modelo
+      vale para os clientes sem "tipo"). Com
+      cancelamento=TokenCancelamento(), os clientes ainda não iniciados
+      saem como "CANCELADO" e os em andamento param entre duas pastas.
+      Com montagem=True a pasta do cliente não é criada antes: a montagem
+      a põe no lugar já completa.
+
+    O modelo de cada tipo de cliente (coluna "tipo"; vazio = 'modelo') é
+    compilado uma vez só para o lote inteiro. Cada cliente é
+    registrado no log (em bloco, sem misturar linhas de clientes diferentes)
+    assim que termina — a ordem de término não é garantida.
+    """
+    clientes = list(clientes)
+    planos = planos_por_tipo(clientes, modelo)
+    relatorio = RelatorioLote()
+
+    with ThreadPoolExecutor(max_workers=max(1, clientes_em_paralelo)) as pool:
+        futuros = [pool.submit(_provisionar_cliente, c, planos[c.tipo], opcoes) for c in clientes]
+        for futuro in as_completed(futuros):
+            item, linhas = futuro.result()
+            relatorio.itens.append(item)
+
+            log(f"=== {item.cliente.nome} ({item.cliente.cnpj or 'sem CNPJ'}) — {item.cliente.pasta}")
+            for linha in linhas:
+                log(linha)
+            if item.erro:
+                log(f"[ERRO] {item.cliente.pasta} -> {item.erro}")
+            log(f"=== {item.cliente.nome}: {item.situacao}")
+
+    return relatorio
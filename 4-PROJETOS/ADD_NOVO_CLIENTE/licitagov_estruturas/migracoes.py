@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+
+"""
+Migrações do modelo: leva os clientes existentes à versão atual.
+
+    python -m licitagov_estruturas migrar "\\\\Servidor\\Clientes" --ensaio
+    python -m licitagov_estruturas migrar "\\\\Servidor\\Clientes" --jobs 16
+
+Quando ESTRUTURA_PADRAO muda, criar_arvore só acrescenta pastas novas a
+quem passar pela ferramenta de novo — e um nó renomeado vira uma pasta
+nova ao lado da antiga, com os documentos ainda na antiga. Aqui cada
+versão do modelo tem seus passos (adicionar, renomear, mover) e cada
+cliente recebe só os passos das versões posteriores à do seu marcador.
+
+• Renomear/mover usa sistema.rename dentro da pasta do cliente (mesmo
+  volume): a pasta muda de lugar com o conteúdo, nada é copiado. Se o SO
+  recusar (ex.: EXDEV), o passo falha — não há cópia de reserva.
+• Renomear só as maiúsculas ("Contratos" -> "contratos") funciona também
+  onde o disco não as diferencia (Windows, SMB): a pasta passa por um
+  nome temporário.
+• Os passos são idempotentes: origem ausente e destino presente = passo
+  já aplicado (ex.: execução anterior interrompida).
+• O marcador só avança após todos os passos de uma versão darem certo.
+• Vários clientes são migrados ao mesmo tempo; os passos de um mesmo
+  cliente rodam em ordem.
+
+Limite: as versões (VERSAO_ESTRUTURA) e os passos são os do modelo
+embutido ("padrao"). Clientes de um modelo externo (modelos_externos.py,
+"modelo" no marcador) ficam como "OUTRO MODELO" e não são alterados — a
+mudança de um arquivo de modelo não tem migração: o criar_arvore
+acrescenta as pastas novas, e renomear/mover fica para uma pessoa.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from pathlib import Path, PurePath
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .auditoria import ate_cancelar, listar_clientes
+from .concorrencia import mapear_limitado
+from .modelo import TIPO_PADRAO, VERSAO_ESTRUTURA
+from .motor import MARCADOR, TokenCancelamento, ler_marcador
+from .sistema_arquivos import SISTEMA_LOCAL, SistemaArquivos
+
+TRABALHADORES = 16           # Clientes migrados ao mesmo tempo
+
+ADICIONAR = "adicionar"
+RENOMEAR = "renomear"
+MOVER = "mover"
+
+
+@dataclass(frozen=True)
+class Passo:
+    """
+    Um passo de migração (caminhos relativos à pasta do cliente, com "/").
+
+    • adicionar: cria 'caminho' (e os pais que faltarem);
+    • renomear: 'caminho' passa a se chamar 'destino' (só o nome, mesma pasta-pai);
+    • mover: 'caminho' vai para o caminho relativo 'destino'.
+    """
+
+    acao: str
+    caminho: str
+    destino: str = ""
+
+    @property
+    def alvo(self) -> PurePath:
+        """Caminho relativo final da pasta."""
+        if self.acao == ADICIONAR:
+            return PurePath(self.caminho)
+        if self.acao == RENOMEAR:
+            return PurePath(self.caminho).with_name(self.destino)
+        return PurePath(self.destino)
+
+    def __str__(self) -> str:
+        if self.acao == ADICIONAR:
+            return f"adicionar '{self.caminho}'"
+        return f"{self.acao} '{self.caminho}' -> '{self.alvo.as_posix()}'"
+
+
+def adicionar(caminho: str) -> Passo:
+    return Passo(ADICIONAR, caminho)
+
+
+def renomear(caminho: str, novo_nome: str) -> Passo:
+    return Passo(RENOMEAR, caminho, novo_nome)
+
+
+def mover(caminho: str, destino: str) -> Passo:
+    return Passo(MOVER, caminho, destino)
+
+
+# ------------------------------------------------------------
+# REGISTRO DE MIGRAÇÕES
+# ------------------------------------------------------------
+# versão -> passos que levam um cliente da versão anterior a ela.
+# Ao mudar ESTRUTURA_PADRAO: aumente VERSAO_ESTRUTURA (modelo.py) e
+# registre aqui os passos da nova versão. Exemplo:
+#
+#     MIGRACOES = {
+#         2: [
+#             adicionar("02. Empresa/21. Novo_Cadastro"),
+#             renomear("01. Licitacao/03. Declinada", "03. Declinadas"),
+#             mover("00. Editais_ANALISAR", "01. Licitacao/00. Editais_ANALISAR"),
+#         ],
+#     }
+#
+# Versões sem entrada não têm passos (só acrescentaram pastas, que o
+# criar_arvore já cria). Nunca altere os passos de uma versão publicada.
+MIGRACOES: Mapping[int, Sequence[Passo]] = {}
+
+
+def validar_migracoes(migracoes: Mapping[int, Sequence[Passo]], versao_atual: int = VERSAO_ESTRUTURA) -> None:
+    """Lança ValueError se o registro tiver versão, ação ou caminho inválido."""
+    for versao, passos in migracoes.items():
+        if not isinstance(versao, int) or not 2 <= versao <= versao_atual:
+            raise ValueError(f"versão de migração inválida: {versao!r} (deve ir de 2 a {versao_atual})")
+        for passo in passos:
+            if passo.acao not in (ADICIONAR, RENOMEAR, MOVER):
+                raise ValueError(f"versão {versao}: ação desconhecida {passo.acao!r}")
+            caminhos = [passo.caminho] + ([passo.destino] if passo.acao != ADICIONAR else [])
+            for caminho in caminhos:
+                partes = PurePath(caminho).parts
+                if not caminho or PurePath(caminho).is_absolute() or ".." in partes or "." in partes:
+                    raise ValueError(f"versão {versao}: caminho inválido em {passo}")
+            if passo.acao == RENOMEAR and len(PurePath(passo.destino).parts) != 1:
+                raise ValueError(f"versão {versao}: renomear recebe só o novo nome, não '{passo.destino}'")
+            if passo.acao == MOVER and PurePath(passo.caminho) in PurePath(passo.destino).parents:
+                raise ValueError(f"versão {versao}: não é possível mover uma pasta para dentro dela mesma ({passo})")
+
+
+def passos_pendentes(
+    versao: int,
+    migracoes: Mapping[int, Sequence[Passo]] = MIGRACOES,
+    versao_atual: int = VERSAO_ESTRUTURA,
+) -> List[Tuple[int, Sequence[Passo]]]:
+    """(versão, passos) que faltam para quem está em 'versao', em ordem."""
+    return [(v, migracoes.get(v, ())) for v in range(versao + 1, versao_atual + 1)]
+
+
+@dataclass
+class MigracaoCliente:
+    """O que a migração fez (ou faria, no ensaio) em um cliente."""
+
+    pasta: Path
+    modelo: Optional[str] = TIPO_PADRAO  # Tipo do modelo no marcador (None = modelo avulso)
+    de: Optional[int] = None           # Versão encontrada (None = sem marcador)
+    para: Optional[int] = None         # Versão gravada no marcador ao final
+    aplicados: List[str] = field(default_factory=list)
+    ja_aplicados: List[str] = field(default_factory=list)   # Origem ausente e destino presente
+    erros: List[Tuple[str, str]] = field(default_factory=list)  # (passo, mensagem)
+    erro: str = ""                     # Falha que impediu o cliente inteiro
+
+    @property
+    def situacao(self) -> str:
+        if self.erro:
+            return "ERRO"
+        if self.de is None:
+            return "SEM MARCADOR"
+        if self.modelo != TIPO_PADRAO:
+            return "OUTRO MODELO"
+        if self.erros:
+            return "PARCIAL" if self.para is not None and self.para > self.de else "COM ERROS"
+        if self.para is not None and self.para > self.de:
+            return "MIGRADO"
+        return "EM DIA"
+
+    def como_dict(self) -> Dict[str, Any]:
+        """Uma linha do JSONL de migração."""
+        return {
+            "cliente": self.pasta.name,
+            "pasta": str(self.pasta),
+            "situacao": self.situacao,
+            "modelo": self.modelo,
+            "de": self.de,
+            "para": self.para,
+            "aplicados": self.aplicados,
+            "ja_aplicados": self.ja_aplicados,
+            "erros": [{"passo": p, "mensagem": m} for p, m in self.erros],
+            "erro": self.erro,
+        }
+
+
+@dataclass
+class ResumoMigracao:
+    """Totais de uma migração (os detalhes de cada cliente saem em ao_migrar)."""
+
+    raiz: Path
+    versao: int = VERSAO_ESTRUTURA
+    por_situacao: Dict[str, int] = field(default_factory=dict)
+    passos: int = 0
+    segundos: float = 0.0
+    cancelado: bool = False
+    ensaio: bool = False
+
+    @property
+    def clientes(self) -> int:
+        return sum(self.por_situacao.values())
+
+    @property
+    def ok(self) -> bool:
+        return not any(self.por_situacao.get(s) for s in ("ERRO", "PARCIAL", "COM ERROS"))
+
+    def contar(self, item: MigracaoCliente) -> None:
+        self.por_situacao[item.situacao] = self.por_situacao.get(item.situacao, 0) + 1
+        self.passos += len(item.aplicados)
+
+    def como_dict(self) -> Dict[str, Any]:
+        return {
+            "raiz": str(self.raiz),
+            "versao": self.versao,
+            "clientes": self.clientes,
+            "por_situacao": dict(sorted(self.por_situacao.items())),
+            "passos": self.passos,
+            "segundos": round(self.segundos, 3),
+            "cancelado": self.cancelado,
+            "ensaio": self.ensaio,
+        }
+
+
+def _existe_pasta(sistema: SistemaArquivos, caminho: Path) -> bool:
+    try:
+        return sistema.is_dir(caminho)
+    except OSError:
+        return False
+
+
+def _mesma_entrada(sistema: SistemaArquivos, origem: Path, destino: Path) -> Optional[bool]:
+    """
+    Em um disco que não diferencia maiúsculas (Windows, SMB), origem e
+    destino que só diferem nelas são a mesma pasta. Devolve None se não é
+    esse o caso; senão, se o nome gravado ainda é o da origem (True = falta
+    renomear, False = já renomeada).
+    """
+    if str(origem) == str(destino) or str(origem).casefold() != str(destino).casefold():
+        return None
+    nomes = {entrada.nome for entrada in sistema.scandir(destino.parent)}
+    if origem.name in nomes and destino.name in nomes:
+        return None  # Disco que diferencia maiúsculas: são duas pastas
+    return destino.name not in nomes
+
+
+def _aplicar(sistema: SistemaArquivos, base: Path, passo: Passo, ensaio: bool) -> bool:
+    """
+    Aplica um passo; devolve False se ele já estava aplicado.
+
+    Lança OSError/ValueError se não for possível (o chamador registra).
+    """
+    destino = base / passo.alvo
+    if passo.acao == ADICIONAR:
+        if _existe_pasta(sistema, destino):
+            return False
+        if not ensaio:
+            sistema.criar_pasta(destino, parents=True)
+        return True
+
+    origem = base / passo.caminho
+    tem_origem = _existe_pasta(sistema, origem)
+    tem_destino = _existe_pasta(sistema, destino)
+    if tem_origem and tem_destino:
+        falta = _mesma_entrada(sistema, origem, destino)
+        if falta is not None:
+            # Só muda maiúsculas ("Contratos" -> "contratos"): a pasta passa
+            # por um nome temporário (alguns servidores SMB ignoram o rename
+            # direto quando os nomes são "iguais")
+            if falta and not ensaio:
+                temporario = origem.with_name(f".{origem.name}.renomeando")
+                sistema.rename(origem, temporario)
+                sistema.rename(temporario, destino)
+            return falta
+    if not tem_origem:
+        if tem_destino:
+            return False
+        # Nem origem nem destino: o cliente fica com a pasta que o modelo espera
+        if not ensaio:
+            sistema.criar_pasta(destino, parents=True)
+        return True
+    if tem_destino:
+        # Destino vazio (ex.: criar_arvore rodou com o modelo novo antes da
+        # migração): sai do caminho. Com conteúdo, juntar as duas exigiria
+        # mover documentos — fica para uma pessoa.
+        if sistema.scandir(destino):
+            raise ValueError(f"'{passo.alvo.as_posix()}' já existe (com conteúdo) ao lado de '{passo.caminho}'")
+        if ensaio:
+            return True
+        sistema.rmdir(destino)
+    if not ensaio:
+        if not _existe_pasta(sistema, destino.parent):
+            sistema.criar_pasta(destino.parent, parents=True)
+        sistema.rename(origem, destino)  # Mesmo volume: só a entrada do diretório muda
+    return True
+
+
+def _gravar_versao(
+    sistema: SistemaArquivos, base: Path, marcador: Dict[str, Any], versao: int
+) -> None:
+    """
+    Atualiza a versão no marcador (mantém o hash: a árvore pode ter outras
+    pastas faltando, e o próximo criar_arvore ainda deve conferir tudo).
+    """
+    dados = dict(marcador)
+    dados["versao"] = versao
+    dados["migrado_em"] = datetime.now().isoformat(timespec="seconds")
+    sistema.escrever_texto(base / MARCADOR, json.dumps(dados, ensure_ascii=False, indent=2), oculto=True)
+
+
+def migrar_cliente(
+    base: Path,
+    *,
+    sistema: SistemaArquivos = SISTEMA_LOCAL,
+    migracoes: Mapping[int, Sequence[Passo]] = MIGRACOES,
+    versao_atual: int = VERSAO_ESTRUTURA,
+    assumir_versao: Optional[int] = None,
+    ensaio: bool = False,
+) -> MigracaoCliente:
+    """
+    Aplica em 'base' os passos das versões posteriores à do marcador.
+
+    • Cliente sem marcador: só é migrado com assumir_versao (a versão em
+      que ele está, do modelo padrão); sem isso, fica como "SEM MARCADOR".
+    • Cliente de outro modelo (marcador com "modelo" diferente de
+      "padrao"): fica como "OUTRO MODELO", sem passos.
+    • Um passo com erro interrompe o cliente: o marcador fica na última
+      versão completa, e os passos seguintes esperam a próxima execução.
+    • ensaio=True: só descreve o que seria feito (nada é alterado; cada
+      passo é avaliado contra a pasta como ela está).
+    """
+    base = Path(base)
+    item = MigracaoCliente(base)
+    marcador = ler_marcador(base, sistema)
+    if marcador is not None:
+        try:
+            item.de = int(marcador.get("versao", 1))
+        except (TypeError, ValueError):
+            item.erro = f"versão inválida no marcador: {marcador.get('versao')!r}"
+            return item
+        item.modelo = marcador.get("modelo", TIPO_PADRAO)  # Sem "modelo": marcador antigo, do padrão
+    elif assumir_versao is not None:
+        item.de = assumir_versao
+        marcador = {"modelo": TIPO_PADRAO}
+    else:
+        return item
+    item.para = item.de
+    if item.modelo != TIPO_PADRAO:
+        return item
+
+    for versao, passos in passos_pendentes(item.de, migracoes, versao_atual):
+        for passo in passos:
+            try:
+                aplicado = _aplicar(sistema, base, passo, ensaio)
+            except (OSError, ValueError) as e:
+                item.erros.append((str(passo), str(e)))
+                return item
+            (item.aplicados if aplicado else item.ja_aplicados).append(str(passo))
+        if not ensaio:
+            try:
+                _gravar_versao(sistema, base, marcador, versao)
+            except OSError as e:
+                item.erros.append((f"marcador v{versao}", str(e)))
+                return item
+        item.para = versao
+    return item
+
+
+def migrar_raiz(
+    raiz: Path,
+    ao_migrar: Callable[[MigracaoCliente], None] = lambda _item: None,
+    *,
+    trabalhadores: int = TRABALHADORES,
+    sistema: SistemaArquivos = SISTEMA_LOCAL,
+    migracoes: Mapping[int, Sequence[Passo]] = MIGRACOES,
+    versao_atual: int = VERSAO_ESTRUTURA,
+    assumir_versao: Optional[int] = None,
+    ensaio: bool = False,
+    cancelamento: Optional[TokenCancelamento] = None,
+) -> ResumoMigracao:
+    """
+    Migra todos os clientes sob 'raiz', 'trabalhadores' ao mesmo tempo.
+
+    Como em auditar_raiz: a raiz é lida aos poucos, 'ao_migrar' recebe cada
+    cliente assim que ele termina (na thread de quem chamou) e, com
+    cancelamento, nenhum cliente novo é iniciado (os que já começaram
+    terminam).
+    """
+    validar_migracoes(migracoes, versao_atual)
+    resumo = ResumoMigracao(Path(raiz), versao=versao_atual, ensaio=ensaio)
+    inicio = time.perf_counter()
+    trabalhadores = max(1, trabalhadores)
+    opcoes = dict(
+        sistema=sistema, migracoes=migracoes, versao_atual=versao_atual,
+        assumir_versao=assumir_versao, ensaio=ensaio,
+    )
+
+    pastas = ate_cancelar(listar_clientes(Path(raiz), sistema), cancelamento, resumo)
+
+    with ThreadPoolExecutor(max_workers=trabalhadores) as pool:
+        migrar = partial(migrar_cliente, **opcoes)
+        for _pasta, futuro in mapear_limitado(pool, migrar, pastas, 2 * trabalhadores):
+            item = futuro.result()
+            resumo.contar(item)
+            ao_migrar(item)
+
+    resumo.segundos = time.perf_counter() - inicio
+    return resumo
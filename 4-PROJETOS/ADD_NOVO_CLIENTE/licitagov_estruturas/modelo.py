@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+Modelo padrão da estrutura de pastas de um cliente Licitagov.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, Union
+
+
+# ------------------------------------------------------------
+# MODELO DE ESTRUTURA
+# ------------------------------------------------------------
+# Representa a árvore de pastas que será criada.
+# • Dicionário = pasta com filhos (subpastas).
+# • {} (dict vazio) = pasta “folha” (sem filhos).
+# • Você pode renomear, adicionar ou remover nós livremente.
+# • Ao alterar o modelo, aumente VERSAO_ESTRUTURA (vai para o marcador) e,
+#   se renomeou ou moveu pastas, registre os passos em migracoes.MIGRACOES
+#   (senão os clientes existentes ficam com a pasta antiga e a nova, vazia).
+VERSAO_ESTRUTURA = 1
+# Nome do ESTRUTURA_PADRAO entre os tipos de cliente (vai para o marcador;
+# as migrações de VERSAO_ESTRUTURA valem só para os clientes dele)
+TIPO_PADRAO = "padrao"
+
+ESTRUTURA_PADRAO: Mapping[str, Union[dict, list]] = {
+    "00. Editais_ANALISAR": {},
+    "01. Licitacao": {
+        "01. Participar": {
+            "01. JANEIRO": {},
+            "02. FEVEREIRO": {},
+            "03. MARCO": {},
+            "04. ABRIL": {},
+            "05. MAIO": {},
+            "06. JUNHO": {},
+            "07. JULHO": {},
+            "08. AGOSTO": {},
+            "09. SETEMBRO": {},
+            "10. OUTUBRO": {},
+            "11. NOVEMBRO": {},
+            "12. DEZEMBRO": {},
+        },
+        "02. Vencedora": {},
+        "03. Declinada": {},
+        "04. Suspensa": {},
+        "05. Modelos_Padrao": {
+            "DECLARACAO": {},
+            "PROPOSTA": {},
+            "PLANILHA": {},
+        },
+    },
+    "02. Empresa": {
+        "01. CNPJ": {},
+        "02. Socios": {},
+        "03. Alvara": {},
+        "04. Dados_Bancarios": {},
+        "05. Contrato_Social": {},
+        "06. Balanco_Patrimonial": {},
+        "07. Certidoes": {},
+        "08. Acessos": {},
+        "09. CAF_Digital_BA": {},
+        "10. SICAF": {},
+        "11. Compras_Salvador": {},
+        "12. Encargos_Tributacao": {},
+        "13. SMS": {},
+        "14. Compras_FIEB": {},
+        "15. Impostos": {},
+        "16. Juridico": {},
+        "17. Financeiro": {},
+        "18. Antecipa_EMBASA": {},
+        "19. Inscricao_Estadual": {},
+        "20. Inscricao_Municipal": {},
+    },
+    "03. Qualificacao_Tecnica": {
+        "01. RT": {},
+        "02. ACT": {},
+        "03. CAT": {},
+        "04. CAO": {},
+        "05. CREA_PJ": {},
+        "06. CREA_PF": {},
+        "07. ART_CONTRATOS": {},
+    },
+    "04. Orcamentos_Propostas": {},
+    "05. Planejamento_Gestao": {},
+    "06. Biblioteca": {
+        "01. Logo_Marca": {},
+        "02. Carimbos": {},
+        "03. Assinatura": {},
+        "04. Modelos_Administrativos": {
+            "01. Recurso": {},
+            "02. Contrarrazao": {},
+            "03. Impugnacao": {},
+            "04. Esclarecimento": {},
+        },
+    },
+}
@@ -0,0 +1,575 @@
+# -*- coding: utf-8 -*-
+
+"""
+Modelos externos: a estrutura de cada tipo de cliente em um arquivo JSON/TOML.
+
+Mudar o layout não exige gerar o .exe de novo: basta colocar
+"<tipo>.json" (ou .toml) em uma das pastas de modelos (ver pastas_modelos).
+O tipo "padrao" sem arquivo é o ESTRUTURA_PADRAO embutido.
+
+    modelos/bahia.json
+    {
+        "descricao": "Clientes da Bahia",
+        "estrutura": {"00. Editais_ANALISAR": {}, "01. Licitacao": {...}}
+    }
+
+    modelos/bahia.toml
+    descricao = "Clientes da Bahia"
+    [estrutura]
+    "00. Editais_ANALISAR" = {}
+    "01. Licitacao" = { "01. Participar" = ["01. JANEIRO", "02. FEVEREIRO"] }
+
+Um modelo pode herdar de outro ("base": tipo ou arquivo) e só descrever
+a diferença — aplicada nesta ordem: remover, substituir, adicionar. Um
+"padrao.json" com "base": "padrao" estende o padrão embutido (a base com
+o tipo do próprio arquivo é a definição seguinte dele, não ele mesmo):
+
+    modelos/geral.json
+    {
+        "base": "padrao",
+        "remover": ["02. Empresa/09. CAF_Digital_BA", "02. Empresa/11. Compras_Salvador"],
+        "substituir": {"06. Biblioteca/02. Carimbos": ["Digitais", "Fisicos"]},
+        "adicionar": {"02. Empresa": {"21. Novo_Cadastro": {}}}
+    }
+
+Só é lido como documento (descricao/estrutura/base...) o arquivo que tem
+algum valor de texto no primeiro nível ("base", "descricao") ou só chaves
+de documento com "estrutura" — numa árvore todo valor é objeto ou lista.
+Os demais são a própria árvore (o mesmo formato do --template de sempre),
+mesmo com pastas chamadas "base" ou "estrutura". Cada arquivo é validado uma vez e o plano compilado
+vai para um cache em disco (pasta de dados do usuário), conferido pelo
+mtime/tamanho do arquivo e, se eles mudaram, pelo SHA-256 do conteúdo.
+Aberturas seguintes leem o cache sem interpretar o arquivo de novo.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle                           # Cache do plano compilado (só o próprio usuário grava)
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .modelo import ESTRUTURA_PADRAO, TIPO_PADRAO
+from .plano import PlanoCriacao, compactar_plano, compilar_plano, hash_modelo, plano_compacto
+from .registro import diretorio_dados
+
+VARIAVEL_MODELOS = "LICITAGOV_MODELOS"   # Pastas extras de modelos (separadas por os.pathsep)
+PASTA_MODELOS = "modelos"
+PASTA_CACHE = "cache_modelos"
+EXTENSOES = (".json", ".toml")
+VERSAO_CACHE = 2
+FOLGA_MTIME_S = 2.0          # Arquivo alterado perto da gravação do cache: confere o conteúdo
+
+_CHAVES_DOCUMENTO = {"descricao", "estrutura", "base", "adicionar", "remover", "substituir"}
+_CHAVES_SOBREPOSICAO = ("adicionar", "remover", "substituir")
+_PROIBIDOS = set('<>:"/\\|?*')  # Caracteres que o Windows não aceita em nomes
+
+
+class ErroModelo(ValueError):
+    """Arquivo de modelo ilegível ou inválido (a mensagem diz onde)."""
+
+
+@dataclass(frozen=True)
+class ModeloCarregado:
+    """Um modelo pronto para criar_arvore/provisionar_lote (use .plano)."""
+
+    tipo: str
+    plano: PlanoCriacao
+    arquivo: Optional[Path] = None   # None = ESTRUTURA_PADRAO embutido
+    descricao: str = ""
+    origem: str = "arquivo"          # arquivo / cache / memoria / embutido
+    base: Optional[str] = None       # Modelo herdado ("base" do arquivo)
+
+
+# ------------------------------------------------------------
+# ONDE FICAM OS MODELOS
+# ------------------------------------------------------------
+def pastas_modelos() -> List[Path]:
+    """
+    Pastas procuradas, em ordem de prioridade (o primeiro <tipo> encontrado vale):
+
+    • as de LICITAGOV_MODELOS;
+    • "modelos" ao lado do .exe (ou do LicitagovEstruturasApp.py);
+    • "modelos" na pasta de dados do usuário.
+    """
+    pastas = [Path(p) for p in os.environ.get(VARIAVEL_MODELOS, "").split(os.pathsep) if p]
+    if getattr(sys, "frozen", False):
+        pastas.append(Path(sys.executable).resolve().parent / PASTA_MODELOS)
+    else:
+        pastas.append(Path(__file__).resolve().parent.parent / PASTA_MODELOS)
+    pastas.append(diretorio_dados() / PASTA_MODELOS)
+    return pastas
+
+
+def _arquivos_modelos() -> Iterator[Tuple[str, Path]]:
+    """(tipo, arquivo) de todos os modelos, na ordem de prioridade (repetições incluídas)."""
+    for pasta in pastas_modelos():
+        try:
+            entradas = sorted(os.scandir(pasta), key=lambda e: e.name)
+        except OSError:
+            continue
+        for entrada in entradas:
+            tipo, extensao = os.path.splitext(entrada.name)
+            if extensao.lower() in EXTENSOES and entrada.is_file():
+                yield tipo, Path(entrada.path)
+
+
+def listar_tipos() -> Dict[str, Optional[Path]]:
+    """Tipos de cliente disponíveis -> arquivo (None = padrão embutido), em ordem alfabética."""
+    tipos: Dict[str, Optional[Path]] = {}
+    for tipo, arquivo in _arquivos_modelos():
+        tipos.setdefault(tipo, arquivo)
+    tipos.setdefault(TIPO_PADRAO, None)
+    return dict(sorted(tipos.items()))
+
+
+def _proxima_fonte(tipo: str, arquivo: Path) -> Optional[Path]:
+    """
+    Definição de 'tipo' seguinte a 'arquivo' na ordem de prioridade (None =
+    ESTRUTURA_PADRAO embutido). É a base de um modelo que herda do próprio
+    tipo — "padrao.json" com "base": "padrao" estende o padrão embutido.
+    """
+    fontes: List[Optional[Path]] = [a.resolve() for t, a in _arquivos_modelos() if t == tipo]
+    if tipo == TIPO_PADRAO:
+        fontes.append(None)
+    if arquivo in fontes:
+        fontes = fontes[fontes.index(arquivo) + 1:]
+    fontes = [f for f in fontes if f != arquivo]
+    if not fontes:
+        raise ErroModelo(f"{arquivo}: herda de '{tipo}', mas não há outro modelo '{tipo}' depois dele para herdar")
+    return fontes[0]
+
+
+# ------------------------------------------------------------
+# LEITURA E VALIDAÇÃO
+# ------------------------------------------------------------
+def _interpretar(conteudo: bytes, arquivo: Path) -> Any:
+    if arquivo.suffix.lower() == ".toml":
+        try:
+            import tomllib                  # Python 3.11+
+        except ImportError:
+            try:
+                import tomli as tomllib     # type: ignore[no-redef]  # Pacote opcional (Python < 3.11)
+            except ImportError:
+                raise ErroModelo(f"{arquivo}: modelos TOML exigem Python 3.11+ ou o pacote 'tomli'") from None
+        try:
+            return tomllib.loads(conteudo.decode("utf-8-sig"))
+        except (UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+            raise ErroModelo(f"{arquivo}: TOML inválido -> {e}") from e
+    try:
+        return json.loads(conteudo.decode("utf-8-sig"))
+    except ValueError as e:
+        raise ErroModelo(f"{arquivo}: JSON inválido -> {e}") from e
+
+
+@dataclass
+class _Documento:
+    """Um arquivo de modelo interpretado (ainda sem resolver a herança)."""
+
+    arvore: Any = None
+    descricao: str = ""
+    base: Optional[str] = None
+    sobreposicao: Optional[Dict[str, Any]] = None
+
+
+def _eh_documento(dados: Any) -> bool:
+    """True se 'dados' é um documento de modelo e não a própria árvore (ver o início do módulo)."""
+    if not isinstance(dados, dict):
+        return False
+    if any(isinstance(valor, str) for valor in dados.values()):
+        return True  # Texto ("base": "padrao", "descricao": ...) não existe numa árvore
+    return "estrutura" in dados and set(dados) <= _CHAVES_DOCUMENTO
+
+
+def _documento(dados: Any, arquivo: Path) -> _Documento:
+    if not _eh_documento(dados):
+        return _Documento(arvore=dados)
+    desconhecidas = set(dados) - _CHAVES_DOCUMENTO
+    if desconhecidas:
+        raise ErroModelo(
+            f"{arquivo}: chave(s) desconhecida(s): {', '.join(sorted(desconhecidas))} "
+            f"(um documento de modelo aceita: {', '.join(sorted(_CHAVES_DOCUMENTO))})"
+        )
+    if "estrutura" not in dados and "base" not in dados:
+        raise ErroModelo(f"{arquivo}: falta 'estrutura' (a árvore) ou 'base' (o modelo herdado)")
+    descricao = dados.get("descricao", "")
+    if not isinstance(descricao, str):
+        raise ErroModelo(f"{arquivo}: 'descricao' deve ser texto")
+    if "base" not in dados:
+        if any(c in dados for c in _CHAVES_SOBREPOSICAO):
+            raise ErroModelo(f"{arquivo}: adicionar/remover/substituir exigem 'base'")
+        return _Documento(arvore=dados["estrutura"], descricao=descricao)
+    if "estrutura" in dados:
+        raise ErroModelo(f"{arquivo}: use 'estrutura' ou 'base' (com adicionar/remover/substituir), não os dois")
+    base = dados["base"]
+    if not isinstance(base, str) or not base.strip():
+        raise ErroModelo(f"{arquivo}: 'base' deve ser o tipo ou o arquivo do modelo herdado")
+    sobreposicao = {c: dados[c] for c in _CHAVES_SOBREPOSICAO if c in dados}
+    return _Documento(descricao=descricao, base=base.strip(), sobreposicao=sobreposicao)
+
+
+def erro_nome_pasta(nome: Any) -> str:
+    """Motivo de 'nome' não servir como nome de pasta ("" se serve; vale também para o lote)."""
+    if not isinstance(nome, str):
+        return "deve ser texto"
+    if not nome.strip():
+        return "está vazio"
+    if nome in (".", ".."):
+        return "não pode ser '.' nem '..'"
+    proibidos = _PROIBIDOS.intersection(nome)
+    if proibidos or any(ord(c) < 32 for c in nome):
+        return f"tem caractere não permitido ({''.join(sorted(proibidos)) or 'controle'})"
+    if nome != nome.rstrip(" ."):
+        return "termina em espaço ou ponto (o Windows os remove)"
+    return ""
+
+
+def validar_modelo(arvore: Any, origem: str = "modelo") -> None:
+    """
+    Lança ErroModelo se 'arvore' não puder virar uma estrutura de pastas.
+
+    • Cada nível é um objeto {nome: subárvore} ou uma lista de nomes (folhas);
+      folha = {} ou [].
+    • Nomes válidos no Windows e sem repetição no mesmo nível (maiúsculas
+      não contam: lá "Docs" e "DOCS" são a mesma pasta).
+    Percorre com pilha explícita (modelos profundos não estouram a recursão).
+    """
+    if not isinstance(arvore, (dict, list)) or not arvore:
+        raise ErroModelo(f"{origem}: a estrutura deve ser um objeto ou lista não vazio")
+    pilha: List[Tuple[Any, str]] = [(arvore, "")]
+    while pilha:
+        nivel, caminho = pilha.pop()
+        itens = nivel.items() if isinstance(nivel, dict) else ((nome, {}) for nome in nivel)
+        vistos: Dict[str, str] = {}
+        for nome, sub in itens:
+            onde = f"{caminho}/{nome}" if caminho else str(nome)
+            motivo = erro_nome_pasta(nome)
+            if motivo:
+                raise ErroModelo(f"{origem}: nome '{onde}' {motivo}")
+            chave = nome.casefold()
+            if chave in vistos:
+                raise ErroModelo(f"{origem}: '{onde}' repete '{vistos[chave]}' no mesmo nível")
+            vistos[chave] = nome
+            if not isinstance(sub, (dict, list)):
+                raise ErroModelo(f"{origem}: '{onde}' deve ser um objeto ou lista ({{}} para pasta sem filhas)")
+            if sub:
+                pilha.append((sub, onde))
+
+
+# ------------------------------------------------------------
+# HERANÇA (base + remover / substituir / adicionar)
+# ------------------------------------------------------------
+# A base é sempre convertida para dicts aninhados ({} nas folhas) antes da
+# mesclagem — venha ela do arquivo ou do cache —, então o hash do modelo
+# resultante (que vai para o marcador) não depende de onde a base veio.
+# Cada resultado fica em memória pela combinação hash da base + hash da
+# sobreposição: um lote com vários tipos resolve cada variante uma vez.
+_RESOLVIDOS: Dict[str, PlanoCriacao] = {}
+_TRAVA = threading.Lock()
+
+
+def arvore_do_plano(plano: PlanoCriacao) -> Dict[str, Any]:
+    """O modelo (dicts aninhados, {} nas folhas) que o plano descreve."""
+    raiz: Dict[str, Any] = {}
+    filhos: List[Dict[str, Any]] = []
+    for no in plano.nos:
+        pasta: Dict[str, Any] = {}
+        (filhos[no.pai] if no.pai >= 0 else raiz)[no.nome] = pasta
+        filhos.append(pasta)
+    return raiz
+
+
+def _como_dicts(arvore: Any) -> Dict[str, Any]:
+    """Cópia de 'arvore' com listas de nomes trocadas por {nome: {}} (sem recursão)."""
+    copia: Dict[str, Any] = {}
+    pilha: List[Tuple[Any, Dict[str, Any]]] = [(arvore, copia)]
+    while pilha:
+        origem, destino = pilha.pop()
+        itens = origem.items() if isinstance(origem, dict) else ((nome, {}) for nome in origem)
+        for nome, sub in itens:
+            destino[nome] = {}
+            if sub:
+                pilha.append((sub, destino[nome]))
+    return copia
+
+
+def _partes(caminho: Any, origem: str, chave: str) -> List[str]:
+    if not isinstance(caminho, str) or not caminho.strip("/"):
+        raise ErroModelo(f"{origem}: caminho inválido em '{chave}': {caminho!r}")
+    return [p for p in caminho.replace("\\", "/").split("/") if p]
+
+
+def _pasta_da_base(arvore: Dict[str, Any], partes: List[str], origem: str, chave: str) -> Tuple[Dict[str, Any], str]:
+    """(nível que contém a pasta, nome dela); ErroModelo se ela não existir na base."""
+    nivel = arvore
+    for i, nome in enumerate(partes):
+        if nome not in nivel:
+            raise ErroModelo(f"{origem}: '{chave}': '{'/'.join(partes[:i + 1])}' não existe na base")
+        if i < len(partes) - 1:
+            nivel = nivel[nome]
+    return nivel, partes[-1]
+
+
+def _mesclar(destino: Dict[str, Any], acrescimo: Dict[str, Any]) -> None:
+    """Acrescenta 'acrescimo' em 'destino': pastas novas vão para o fim, as existentes recebem os filhos."""
+    pilha = [(destino, acrescimo)]
+    while pilha:
+        nivel, extra = pilha.pop()
+        for nome, sub in extra.items():
+            if nome in nivel:
+                pilha.append((nivel[nome], sub))
+            else:
+                nivel[nome] = sub
+
+
+def aplicar_sobreposicao(base: Dict[str, Any], sobreposicao: Mapping[str, Any], origem: str = "modelo") -> Dict[str, Any]:
+    """
+    Aplica a 'base' (dicts aninhados, alterada no lugar) remover, substituir e adicionar.
+
+    • remover: lista de caminhos ("02. Empresa/09. CAF_Digital_BA");
+    • substituir: {caminho: nova subárvore} — os filhos da pasta são trocados;
+    • adicionar: árvore mesclada na base (pastas que já existem recebem os filhos).
+    Caminhos que não existem na base são erro (em geral, a base mudou).
+    """
+    desconhecidas = set(sobreposicao) - set(_CHAVES_SOBREPOSICAO)
+    if desconhecidas:
+        raise ErroModelo(f"{origem}: chave(s) desconhecida(s): {', '.join(sorted(desconhecidas))}")
+    remover = sobreposicao.get("remover", [])
+    substituir = sobreposicao.get("substituir", {})
+    adicionar = sobreposicao.get("adicionar", {})
+    if not isinstance(remover, list):
+        raise ErroModelo(f"{origem}: 'remover' deve ser uma lista de caminhos")
+    if not isinstance(substituir, dict):
+        raise ErroModelo(f"{origem}: 'substituir' deve ser um objeto {{caminho: subárvore}}")
+
+    for caminho in remover:
+        nivel, nome = _pasta_da_base(base, _partes(caminho, origem, "remover"), origem, "remover")
+        del nivel[nome]
+    for caminho, sub in substituir.items():
+        nivel, nome = _pasta_da_base(base, _partes(caminho, origem, "substituir"), origem, "substituir")
+        if sub:
+            validar_modelo(sub, f"{origem} (substituir '{caminho}')")
+        elif not isinstance(sub, (dict, list)):
+            raise ErroModelo(f"{origem}: 'substituir' de '{caminho}' deve ser um objeto ou lista")
+        nivel[nome] = _como_dicts(sub)
+    if adicionar:
+        validar_modelo(adicionar, f"{origem} (adicionar)")
+        _mesclar(base, _como_dicts(adicionar))
+    elif not isinstance(adicionar, (dict, list)):
+        raise ErroModelo(f"{origem}: 'adicionar' deve ser um objeto ou lista")
+    return base
+
+
+def estender(
+    base: Union[Mapping[str, Any], PlanoCriacao],
+    sobreposicao: Mapping[str, Any],
+    origem: str = "modelo",
+) -> PlanoCriacao:
+    """
+    Plano de 'base' com a sobreposição (remover/substituir/adicionar) aplicada.
+
+    Memorizado pela combinação dos hashes da base e da sobreposição.
+    Lança ErroModelo se a sobreposição for inválida ou o resultado também.
+    """
+    plano_base = compilar_plano(base)
+    try:
+        hash_sobreposicao = hash_modelo(dict(sobreposicao))
+    except (TypeError, ValueError) as e:
+        raise ErroModelo(f"{origem}: sobreposição inválida -> {e}") from e
+    chave = hashlib.sha256(f"{plano_base.hash}\0{hash_sobreposicao}".encode("ascii")).hexdigest()
+    with _TRAVA:
+        plano = _RESOLVIDOS.get(chave)
+    if plano is None:
+        arvore = aplicar_sobreposicao(arvore_do_plano(plano_base), sobreposicao, origem)
+        validar_modelo(arvore, origem)
+        plano = compilar_plano(arvore)
+        with _TRAVA:
+            _RESOLVIDOS[chave] = plano
+    return plano
+
+
+# ------------------------------------------------------------
+# CACHE DO PLANO COMPILADO
+# ------------------------------------------------------------
+# Um arquivo .pickle por modelo (nome = hash do caminho), com o plano na
+# forma compacta e o que identifica a versão do arquivo de origem:
+# mtime_ns + tamanho (confere sem ler o arquivo) e SHA-256 do conteúdo
+# (arquivo só "tocado", ou copiado com outra data: o cache continua valendo).
+# arquivo -> (mtime_ns, tamanho, lido_em, modelo, hash da base)
+_MEMORIA: Dict[str, Tuple[int, int, float, ModeloCarregado, Optional[str]]] = {}
+
+
+def _arquivo_cache(arquivo: Path) -> Path:
+    chave = hashlib.sha256(os.path.normcase(str(arquivo)).encode("utf-8")).hexdigest()[:32]
+    return diretorio_dados() / PASTA_CACHE / f"{chave}.pickle"
+
+
+def _ler_cache(destino: Path, arquivo: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(destino, "rb") as f:
+            dados = pickle.load(f)
+    except Exception:  # Cache ausente, truncado ou de outra versão: recompila
+        return None
+    if not isinstance(dados, dict) or dados.get("versao_cache") != VERSAO_CACHE or dados.get("arquivo") != str(arquivo):
+        return None
+    return dados
+
+
+def _gravar_cache(destino: Path, dados: Dict[str, Any]) -> None:
+    """Grava de forma atômica (temporário + os.replace); falhar só custa recompilar depois."""
+    temporario = destino.with_name(f"{destino.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        with open(temporario, "wb") as f:
+            pickle.dump(dados, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, destino)
+    except OSError:
+        try:
+            os.unlink(temporario)
+        except OSError:
+            pass
+
+
+def _eh_arquivo(referencia: Union[str, Path]) -> bool:
+    """True se a referência é um caminho de arquivo (e não o nome de um tipo)."""
+    texto = str(referencia)
+    return (
+        isinstance(referencia, Path)
+        or os.path.splitext(texto)[1].lower() in EXTENSOES
+        or os.sep in texto
+        or "/" in texto
+    )
+
+
+def _embutido() -> ModeloCarregado:
+    return ModeloCarregado(TIPO_PADRAO, compilar_plano(ESTRUTURA_PADRAO), origem="embutido")
+
+
+def _carregar_base(referencia: str, arquivo: Path, usar_cache: bool, cadeia: Tuple[Path, ...]) -> ModeloCarregado:
+    """
+    Modelo herdado por 'arquivo' (caminhos relativos partem da pasta dele).
+
+    Se a base é o tipo do próprio arquivo, vale a definição seguinte desse
+    tipo na ordem de prioridade (ver _proxima_fonte), e não ele mesmo.
+    """
+    if _eh_arquivo(referencia):
+        return _carregar(arquivo.parent / referencia, usar_cache, cadeia)
+    if referencia == arquivo.stem:
+        proxima = _proxima_fonte(referencia, arquivo)
+        return _embutido() if proxima is None else _carregar_arquivo(referencia, proxima, usar_cache, cadeia)
+    return _carregar(referencia, usar_cache, cadeia)
+
+
+def _carregar_arquivo(
+    tipo: str, arquivo: Path, usar_cache: bool, cadeia: Tuple[Path, ...] = ()
+) -> ModeloCarregado:
+    if arquivo in cadeia:
+        ciclo = " -> ".join(p.name for p in cadeia + (arquivo,))
+        raise ErroModelo(f"Herança circular entre modelos: {ciclo}")
+    cadeia = cadeia + (arquivo,)
+    try:
+        estado = arquivo.stat()
+    except OSError as e:
+        raise ErroModelo(f"Não foi possível ler o modelo '{arquivo}': {e}") from e
+
+    def base_confere(referencia: Optional[str], hash_base: Optional[str]) -> bool:
+        # Modelo herdado: o resultado só vale se a base continua a mesma
+        return referencia is None or _carregar_base(referencia, arquivo, usar_cache, cadeia).plano.hash == hash_base
+
+    chave = str(arquivo)
+    if usar_cache:
+        with _TRAVA:
+            em_memoria = _MEMORIA.get(chave)
+        if (
+            em_memoria is not None
+            and em_memoria[:2] == (estado.st_mtime_ns, estado.st_size)
+            and estado.st_mtime < em_memoria[2] - FOLGA_MTIME_S
+        ):
+            modelo, hash_base = em_memoria[3], em_memoria[4]
+            if base_confere(modelo.base, hash_base):
+                return ModeloCarregado(tipo, modelo.plano, arquivo, modelo.descricao, "memoria", modelo.base)
+
+    destino = _arquivo_cache(arquivo)
+    cache = _ler_cache(destino, arquivo) if usar_cache else None
+    if cache is not None and not base_confere(cache["base"], cache["hash_base"]):
+        cache = None
+    origem = "cache"
+    if (
+        cache is not None
+        and cache["mtime_ns"] == estado.st_mtime_ns
+        and cache["tamanho"] == estado.st_size
+        and estado.st_mtime < cache["gravado_em"] - FOLGA_MTIME_S
+    ):
+        plano = plano_compacto(cache["plano"])
+    else:
+        try:
+            conteudo = arquivo.read_bytes()
+        except OSError as e:
+            raise ErroModelo(f"Não foi possível ler o modelo '{arquivo}': {e}") from e
+        sha = hashlib.sha256(conteudo).hexdigest()
+        if cache is not None and cache["sha256"] == sha:
+            plano = plano_compacto(cache["plano"])
+        else:
+            origem = "arquivo"
+            documento = _documento(_interpretar(conteudo, arquivo), arquivo)
+            hash_base = None
+            if documento.base is None:
+                validar_modelo(documento.arvore, str(arquivo))
+                plano = compilar_plano(documento.arvore)
+            else:
+                base = _carregar_base(documento.base, arquivo, usar_cache, cadeia)
+                plano = estender(base.plano, documento.sobreposicao or {}, str(arquivo))
+                hash_base = base.plano.hash
+            cache = {
+                "plano": compactar_plano(plano), "descricao": documento.descricao,
+                "base": documento.base, "hash_base": hash_base,
+            }
+        cache.update(
+            versao_cache=VERSAO_CACHE, arquivo=str(arquivo), sha256=sha,
+            mtime_ns=estado.st_mtime_ns, tamanho=estado.st_size, gravado_em=time.time(),
+        )
+        if usar_cache:
+            _gravar_cache(destino, cache)
+
+    modelo = ModeloCarregado(tipo, plano, arquivo, cache["descricao"], origem, cache["base"])
+    with _TRAVA:
+        _MEMORIA[chave] = (estado.st_mtime_ns, estado.st_size, time.time(), modelo, cache["hash_base"])
+    return modelo
+
+
+def _carregar(origem: Union[str, Path], usar_cache: bool, cadeia: Tuple[Path, ...]) -> ModeloCarregado:
+    if _eh_arquivo(origem):
+        arquivo = Path(origem).resolve()
+        return _carregar_arquivo(arquivo.stem, arquivo, usar_cache, cadeia)
+
+    texto = str(origem)
+    tipos = listar_tipos()
+    if texto not in tipos:
+        disponiveis = ", ".join(tipos)
+        raise ErroModelo(f"Tipo de cliente desconhecido: '{texto}' (disponíveis: {disponiveis})")
+    arquivo = tipos[texto]
+    if arquivo is None:
+        return _embutido()
+    return _carregar_arquivo(texto, arquivo.resolve(), usar_cache, cadeia)
+
+
+def carregar_modelo(origem: Union[str, Path] = TIPO_PADRAO, *, usar_cache: bool = True) -> ModeloCarregado:
+    """
+    Carrega um modelo pelo tipo de cliente ("bahia") ou pelo caminho do arquivo.
+
+    • Tipo: procurado em pastas_modelos(); "padrao" sem arquivo = ESTRUTURA_PADRAO.
+    • Modelo com "base": a base é carregada (do cache, se possível) e o
+      resultado só é reaproveitado enquanto o hash dela não mudar. Base com
+      o tipo do próprio arquivo = a definição seguinte desse tipo
+      ("padrao.json" com "base": "padrao" estende o ESTRUTURA_PADRAO).
+    • usar_cache=False: sempre interpreta e valida os arquivos (e não grava cache).
+    Lança ErroModelo se o tipo não existir, o arquivo for inválido ou a
+    herança formar um ciclo.
+    """
+    return _carregar(origem, usar_cache, ())
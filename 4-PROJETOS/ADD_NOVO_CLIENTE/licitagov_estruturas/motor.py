@@ -0,0 +1,753 @@
+# -*- coding: utf-8 -*-
+
+"""
+Motor de criação: aplica um plano compilado em uma pasta de cliente.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor  # Criação paralela (compartilhamentos de rede)
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+from .concorrencia import CONCORRENCIA_MAXIMA, ControleConcorrencia, SistemaResiliente
+from .instrumentacao import Instrumentacao
+from .modelo import ESTRUTURA_PADRAO, TIPO_PADRAO, VERSAO_ESTRUTURA
+from .plano import PlanoCriacao, compilar_plano
+from .sistema_arquivos import SISTEMA_LOCAL, SistemaArquivos
+
+
+# ------------------------------------------------------------
+# FUNÇÕES DE LÓGICA (independentes da interface)
+# ------------------------------------------------------------
+@dataclass
+class ResultadoCriacao:
+    """Resumo de uma execução de criar_arvore."""
+
+    base: Path
+    criadas: List[Path] = field(default_factory=list)           # Pastas criadas agora
+    existentes: List[Path] = field(default_factory=list)        # Pastas que já existiam
+    erros: List[Tuple[Path, str]] = field(default_factory=list)  # (pasta, mensagem)
+    listagens: int = 0                                          # os.scandir feitos (modo incremental)
+    pulado: bool = False                                        # Marcador confere: nada foi verificado
+    cancelado: bool = False                                     # Interrompida por TokenCancelamento
+    montada: bool = False                                       # Montada à parte e movida com um rename
+    concorrencia: Optional[Dict[str, Any]] = None               # Modo adaptativo (ControleConcorrencia.como_dict)
+
+    @property
+    def ok(self) -> bool:
+        """True se nenhuma pasta falhou."""
+        return not self.erros
+
+    def como_dict(self) -> Dict[str, Any]:
+        """
+        Resumo serializável em JSON (usado pela linha de comando).
+
+        Se a execução foi cancelada, inclui também a lista exata das pastas
+        criadas ("pastas_criadas").
+        """
+        dados: Dict[str, Any] = {
+            "base": str(self.base),
+            "ok": self.ok,
+            "pulado": self.pulado,
+            "cancelado": self.cancelado,
+            "montada": self.montada,
+            "criadas": len(self.criadas),
+            "existentes": len(self.existentes),
+            "listagens": self.listagens,
+            "erros": [{"pasta": str(p), "mensagem": m} for p, m in self.erros],
+        }
+        if self.concorrencia is not None:
+            dados["concorrencia"] = self.concorrencia
+        if self.cancelado:
+            dados["pastas_criadas"] = [str(p) for p in self.criadas]
+        return dados
+
+
+# ------------------------------------------------------------
+# MARCADOR DE ESTRUTURA (verificação O(1) de cliente já provisionado)
+# ------------------------------------------------------------
+# Após uma execução sem erros gravamos um pequeno JSON oculto na pasta do
+# cliente com o hash do modelo aplicado. Na próxima vez basta ler esse
+# arquivo: se o hash bate, a árvore inteira é pulada. O tipo do modelo
+# ("modelo") diz às migrações se o cliente é do ESTRUTURA_PADRAO.
+MARCADOR = ".licitagov_estrutura.json"
+
+
+def ler_marcador(base: Path, sistema: SistemaArquivos = SISTEMA_LOCAL) -> Optional[Dict[str, Any]]:
+    """Lê o marcador da pasta do cliente (None se não existir ou estiver inválido)."""
+    try:
+        dados = json.loads(sistema.ler_texto(Path(base) / MARCADOR))
+    except (OSError, ValueError):
+        return None
+    return dados if isinstance(dados, dict) else None
+
+
+@lru_cache(maxsize=None)
+def _hash_padrao() -> str:
+    """Hash do ESTRUTURA_PADRAO (calculado na primeira gravação de marcador)."""
+    return compilar_plano(ESTRUTURA_PADRAO).hash
+
+
+def gravar_marcador(
+    base: Path,
+    plano: PlanoCriacao,
+    sistema: SistemaArquivos = SISTEMA_LOCAL,
+    tipo_modelo: Optional[str] = None,
+) -> None:
+    """
+    Grava (ou atualiza) o marcador oculto com hash, tipo e versão do modelo e data/hora.
+
+    • tipo_modelo: tipo de cliente do modelo (ver modelos_externos). Sem ele,
+      um plano igual ao ESTRUTURA_PADRAO é "padrao" e os demais ficam sem
+      tipo (null: modelo avulso).
+    • Um marcador de versão anterior do mesmo tipo mantém a versão:
+      criar_arvore só acrescenta pastas, e os renomear/mover pendentes
+      ainda são aplicados pela migração (migracoes.py), que é quem avança
+      a versão. Marcadores sem "modelo" são de antes dos modelos externos
+      e contam como "padrao".
+    """
+    if tipo_modelo is None and plano.hash == _hash_padrao():
+        tipo_modelo = TIPO_PADRAO
+    versao = VERSAO_ESTRUTURA
+    anterior = ler_marcador(base, sistema)
+    if (
+        anterior is not None
+        and anterior.get("modelo", TIPO_PADRAO) == tipo_modelo
+        and isinstance(anterior.get("versao"), int)
+    ):
+        versao = min(versao, anterior["versao"])
+    dados = {
+        "hash": plano.hash,
+        "modelo": tipo_modelo,
+        "versao": versao,
+        "gravado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    sistema.escrever_texto(
+        Path(base) / MARCADOR, json.dumps(dados, ensure_ascii=False, indent=2), oculto=True
+    )
+
+
+def _subpastas(sistema: SistemaArquivos, caminho: Path) -> Optional[Set[str]]:
+    """
+    Lista (com um único scandir) os nomes das subpastas de 'caminho'.
+
+    Os nomes vêm normalizados com os.path.normcase (no Windows a comparação
+    não diferencia maiúsculas). Retorna None se não for possível listar.
+    """
+    try:
+        return {os.path.normcase(e.nome) for e in sistema.scandir(caminho) if e.pasta}
+    except OSError:
+        return None
+
+
+def _diferenca(sistema: SistemaArquivos, base: Path, plano: PlanoCriacao) -> Tuple[List[bool], int]:
+    """
+    Compara a árvore existente em 'base' com o plano.
+
+    Retorna (faltando, listagens): faltando[i] indica se o nó i precisa ser
+    criado; listagens é o número de os.scandir executados. Só listamos pastas
+    que existem E têm filhos no modelo; tudo abaixo de uma pasta ausente
+    também está ausente e dispensa consulta ao disco.
+    """
+    com_filhos = {no.pai for no in plano.nos}
+    conteudo: Dict[int, Optional[Set[str]]] = {-1: _subpastas(sistema, base)}
+    listagens = 1
+    faltando: List[bool] = []
+
+    for i, no in enumerate(plano.nos):
+        irmaos = conteudo.get(no.pai)
+        existe = irmaos is not None and os.path.normcase(no.nome) in irmaos
+        faltando.append(not existe)
+
+        if existe and i in com_filhos:
+            conteudo[i] = _subpastas(sistema, base / no.relativo)
+            listagens += 1
+
+    return faltando, listagens
+
+
+# ------------------------------------------------------------
+# CANCELAMENTO COOPERATIVO
+# ------------------------------------------------------------
+class TokenCancelamento:
+    """
+    Pedido de cancelamento compartilhado entre a interface e o motor.
+
+    O motor consulta o token entre uma pasta e outra (e o lote, entre um
+    cliente e outro); nada é interrompido no meio de um mkdir.
+    """
+
+    def __init__(self) -> None:
+        self._evento = threading.Event()
+
+    def cancelar(self) -> None:
+        """Pede o cancelamento (pode ser chamado de qualquer thread)."""
+        self._evento.set()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._evento.is_set()
+
+
+# ------------------------------------------------------------
+# PROGRESSO (contador compartilhado entre threads)
+# ------------------------------------------------------------
+class Progresso:
+    """
+    Contador de nós processados, seguro para várias threads.
+
+    O motor chama avancar() a cada pasta; quem mostra o progresso (janela,
+    linha de comando) chama medir() em intervalo fixo para obter a vazão
+    recente e a estimativa de término — sem custo por pasta na interface.
+    """
+
+    JANELA_S = 5.0  # Vazão = pastas nos últimos JANELA_S segundos
+
+    def __init__(self, total: int = 0) -> None:
+        self.total = total
+        self.inicio = time.monotonic()
+        self._feitos = 0
+        self._trava = threading.Lock()
+        self._amostras: "deque[Tuple[float, int]]" = deque([(self.inicio, 0)])
+
+    def avancar(self, n: int = 1) -> None:
+        """Soma 'n' nós processados."""
+        with self._trava:
+            self._feitos += n
+
+    @property
+    def feitos(self) -> int:
+        return min(self._feitos, self.total) if self.total else self._feitos
+
+    def medir(self) -> Tuple[int, float, Optional[float]]:
+        """
+        Devolve (feitos, pastas/s recentes, segundos restantes ou None).
+
+        A vazão considera só os últimos JANELA_S segundos: se o compartilhamento
+        travar, ela cai a zero (e o ETA some) em vez de ficar na média antiga.
+        """
+        agora = time.monotonic()
+        feitos = self.feitos
+        self._amostras.append((agora, feitos))
+        while len(self._amostras) > 2 and agora - self._amostras[1][0] >= self.JANELA_S:
+            self._amostras.popleft()
+
+        t0, f0 = self._amostras[0]
+        taxa = (feitos - f0) / (agora - t0) if agora > t0 else 0.0
+        restante = (self.total - feitos) / taxa if taxa > 0 and self.total else None
+        return feitos, taxa, restante
+
+
+# Situação de cada nó após a execução (ver _criar_pasta)
+_CRIADA = "criada"        # mkdir executado agora
+_EXISTENTE = "existente"  # mkdir encontrou a pasta já criada
+_LISTADA = "listada"      # modo incremental: a listagem mostrou que já existia
+_ERRO = "erro"
+
+
+def _criar_pasta(
+    sistema: SistemaArquivos, destino: Path, pai_aberto: Any = None, nome: str = ""
+) -> Tuple[str, str]:
+    """
+    Cria uma pasta (e qualquer pai ausente) e devolve (situação, mensagem).
+
+    Com 'pai_aberto' (de sistema.abrir_pasta), cria 'nome' relativo a ele;
+    se o pai não servir (FileNotFoundError), cai no caminho completo.
+
+    Nunca lança exceção: o erro vira uma situação _ERRO com a mensagem, para
+    que a execução (serial ou paralela) continue com os demais nós.
+    """
+    try:
+        if pai_aberto is None:
+            sistema.criar_pasta(destino, parents=True)
+        else:
+            try:
+                sistema.mkdir_em(pai_aberto, nome, destino)
+            except FileNotFoundError:
+                sistema.criar_pasta(destino, parents=True)
+        return _CRIADA, ""
+    except FileExistsError as e:
+        # Mesmo comportamento de exist_ok=True: só é erro se não for pasta
+        if sistema.is_dir(destino):
+            return _EXISTENTE, ""
+        return _ERRO, str(e)
+    except Exception as e:
+        return _ERRO, str(e)
+
+
+_NAO_ABERTA = object()
+
+
+class _PastasAbertas:
+    """
+    Pastas-pai abertas (sistema.abrir_pasta) para criar as filhas com
+    mkdir_em, sem o SO resolver o caminho inteiro a cada pasta.
+
+    Cada pai é aberto uma vez, na primeira filha pendente — relativo ao
+    avô, se o próprio pai acabou de ser criado — e fechado assim que não
+    for mais necessário: em pré-ordem ficam abertas no máximo as pastas do
+    ramo atual. Se um pai não puder ser aberto, suas filhas usam o caminho
+    completo (como sem esta opção).
+    """
+
+    def __init__(self, sistema: SistemaArquivos, base: Path, destinos: List[Path], plano: PlanoCriacao,
+                 pendentes: Iterable[int]) -> None:
+        self.sistema = sistema
+        self.base = base
+        self.destinos = destinos
+        self.plano = plano
+        pendentes = set(pendentes)
+        # Usos restantes de cada pai: um por filha a criar e um por filha
+        # que será aberta relativa a ele (filha pendente que também é pai).
+        self._restantes = Counter(plano.nos[i].pai for i in pendentes)
+        self._relativas = {p for p in self._restantes if p in pendentes}
+        for p in self._relativas:
+            self._restantes[plano.nos[p].pai] += 1
+        self._abertas: Dict[int, Any] = {}
+        self._trava = threading.Lock()
+
+    def _obter(self, pai: int) -> Any:
+        with self._trava:
+            pasta = self._abertas.get(pai, _NAO_ABERTA)
+        if pasta is not _NAO_ABERTA:
+            return pasta
+        avo = self.plano.nos[pai].pai if pai in self._relativas else None
+        try:
+            if avo is None:
+                nova = self.sistema.abrir_pasta(self.base if pai < 0 else self.destinos[pai])
+            else:
+                with self._trava:
+                    pasta_avo = self._abertas.get(avo)
+                nova = self.sistema.abrir_pasta(self.destinos[pai], pasta_avo, self.plano.nos[pai].nome)
+        except OSError:
+            nova = None
+        with self._trava:
+            pasta = self._abertas.setdefault(pai, nova)
+        if pasta is not nova:
+            self._fechar(nova)  # Outra thread abriu primeiro
+        elif avo is not None:
+            self._liberar(avo)
+        return pasta
+
+    def _liberar(self, pai: int) -> None:
+        with self._trava:
+            self._restantes[pai] -= 1
+            if self._restantes[pai] > 0:
+                return
+            pasta = self._abertas.pop(pai, None)
+        self._fechar(pasta)
+
+    def _fechar(self, pasta: Any) -> None:
+        if pasta is not None:
+            try:
+                self.sistema.fechar_pasta(pasta)
+            except OSError:
+                pass
+
+    def criar(self, i: int) -> Tuple[str, str]:
+        no = self.plano.nos[i]
+        try:
+            return _criar_pasta(self.sistema, self.destinos[i], self._obter(no.pai), no.nome)
+        finally:
+            self._liberar(no.pai)
+
+    def fechar_todas(self) -> None:
+        """Fecha o que ficou aberto (ex.: filhas não processadas após cancelamento)."""
+        with self._trava:
+            abertas, self._abertas = list(self._abertas.values()), {}
+        for pasta in abertas:
+            self._fechar(pasta)
+
+
+# ------------------------------------------------------------
+# MONTAGEM À PARTE (cliente novo aparece de uma vez)
+# ------------------------------------------------------------
+def _vazia_ou_ausente(sistema: SistemaArquivos, base: Path) -> bool:
+    """True se 'base' não existe ou é uma pasta vazia (a montagem pode ocupar o lugar)."""
+    try:
+        return not sistema.scandir(base)
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+
+
+def _pasta_montagem(sistema: SistemaArquivos, base: Path) -> Path:
+    """
+    Onde montar a árvore de 'base'.
+
+    Um rename só funciona dentro do mesmo volume: usamos a pasta temporária
+    local se ela estiver no mesmo volume que 'base'; senão (compartilhamento
+    de rede, outro disco), uma pasta oculta ao lado de 'base'.
+    """
+    sufixo = secrets.token_hex(4)
+    try:
+        temporaria = Path(tempfile.gettempdir())
+        if sistema.stat(temporaria).st_dev == sistema.stat(base.parent).st_dev:
+            return temporaria / f"licitagov_{base.name}_{sufixo}"
+    except OSError:
+        pass
+    return base.parent / f".{base.name}.montagem_{sufixo}"
+
+
+def _mover(sistema: SistemaArquivos, origem: Path, destino: Path) -> None:
+    """Põe 'origem' no lugar de 'destino' (ausente ou pasta vazia) com um rename."""
+    try:
+        sistema.rename(origem, destino)
+    except OSError:
+        # O Windows não substitui nem uma pasta vazia: remove e tenta de novo
+        if not (sistema.is_dir(destino) and _vazia_ou_ausente(sistema, destino)):
+            raise
+        sistema.rmdir(destino)
+        try:
+            sistema.rename(origem, destino)
+        except OSError:
+            sistema.mkdir(destino)  # Devolve a pasta vazia que estava ali
+            raise
+
+
+def _descartar(sistema: SistemaArquivos, pasta: Path) -> None:
+    """Apaga a pasta de montagem (só pastas: nada além do que o motor criou)."""
+    pilha: List[Tuple[Path, bool]] = [(pasta, False)]
+    while pilha:
+        atual, filhas_removidas = pilha.pop()
+        if filhas_removidas:
+            sistema.rmdir(atual)
+            continue
+        pilha.append((atual, True))
+        pilha.extend((atual / e.nome, False) for e in sistema.scandir(atual) if e.pasta)
+
+
+def _criar_montando(
+    base: Path,
+    plano: PlanoCriacao,
+    log: Callable[[str], None],
+    nivel: int,
+    *,
+    marcador: bool,
+    tipo_modelo: Optional[str],
+    progresso: Optional[Progresso],
+    sistema: SistemaArquivos,
+    instrumentacao: Optional[Instrumentacao],
+    **opcoes: Any,
+) -> ResultadoCriacao:
+    """
+    criar_arvore(montagem=True) com 'base' ausente ou vazia.
+
+    A árvore inteira é criada em uma pasta de montagem no mesmo volume e só
+    então movida para 'base' com um único rename. Se algo falhar (ou for
+    cancelado), a montagem é apagada e 'base' fica como estava. O log das
+    pastas sai de uma vez, depois do rename, já com os caminhos finais.
+    """
+    recuo = "  " * nivel
+    resultado = ResultadoCriacao(base, montada=True)
+    medido = sistema if instrumentacao is None else instrumentacao.sistema(sistema)
+    try:
+        montagem = _pasta_montagem(medido, base)
+        try:
+            medido.mkdir(montagem)
+        except FileNotFoundError:
+            medido.criar_pasta(base.parent, parents=True)
+            medido.mkdir(montagem)
+    except OSError as e:
+        resultado.erros.append((base, str(e)))
+        log(f"{recuo}[ERRO] {base} -> {e}")
+        if progresso is not None:
+            progresso.avancar(len(plano))
+        return resultado
+
+    def no_lugar(texto: str) -> str:
+        return texto.replace(str(montagem), str(base))
+
+    linhas: List[str] = []
+    parcial = criar_arvore(
+        montagem, plano, linhas.append, nivel,
+        progresso=progresso, sistema=sistema, instrumentacao=instrumentacao, **opcoes,
+    )
+    resultado.listagens = parcial.listagens
+    resultado.concorrencia = parcial.concorrencia
+
+    if not parcial.cancelado and parcial.ok:
+        try:
+            with _fase(instrumentacao, "renomear"):
+                _mover(medido, montagem, base)
+        except OSError as e:
+            resultado.erros.append((base, no_lugar(str(e))))
+            log(f"{recuo}[ERRO] Não foi possível pôr a estrutura no lugar: {base} -> {no_lugar(str(e))}")
+        else:
+            resultado.criadas = [base / p.relative_to(montagem) for p in parcial.criadas]
+            resultado.existentes = [base / p.relative_to(montagem) for p in parcial.existentes]
+            for linha in linhas:
+                log(no_lugar(linha))
+            if marcador:
+                try:
+                    with _fase(instrumentacao, "marcador"):
+                        gravar_marcador(base, plano, medido, tipo_modelo)
+                except OSError as e:
+                    log(f"{recuo}[AVISO] Não foi possível gravar o marcador em {base} -> {e}")
+            return resultado
+
+    # Falhou ou foi cancelada: nada chega a 'base'
+    resultado.cancelado = parcial.cancelado
+    erros = [(base / p.relative_to(montagem), no_lugar(m)) for p, m in parcial.erros]
+    resultado.erros.extend(erros)
+    for pasta, mensagem in erros:
+        log(f"{recuo}[ERRO] {pasta} -> {mensagem}")
+    try:
+        _descartar(medido, montagem)
+    except OSError as e:
+        log(f"{recuo}[AVISO] Não foi possível apagar a pasta de montagem {montagem} -> {e}")
+    motivo = "Cancelado" if resultado.cancelado else "Com erros"
+    log(f"{recuo}{motivo}: montagem descartada, nada foi criado em {base}")
+    return resultado
+
+
+def _fase(instrumentacao: Optional[Instrumentacao], nome: str) -> ContextManager[Any]:
+    """Mede a etapa 'nome' se houver instrumentação (senão, não faz nada)."""
+    return nullcontext() if instrumentacao is None else instrumentacao.fase(nome)
+
+
+def criar_arvore(
+    base: Path,
+    modelo: Union[Mapping[str, Union[dict, list]], Iterable[str], PlanoCriacao],
+    log: Callable[[str], None] = lambda _msg: None,
+    nivel: int = 0,
+    *,
+    incremental: bool = False,
+    trabalhadores: int = 1,
+    marcador: bool = False,
+    tipo_modelo: Optional[str] = None,
+    verificar: bool = False,
+    progresso: Optional[Progresso] = None,
+    cancelamento: Optional[TokenCancelamento] = None,
+    sistema: SistemaArquivos = SISTEMA_LOCAL,
+    instrumentacao: Optional[Instrumentacao] = None,
+    por_descritor: bool = False,
+    montagem: bool = False,
+    adaptativo: bool = False,
+) -> ResultadoCriacao:
+    """
+    Cria os diretórios descritos por um 'modelo' dentro de 'base'.
+
+    Parâmetros:
+    • base: pasta raiz onde a estrutura será criada.
+    • modelo: dict (pastas -> filhos), lista (pastas folhas) ou PlanoCriacao.
+    • log: função de logging (para imprimir na UI).
+    • nivel: recuo inicial do log (apenas para formatação).
+    • incremental: lista a árvore existente (um os.scandir por pasta) e só
+      chama mkdir para as pastas que faltam. Ideal para reexecutar em um
+      cliente já estruturado, principalmente em compartilhamentos de rede.
+    • trabalhadores: quantas pastas criar ao mesmo tempo. Com mais de 1, a
+      árvore é criada nível a nível e todas as pastas de um mesmo nível são
+      enviadas em paralelo a um pool de threads desse tamanho (útil em
+      caminhos \\\\Servidor\\..., onde cada mkdir é uma ida e volta na rede).
+    • marcador: consulta/grava o marcador oculto (MARCADOR) na pasta base. Se
+      o hash gravado for o do modelo atual, nada é feito (resultado.pulado).
+    • tipo_modelo: tipo de cliente do modelo, gravado no marcador (ver
+      gravar_marcador).
+    • verificar: com marcador=True, ignora o marcador e confere pasta a pasta
+      (para quando alguém pode ter apagado pastas manualmente).
+    • progresso: contador (Progresso) avançado a cada nó concluído.
+    • cancelamento: TokenCancelamento consultado entre os nós. Se cancelado,
+      nenhuma pasta nova é iniciada, resultado.cancelado fica True e
+      resultado.criadas lista exatamente o que chegou a ser criado (uma
+      execução incremental posterior continua dali). O marcador não é gravado.
+    • sistema: onde criar (SistemaLocal, SistemaMemoria, SistemaLatente...).
+    • instrumentacao: Instrumentacao que recebe tempo, chamadas de disco e
+      situação de cada pasta, além do tempo das listagens e do log.
+    • por_descritor: abre cada pasta-pai uma vez e cria as filhas relativas a
+      ela (os.mkdir(nome, dir_fd=...)), em vez de o SO resolver o caminho
+      completo a cada mkdir. Onde não há dir_fd (Windows), nada muda.
+    • montagem: se 'base' não existe (ou está vazia), monta a árvore em uma
+      pasta à parte no mesmo volume e a move para 'base' com um único rename
+      — o cliente aparece completo ou não aparece (resultado.montada). Com
+      'base' já preenchida, segue o caminho normal.
+    • adaptativo: para compartilhamentos instáveis. Cria em paralelo com
+      'trabalhadores' como teto (CONCORRENCIA_MAXIMA se for 1), ajustando
+      quantas pastas ficam em andamento pela latência e pelos erros
+      observados, e repete as falhas transitórias (timeout, conexão) com
+      espera exponencial. O limite final e as novas tentativas ficam em
+      resultado.concorrencia.
+
+    Observações:
+    • O modelo é compilado uma única vez (ver compilar_plano) e o plano
+      resultante é apenas percorrido aqui, nó a nó.
+    • Se a pasta já existir, não dá erro (vai para 'existentes').
+    • Mantém a ordem declarada (Python 3.7+ preserva ordem de dict): mesmo
+      no modo paralelo, resultado e log saem na ordem do modelo.
+    """
+    plano = compilar_plano(modelo)
+    base = Path(base)
+    if montagem and _vazia_ou_ausente(sistema, base):
+        return _criar_montando(
+            base, plano, log, nivel,
+            marcador=marcador, tipo_modelo=tipo_modelo, progresso=progresso, sistema=sistema,
+            instrumentacao=instrumentacao,
+            trabalhadores=trabalhadores, cancelamento=cancelamento, por_descritor=por_descritor,
+            adaptativo=adaptativo,
+        )
+    resultado = ResultadoCriacao(base)
+    if instrumentacao is not None:
+        sistema = instrumentacao.sistema(sistema)
+        log = instrumentacao.envolver_log(log)
+    controle: Optional[ControleConcorrencia] = None
+    if adaptativo:
+        controle = ControleConcorrencia(trabalhadores if trabalhadores > 1 else CONCORRENCIA_MAXIMA)
+        trabalhadores = controle.maximo
+        sistema = SistemaResiliente(sistema, controle)
+
+    if marcador and not verificar:
+        with _fase(instrumentacao, "marcador"):
+            dados = ler_marcador(base, sistema)
+        if dados is not None and dados.get("hash") == plano.hash:
+            resultado.pulado = True
+            if progresso is not None:
+                progresso.avancar(len(plano))
+            if controle is not None:
+                resultado.concorrencia = controle.como_dict()
+            log(
+                f"{'  ' * nivel}Estrutura já aplicada em {dados.get('gravado_em', '?')} "
+                f"(versão {dados.get('versao', '?')}) — nada a fazer: {base}"
+            )
+            return resultado
+
+    destinos = [base / no.relativo for no in plano.nos]
+
+    if incremental:
+        with _fase(instrumentacao, "listagem"):
+            faltando, resultado.listagens = _diferenca(sistema, base, plano)
+    else:
+        faltando = [True] * len(plano)
+
+    # situacoes[i] fica None até o nó i ser processado
+    situacoes: List[Optional[Tuple[str, str]]] = [
+        None if falta else (_LISTADA, "") for falta in faltando
+    ]
+    proximo = 0  # Próximo nó (na ordem do modelo) a entrar no log
+
+    def cancelado() -> bool:
+        return cancelamento is not None and cancelamento.cancelado
+
+    abertas: Optional[_PastasAbertas] = None
+    if por_descritor:
+        abertas = _PastasAbertas(sistema, base, destinos, plano, (i for i, f in enumerate(faltando) if f))
+
+    def criar(i: int) -> Tuple[str, str]:
+        if abertas is None:
+            return _criar_pasta(sistema, destinos[i])
+        return abertas.criar(i)
+
+    def processar(i: int) -> Tuple[str, str]:
+        if instrumentacao is None:
+            return criar(i)
+        return instrumentacao.cronometrar(destinos[i], lambda: criar(i))
+
+    def emitir_prontos(ate_o_fim: bool = False) -> None:
+        """
+        Registra, em ordem, todos os nós já processados a partir de 'proximo'.
+
+        Com ate_o_fim=True (após um cancelamento), pula os nós que não
+        chegaram a ser processados em vez de esperar por eles.
+        """
+        nonlocal proximo
+        while proximo < len(situacoes) and (ate_o_fim or situacoes[proximo] is not None):
+            atual = situacoes[proximo]
+            proximo += 1
+            if atual is None:
+                continue
+            situacao, mensagem = atual
+            destino = destinos[proximo - 1]
+            recuo = "  " * (nivel + plano.nos[proximo - 1].nivel)
+            if progresso is not None:
+                progresso.avancar()
+            if instrumentacao is not None:
+                instrumentacao.registrar_no(destino, situacao, mensagem)
+
+            if situacao == _ERRO:
+                # Registra e continua (não aborta a execução inteira)
+                resultado.erros.append((destino, mensagem))
+                log(f"{recuo}[ERRO] {destino} -> {mensagem}")
+            elif situacao == _LISTADA:
+                resultado.existentes.append(destino)
+                log(f"{recuo}Já existe: {destino}")
+            else:
+                if situacao == _CRIADA:
+                    resultado.criadas.append(destino)
+                else:
+                    resultado.existentes.append(destino)
+                log(f"{recuo}Criado: {destino}")
+
+    try:
+        if trabalhadores <= 1:
+            # Serial: um nó por vez, na ordem do modelo (pai antes dos filhos)
+            for i, falta in enumerate(faltando):
+                if falta:
+                    if cancelado():
+                        break
+                    situacoes[i] = processar(i)
+                emitir_prontos()
+        else:
+            # Paralelo: agrupa os nós pendentes por nível; um nível só começa
+            # depois que o anterior (onde estão os pais) terminou.
+            por_nivel: Dict[int, List[int]] = {}
+            for i, falta in enumerate(faltando):
+                if falta:
+                    por_nivel.setdefault(plano.nos[i].nivel, []).append(i)
+
+            def tarefa(i: int) -> Optional[Tuple[str, str]]:
+                # Pastas ainda na fila do pool não são iniciadas após o cancelamento
+                if controle is None:
+                    return None if cancelado() else processar(i)
+                controle.entrar()  # Espera vaga dentro do limite adaptativo
+                try:
+                    return None if cancelado() else processar(i)
+                finally:
+                    controle.sair()
+
+            emitir_prontos()
+            with ThreadPoolExecutor(max_workers=trabalhadores) as pool:
+                for profundidade in sorted(por_nivel):
+                    if cancelado():
+                        break
+                    indices = por_nivel[profundidade]
+                    for i, situacao in zip(indices, pool.map(tarefa, indices)):
+                        situacoes[i] = situacao
+                    emitir_prontos()
+    finally:
+        if abertas is not None:
+            abertas.fechar_todas()
+
+    if cancelado():
+        resultado.cancelado = True
+        if controle is not None:
+            resultado.concorrencia = controle.como_dict()
+        emitir_prontos(ate_o_fim=True)
+        log(
+            f"{'  ' * nivel}Cancelado: {len(resultado.criadas)} pasta(s) criada(s) "
+            f"antes do cancelamento em {base}"
+        )
+        return resultado
+
+    if marcador and resultado.ok:
+        try:
+            with _fase(instrumentacao, "marcador"):
+                gravar_marcador(base, plano, sistema, tipo_modelo)
+        except OSError as e:
+            # Sem marcador a próxima execução apenas confere tudo de novo
+            log(f"{'  ' * nivel}[AVISO] Não foi possível gravar o marcador em {base} -> {e}")
+
+    if controle is not None:
+        resultado.concorrencia = controle.como_dict()
+    return resultado
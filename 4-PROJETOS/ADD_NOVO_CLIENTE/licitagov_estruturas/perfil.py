@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""
+Perfilamento (cProfile) de uma execução inteira, inclusive no .exe.
+
+    with Perfil("create") as perfil:
+        criar_arvore(...)
+    print(perfil.arquivos)   # (…/perfil_create_20250101_120000.pstats, ….txt)
+
+Os arquivos vão para a pasta de logs (ver registro.diretorio_logs): o
+.pstats abre em ferramentas como snakeviz; o .txt traz as funções mais
+caras e pode ser enviado pelo cliente junto com o log.
+"""
+
+from __future__ import annotations
+
+import cProfile                         # Perfilador determinístico da biblioteca padrão
+import io
+import pstats
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from .registro import diretorio_logs
+
+# Funções listadas no resumo em texto (por tempo acumulado e por tempo próprio)
+LINHAS_RESUMO = 30
+
+# A partir do Python 3.12 um único cProfile enxerga todas as threads; antes,
+# cada thread precisa do seu (ver Perfil._nova_thread).
+_PERFIL_GLOBAL = sys.version_info >= (3, 12)
+
+
+class Perfil:
+    """
+    Liga o cProfile do início ao fim do bloco 'with' e grava o resultado.
+
+    As threads criadas durante o bloco (pool do modo paralelo, clientes do
+    lote) também são perfiladas. Se os arquivos não puderem ser gravados, o
+    motivo fica em 'erro' e a execução perfilada não é afetada.
+    """
+
+    def __init__(self, nome: str = "execucao", linhas: int = LINHAS_RESUMO, pasta: Optional[Path] = None) -> None:
+        self.nome = nome
+        self.linhas = linhas
+        self.pasta = pasta
+        self.arquivos: Optional[Tuple[Path, Path]] = None  # (.pstats, .txt)
+        self.erro = ""
+        self._principal = cProfile.Profile()
+        self._das_threads: List[cProfile.Profile] = []
+        self._trava = threading.Lock()
+        self._gancho_anterior: Any = None
+
+    def _nova_thread(self, *_args: Any) -> None:
+        """Gancho de threading.setprofile: cada thread nova ganha um cProfile."""
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()  # Substitui este gancho na thread atual
+        except ValueError:
+            sys.setprofile(None)
+            return
+        with self._trava:
+            self._das_threads.append(perfil)
+
+    def __enter__(self) -> "Perfil":
+        if not _PERFIL_GLOBAL:
+            self._gancho_anterior = getattr(threading, "getprofile", lambda: None)()
+            threading.setprofile(self._nova_thread)
+        self._principal.enable()
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self._principal.disable()
+        if not _PERFIL_GLOBAL:
+            threading.setprofile(self._gancho_anterior)
+        self.gravar()
+
+    def gravar(self) -> None:
+        """Grava .pstats e .txt (chamado automaticamente ao sair do bloco)."""
+        try:
+            pasta = self.pasta or diretorio_logs()
+            prefixo = pasta / f"perfil_{self.nome}_{datetime.now():%Y%m%d_%H%M%S}"
+            estatisticas = pstats.Stats(self._principal, stream=io.StringIO())
+            with self._trava:
+                for perfil in self._das_threads:
+                    estatisticas.add(perfil)
+
+            arquivo_pstats = prefixo.with_suffix(".pstats")
+            estatisticas.dump_stats(str(arquivo_pstats))
+
+            arquivo_txt = prefixo.with_suffix(".txt")
+            with open(arquivo_txt, "w", encoding="utf-8") as f:
+                f.write(f"Perfil '{self.nome}' — {datetime.now().isoformat(timespec='seconds')}\n")
+                f.write(f"Python {sys.version.split()[0]} — threads perfiladas: {1 + len(self._das_threads)}\n\n")
+                estatisticas.stream = f
+                f.write(f"=== {self.linhas} funções com maior tempo acumulado ===\n")
+                estatisticas.sort_stats("cumulative").print_stats(self.linhas)
+                f.write(f"=== {self.linhas} funções com maior tempo próprio ===\n")
+                estatisticas.sort_stats("tottime").print_stats(self.linhas)
+            self.arquivos = (arquivo_pstats, arquivo_txt)
+        except (OSError, TypeError) as e:
+            # TypeError: nenhuma chamada registrada (pstats não tem o que gravar)
+            self.erro = str(e)
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compilação do modelo (dict aninhado) em uma lista plana e ordenada de pastas.
+"""
+
+from __future__ import annotations
+
+import hashlib                          # Hash do modelo (memoização do plano compilado)
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from json.encoder import py_encode_basestring  # Mesmo escape do json.dumps(ensure_ascii=False)
+from pathlib import PurePath
+from typing import Any, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+
+# ------------------------------------------------------------
+# PLANO COMPILADO (o modelo "achatado" em uma lista ordenada)
+# ------------------------------------------------------------
+# Percorrer o dict aninhado a cada execução refaz sempre o mesmo trabalho
+# (recursão, isinstance, montagem de Path). Compilamos o modelo UMA vez em
+# uma lista plana, na ordem de criação (pai sempre antes dos filhos), e
+# guardamos o resultado em cache pelo hash do modelo.
+class NoPlano(NamedTuple):
+    """Uma pasta do plano compilado."""
+
+    nome: str           # Nome da pasta (como declarado no modelo)
+    relativo: PurePath  # Caminho relativo à pasta base do cliente
+    nivel: int          # Profundidade (0 = primeiro nível)
+    pai: int            # Índice do nó pai no plano (-1 = filho direto da base)
+
+
+@dataclass(frozen=True)
+class PlanoCriacao:
+    """
+    Modelo compilado: sequência ordenada de nós (pai antes dos filhos).
+
+    • hash: impressão digital do modelo de origem (chave do cache).
+    • nos: tupla de NoPlano na mesma ordem em que criar_arvore sempre criou.
+    """
+
+    hash: str
+    nos: Tuple[NoPlano, ...]
+
+    def __len__(self) -> int:
+        return len(self.nos)
+
+    def __iter__(self) -> Iterator[NoPlano]:
+        return iter(self.nos)
+
+
+# Cache de planos já compilados: hash do modelo -> plano. Limitado: com
+# modelos externos editados e o modo residente, as versões antigas de um
+# modelo vão saindo (sai o usado há mais tempo).
+LIMITE_PLANOS = 64
+_PLANOS_COMPILADOS: "OrderedDict[str, PlanoCriacao]" = OrderedDict()
+_TRAVA_PLANOS = threading.Lock()
+
+
+# Atalho pelo próprio objeto: compilar de novo o mesmo modelo (o
+# ESTRUTURA_PADRAO, o modelo do lote...) não o serializa outra vez para
+# achar o hash. O objeto fica guardado junto, então seu id não é reusado.
+_POR_OBJETO: "OrderedDict[int, Tuple[Any, PlanoCriacao]]" = OrderedDict()
+
+
+def _plano_em_cache(chave: str) -> Optional[PlanoCriacao]:
+    with _TRAVA_PLANOS:
+        plano = _PLANOS_COMPILADOS.get(chave)
+        if plano is not None:
+            _PLANOS_COMPILADOS.move_to_end(chave)
+        return plano
+
+
+def _guardar_plano(plano: PlanoCriacao) -> PlanoCriacao:
+    """Guarda 'plano' no cache; se outra thread guardou o mesmo hash antes, devolve o dela."""
+    with _TRAVA_PLANOS:
+        plano = _PLANOS_COMPILADOS.setdefault(plano.hash, plano)
+        _PLANOS_COMPILADOS.move_to_end(plano.hash)
+        while len(_PLANOS_COMPILADOS) > LIMITE_PLANOS:
+            _PLANOS_COMPILADOS.popitem(last=False)
+        return plano
+
+
+def _subarvore(sub: Any) -> bool:
+    """Indica se 'sub' descreve filhos (dict/lista não vazios) ou é uma folha."""
+    return isinstance(sub, (Mapping, list, tuple)) and bool(sub)
+
+
+def _itens(modelo: Any) -> Iterable[Tuple[Any, Any]]:
+    """Normaliza um nível do modelo em pares (nome, subárvore)."""
+    if isinstance(modelo, Mapping):
+        return modelo.items()
+    # Lista (ou qualquer iterável): cada item é uma pasta “folha”.
+    return [(nome, {}) for nome in modelo]
+
+
+def _json_modelo(obj: Any) -> Any:
+    """Serializa tipos fora do JSON padrão: Mapping vira dict, o resto é folha."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return None
+
+
+_FIM = object()  # Sentinela: iterador esgotado
+
+
+def _json_escalar(obj: Any) -> str:
+    """Texto JSON de um valor simples, idêntico ao de json.dumps."""
+    if isinstance(obj, str):
+        return py_encode_basestring(obj)
+    if obj is None:
+        return "null"
+    if obj is True:
+        return "true"
+    if obj is False:
+        return "false"
+    if isinstance(obj, int):
+        return int.__repr__(obj)
+    if isinstance(obj, float):
+        return json.dumps(obj)  # Inclui NaN/Infinity como o json
+    return "null"  # Qualquer outro tipo é folha
+
+
+def _json_chave(chave: Any) -> str:
+    """Chave de objeto JSON (json.dumps converte números/bool/None em texto)."""
+    if isinstance(chave, str):
+        return py_encode_basestring(chave)
+    if isinstance(chave, (bool, int, float)) or chave is None:
+        return py_encode_basestring(_json_escalar(chave))
+    raise TypeError(f"chaves do modelo devem ser str, int, float, bool ou None, não {type(chave).__name__}")
+
+
+def _json_em_partes(modelo: Any) -> Iterator[str]:
+    """
+    Produz, em pedaços, o mesmo texto de
+    json.dumps(modelo, ensure_ascii=False, default=_json_modelo).
+
+    Usa uma pilha explícita em vez de recursão: modelos com centenas de
+    níveis não esbarram no limite de recursão do Python.
+    """
+    # Pilha de [iterador, fechamento, id do contêiner, primeiro item?, é dict?]
+    pilha: List[List[Any]] = []
+    abertos: Set[int] = set()  # Contêineres em andamento (referência circular)
+
+    def abrir(obj: Any) -> str:
+        if isinstance(obj, Mapping) and not isinstance(obj, dict):
+            obj = dict(obj)
+        if isinstance(obj, dict):
+            if not obj:
+                return "{}"
+            iterador, abre, fecha = iter(obj.items()), "{", "}"
+        elif isinstance(obj, (list, tuple)):
+            if not obj:
+                return "[]"
+            iterador, abre, fecha = iter(obj), "[", "]"
+        else:
+            return _json_escalar(obj)
+        if id(obj) in abertos:
+            raise ValueError("Circular reference detected")
+        abertos.add(id(obj))
+        pilha.append([iterador, fecha, id(obj), True, isinstance(obj, dict)])
+        return abre
+
+    yield abrir(modelo)
+    while pilha:
+        topo = pilha[-1]
+        iterador, fecha, ident, primeiro, eh_dict = topo
+        item = next(iterador, _FIM)
+        if item is _FIM:
+            pilha.pop()
+            abertos.discard(ident)
+            yield fecha
+            continue
+        separador = "" if primeiro else ", "
+        topo[3] = False
+        if eh_dict:
+            chave, valor = item
+            yield f"{separador}{_json_chave(chave)}: "
+        else:
+            valor = item
+            yield separador
+        yield abrir(valor)
+
+
+def hash_modelo(modelo: Union[Mapping[str, Union[dict, list]], Iterable[str]]) -> str:
+    """
+    Calcula a impressão digital (SHA-256) de um modelo.
+
+    A ordem das chaves faz parte do hash, pois define a ordem de criação.
+    Modelos profundos demais para o codificador do json (que é recursivo)
+    são serializados aos pedaços por _json_em_partes — o texto, e portanto
+    o hash, é o mesmo, e os marcadores já gravados continuam valendo.
+    """
+    if not isinstance(modelo, (Mapping, list, tuple)):
+        modelo = list(modelo)
+    try:
+        texto = json.dumps(modelo, ensure_ascii=False, default=_json_modelo)
+        return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+    except RecursionError:
+        pass
+
+    sha = hashlib.sha256()
+    bloco: List[str] = []
+    tamanho = 0
+    for parte in _json_em_partes(modelo):
+        bloco.append(parte)
+        tamanho += len(parte)
+        if tamanho >= 65536:
+            sha.update("".join(bloco).encode("utf-8"))
+            bloco.clear()
+            tamanho = 0
+    sha.update("".join(bloco).encode("utf-8"))
+    return sha.hexdigest()
+
+
+def _achatar(modelo: Any, nos: List[NoPlano]) -> None:
+    """
+    Acrescenta em 'nos' os nós de 'modelo' em pré-ordem (pai antes dos filhos).
+
+    Percorre a árvore com uma pilha explícita (um iterador por nível em
+    aberto), na mesma ordem de uma recursão: não há limite de profundidade
+    e o custo por nó é constante.
+    """
+    pilha: List[Tuple[Iterator[Tuple[Any, Any]], int, PurePath, int]] = [
+        (iter(_itens(modelo)), -1, PurePath(), 0)
+    ]
+    while pilha:
+        itens, pai, relativo_pai, nivel = pilha[-1]
+        for nome, sub in itens:
+            nome = str(nome)
+            relativo = relativo_pai / nome
+            indice = len(nos)
+            nos.append(NoPlano(nome, relativo, nivel, pai))
+            if _subarvore(sub):
+                # Desce: os irmãos restantes continuam no iterador do topo atual
+                pilha.append((iter(_itens(sub)), indice, relativo, nivel + 1))
+                break
+        else:
+            pilha.pop()
+
+
+def compilar_plano(
+    modelo: Union[Mapping[str, Union[dict, list]], Iterable[str], PlanoCriacao],
+) -> PlanoCriacao:
+    """
+    Compila o modelo em um PlanoCriacao (com cache pelo hash do modelo).
+
+    Chamadas repetidas com o mesmo modelo (ex.: vários clientes em sequência)
+    reaproveitam o plano já compilado: o mesmo objeto sai em O(1), sem
+    percorrer o modelo; uma cópia igual, pelo hash. Por isso um modelo não
+    deve ser alterado depois de compilado — altere uma cópia.
+    """
+    if isinstance(modelo, PlanoCriacao):
+        return modelo
+    if not isinstance(modelo, (Mapping, list, tuple)):
+        modelo = list(modelo)  # Geradores só podem ser percorridos uma vez
+    with _TRAVA_PLANOS:
+        visto = _POR_OBJETO.get(id(modelo))
+        if visto is not None and visto[0] is modelo:
+            _POR_OBJETO.move_to_end(id(modelo))
+            return visto[1]
+
+    chave = hash_modelo(modelo)
+    plano = _plano_em_cache(chave)
+    if plano is None:
+        nos: List[NoPlano] = []
+        _achatar(modelo, nos)
+        plano = _guardar_plano(PlanoCriacao(hash=chave, nos=tuple(nos)))
+    with _TRAVA_PLANOS:
+        _POR_OBJETO[id(modelo)] = (modelo, plano)
+        while len(_POR_OBJETO) > LIMITE_PLANOS:
+            _POR_OBJETO.popitem(last=False)
+    return plano
+
+
+# ------------------------------------------------------------
+# FORMA COMPACTA (cache em disco dos modelos externos, ver modelos_externos.py)
+# ------------------------------------------------------------
+# O plano vira três listas simples (nomes, níveis, pais), que o pickle grava
+# e lê em milissegundos mesmo com dezenas de milhares de nós. O que custa é
+# montar um PurePath por nó: isso fica para o primeiro acesso aos nós.
+FormaCompacta = Tuple[str, List[str], List[int], List[int]]
+
+
+class _NosCompactos(Sequence):
+    """Os nós de um plano lido da forma compacta, montados no primeiro acesso."""
+
+    def __init__(self, nomes: List[str], niveis: List[int], pais: List[int]) -> None:
+        self._compacto: Optional[Tuple[List[str], List[int], List[int]]] = (nomes, niveis, pais)
+        self._tamanho = len(nomes)
+        self._nos: Tuple[NoPlano, ...] = ()
+        self._trava = threading.Lock()
+
+    def _montar(self) -> Tuple[NoPlano, ...]:
+        with self._trava:  # Vários clientes do lote podem chegar juntos
+            if self._compacto is not None:
+                nomes, niveis, pais = self._compacto
+                raiz = PurePath()
+                relativos: List[PurePath] = []
+                nos: List[NoPlano] = []
+                for nome, nivel, pai in zip(nomes, niveis, pais):
+                    relativo = (relativos[pai] if pai >= 0 else raiz) / nome
+                    relativos.append(relativo)
+                    nos.append(NoPlano(nome, relativo, nivel, pai))
+                self._nos = tuple(nos)
+                self._compacto = None
+        return self._nos
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __getitem__(self, indice):  # type: ignore[override]
+        return (self._nos if self._compacto is None else self._montar())[indice]
+
+    def __iter__(self) -> Iterator[NoPlano]:
+        return iter(self._nos if self._compacto is None else self._montar())
+
+
+def compactar_plano(plano: PlanoCriacao) -> FormaCompacta:
+    """(hash, nomes, níveis, pais) do plano — o que vai para o cache em disco."""
+    return (
+        plano.hash,
+        [no.nome for no in plano.nos],
+        [no.nivel for no in plano.nos],
+        [no.pai for no in plano.nos],
+    )
+
+
+def plano_compacto(forma: FormaCompacta) -> PlanoCriacao:
+    """
+    Plano a partir de compactar_plano (os nós só são montados quando usados).
+
+    Entra no mesmo cache de compilar_plano: o hash é o do modelo de origem.
+    """
+    chave, nomes, niveis, pais = forma
+    plano = _plano_em_cache(chave)
+    if plano is None:
+        plano = _guardar_plano(PlanoCriacao(hash=chave, nos=_NosCompactos(nomes, niveis, pais)))  # type: ignore[arg-type]
+    return plano
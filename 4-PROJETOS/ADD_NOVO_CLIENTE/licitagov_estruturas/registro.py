@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""
+Pastas de dados do usuário e log completo em disco (arquivo rotativo).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+# ------------------------------------------------------------
+# PASTAS DE DADOS
+# ------------------------------------------------------------
+# • Windows: %LOCALAPPDATA%\Licitagov\Estruturas
+# • Demais: $XDG_STATE_HOME/licitagov_estruturas (ou ~/.local/state/...)
+# • LICITAGOV_DADOS sobrescreve os dois (útil em servidores e testes).
+VARIAVEL_DADOS = "LICITAGOV_DADOS"
+
+# Log completo: até 5 arquivos de 5 MB (execucoes.log, execucoes.log.1, ...)
+ARQUIVO_LOG = "execucoes.log"
+TAMANHO_LOG = 5 * 1024 * 1024
+COPIAS_LOG = 5
+
+
+def diretorio_dados() -> Path:
+    """Pasta (criada se preciso) onde o aplicativo guarda seus arquivos."""
+    if os.environ.get(VARIAVEL_DADOS):
+        pasta = Path(os.environ[VARIAVEL_DADOS])
+    elif sys.platform == "win32":
+        local = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        pasta = Path(local) / "Licitagov" / "Estruturas"
+    else:
+        estado = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+        pasta = Path(estado) / "licitagov_estruturas"
+    pasta.mkdir(parents=True, exist_ok=True)
+    return pasta
+
+
+def diretorio_logs() -> Path:
+    """Pasta dos logs (e de outros artefatos de diagnóstico)."""
+    pasta = diretorio_dados() / "logs"
+    pasta.mkdir(parents=True, exist_ok=True)
+    return pasta
+
+
+def abrir_log_arquivo(
+    nome: str = ARQUIVO_LOG,
+    tamanho: int = TAMANHO_LOG,
+    copias: int = COPIAS_LOG,
+) -> logging.Logger:
+    """
+    Devolve um logger que grava cada linha em um arquivo rotativo.
+
+    O arquivo nunca passa de 'tamanho' bytes: ao encher, vira nome.1, nome.2...
+    e as cópias mais antigas (além de 'copias') são descartadas. Pode ser
+    chamado de qualquer thread. Se a pasta de logs não puder ser usada, o
+    logger simplesmente descarta as linhas.
+    """
+    logger = logging.getLogger(f"licitagov_estruturas.arquivo.{nome}")
+    if not logger.handlers:
+        try:
+            handler: logging.Handler = RotatingFileHandler(
+                diretorio_logs() / nome, maxBytes=tamanho, backupCount=copias, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        except OSError:
+            handler = logging.NullHandler()
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False  # Não repete as linhas no stderr
+    return logger
+
+
+def caminho_log(logger: logging.Logger) -> Optional[Path]:
+    """Arquivo em que 'logger' (de abrir_log_arquivo) está gravando (None se nenhum)."""
+    for handler in logger.handlers:
+        if isinstance(handler, logging.FileHandler):
+            return Path(handler.baseFilename)
+    return None
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""
+Modo residente: uma única instância do aplicativo por usuário.
+
+A primeira abertura com --residente fica aberta em segundo plano (ao fechar,
+a janela só se esconde) e atende em um socket local (127.0.0.1). As
+aberturas seguintes — com ou sem --residente, inclusive um duplo clique
+comum — entregam seus argumentos a ela e terminam na hora: a janela
+existente volta a aparecer em milissegundos, sem criar outra.
+
+O endereço e um segredo ficam em RESIDENTE, na pasta de dados do usuário;
+só quem consegue ler esse arquivo (o próprio usuário) fala com a instância.
+"""
+
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import secrets
+import socket
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from .registro import diretorio_dados
+
+RESIDENTE = "residente.json"
+TEMPO_LIMITE_S = 0.5     # Espera máxima pela instância residente (conexão + resposta)
+TAMANHO_MAXIMO = 64 * 1024
+
+
+def _arquivo() -> Path:
+    return diretorio_dados() / RESIDENTE
+
+
+def enviar_para_residente(argv: Sequence[str], tempo_limite: float = TEMPO_LIMITE_S) -> bool:
+    """
+    Entrega 'argv' à instância residente, se houver uma respondendo.
+
+    Devolve False se não existe instância (ou ela não respondeu): nesse caso
+    quem chamou deve abrir a janela normalmente.
+    """
+    try:
+        dados = json.loads(_arquivo().read_text(encoding="utf-8"))
+        endereco = ("127.0.0.1", int(dados["porta"]))
+        mensagem = json.dumps({"token": dados["token"], "argv": list(argv)}, ensure_ascii=False)
+        with socket.create_connection(endereco, timeout=tempo_limite) as conexao:
+            conexao.sendall(mensagem.encode("utf-8") + b"\n")
+            return conexao.makefile("rb").readline().strip() == b"ok"
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def atender_relancamento(argv: Sequence[str]) -> bool:
+    """
+    True se este processo já pode terminar, sem abrir janela nenhuma.
+
+    • Existe o arquivo RESIDENTE e a instância respondeu (com quaisquer
+      argumentos, ou nenhum): ela recebeu 'argv' (volta a aparecer ou fecha);
+    • --encerrar sem instância residente: não há o que fechar.
+    Sem o arquivo, ou se a instância não responder (ex.: arquivo que
+    sobrou de uma instância que caiu), devolve False e o aplicativo abre
+    normalmente. Chamado antes de criar a janela.
+    """
+    if _arquivo().is_file() and enviar_para_residente(argv):
+        return True
+    return "--encerrar" in argv
+
+
+class ServidorResidente:
+    """
+    Atende as aberturas seguintes; 'ao_receber(argv)' é chamado para cada uma.
+
+    'ao_receber' roda na thread do servidor: a interface deve apenas
+    enfileirar o pedido (o Tk só pode ser usado na sua própria thread).
+    """
+
+    def __init__(self, ao_receber: Callable[[List[str]], None]) -> None:
+        self.ao_receber = ao_receber
+        self.token = secrets.token_hex(16)
+        self._socket: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def iniciar(self) -> bool:
+        """Começa a atender; False se não foi possível (segue como instância comum)."""
+        servidor = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            servidor.bind(("127.0.0.1", 0))
+            servidor.listen(8)
+            dados = {"porta": servidor.getsockname()[1], "token": self.token, "pid": os.getpid()}
+            # Gravado só com permissão do dono (o segredo não pode vazar)
+            descritor = os.open(_arquivo(), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descritor, "w", encoding="utf-8") as f:
+                json.dump(dados, f)
+        except OSError:
+            servidor.close()
+            return False
+
+        self._socket = servidor
+        self._thread = threading.Thread(target=self._atender, name="licitagov-residente", daemon=True)
+        self._thread.start()
+        return True
+
+    def _atender(self) -> None:
+        servidor = self._socket
+        while servidor is not None:  # Termina quando encerrar() fecha o socket
+            try:
+                conexao, _endereco = servidor.accept()
+            except OSError:
+                return  # Socket fechado por encerrar()
+            with conexao:
+                try:
+                    conexao.settimeout(TEMPO_LIMITE_S * 4)
+                    linha = conexao.makefile("rb").readline(TAMANHO_MAXIMO)
+                    pedido = json.loads(linha.decode("utf-8"))
+                    if not hmac.compare_digest(str(pedido.get("token", "")), self.token):
+                        continue
+                    argv = [str(a) for a in pedido.get("argv", [])]
+                    conexao.sendall(b"ok\n")
+                except (OSError, ValueError, AttributeError):
+                    continue
+            self.ao_receber(argv)
+
+    def encerrar(self) -> None:
+        """Para de atender e apaga o arquivo de contato (se ainda for o nosso)."""
+        servidor, self._socket = self._socket, None
+        if servidor is not None:
+            try:
+                servidor.shutdown(socket.SHUT_RDWR)  # Acorda o accept() pendente (Linux)
+            except OSError:
+                pass
+            servidor.close()
+        try:
+            arquivo = _arquivo()
+            if json.loads(arquivo.read_text(encoding="utf-8")).get("token") == self.token:
+                arquivo.unlink()
+        except (OSError, ValueError, AttributeError):
+            pass
@@ -0,0 +1,555 @@
+# -*- coding: utf-8 -*-
+
+"""
+Camada de sistema de arquivos usada pelo motor.
+
+O motor nunca chama os.mkdir/os.scandir diretamente: ele recebe um
+SistemaArquivos. Assim dá para testar e medir a criação sem tocar no disco
+(SistemaMemoria) e reproduzir um compartilhamento de rede lento no notebook
+(SistemaLatente, que envolve qualquer outro sistema).
+"""
+
+from __future__ import annotations
+
+import ctypes                           # Atributo "oculto" de arquivos (Windows)
+import errno
+import os
+import random
+import stat as _stat
+import sys
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import PurePath
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+Caminho = Union[str, "os.PathLike[str]"]
+
+# Criação relativa a um descritor de pasta (os.mkdir(nome, dir_fd=...)):
+# disponível no Linux/macOS; no Windows o os não oferece dir_fd.
+DIR_FD_DISPONIVEL = os.mkdir in os.supports_dir_fd and hasattr(os, "O_DIRECTORY")
+
+_ATRIBUTO_OCULTO = 0x02   # FILE_ATTRIBUTE_HIDDEN
+_ATRIBUTO_NORMAL = 0x80   # FILE_ATTRIBUTE_NORMAL
+
+
+class Entrada(NamedTuple):
+    """Item de uma listagem (scandir)."""
+
+    nome: str
+    pasta: bool
+
+
+class Estado(NamedTuple):
+    """Subconjunto de os.stat_result usado pelo motor."""
+
+    st_mode: int
+    st_size: int
+    st_mtime: float
+    st_dev: int
+
+
+# ------------------------------------------------------------
+# INTERFACE
+# ------------------------------------------------------------
+class SistemaArquivos(ABC):
+    """
+    Operações mínimas de que o motor precisa.
+
+    As primitivas (mkdir, rmdir, scandir, stat, rename, ler_texto, escrever_texto)
+    são abstratas — toda implementação precisa das sete — e seguem a
+    semântica do módulo os: lançam FileExistsError, FileNotFoundError,
+    NotADirectoryError ou OSError. Os demais métodos são montados sobre
+    elas e valem para qualquer implementação.
+
+    abrir_pasta/mkdir_em/fechar_pasta permitem criar várias filhas a partir
+    de uma pasta aberta uma única vez. Por padrão a "pasta aberta" é só o
+    caminho e mkdir_em é um mkdir comum; o SistemaLocal usa um descritor
+    (dir_fd) quando o sistema operacional permite.
+    """
+
+    @abstractmethod
+    def mkdir(self, caminho: Caminho) -> None:
+        """Cria UMA pasta (o pai precisa existir)."""
+
+    @abstractmethod
+    def rmdir(self, caminho: Caminho) -> None:
+        """Remove UMA pasta vazia."""
+
+    @abstractmethod
+    def scandir(self, caminho: Caminho) -> List[Entrada]:
+        """Lista o conteúdo de uma pasta (uma única chamada)."""
+
+    @abstractmethod
+    def stat(self, caminho: Caminho) -> Estado:
+        """Como os.stat (segue links)."""
+
+    @abstractmethod
+    def rename(self, origem: Caminho, destino: Caminho) -> None:
+        """Como os.rename (mesmo volume)."""
+
+    @abstractmethod
+    def ler_texto(self, caminho: Caminho) -> str:
+        """Lê um arquivo de texto (UTF-8)."""
+
+    @abstractmethod
+    def escrever_texto(self, caminho: Caminho, texto: str, oculto: bool = False) -> None:
+        """Grava um arquivo de texto (UTF-8), substituindo o anterior."""
+
+    # --- Criação relativa a uma pasta aberta ---
+    def abrir_pasta(self, caminho: Caminho, pai: Any = None, nome: str = "") -> Any:
+        """
+        Abre uma pasta existente para criar filhas nela (ver mkdir_em).
+
+        Com 'pai' (outra pasta aberta), abre a filha 'nome' relativa a ele.
+        """
+        return PurePath(caminho)
+
+    def mkdir_em(self, pasta: Any, nome: str, caminho: Caminho) -> None:
+        """
+        Cria a filha 'nome' dentro de 'pasta' (de abrir_pasta).
+
+        'caminho' é o mesmo destino por extenso, para as implementações
+        que não têm descritores.
+        """
+        self.mkdir(caminho)
+
+    def fechar_pasta(self, pasta: Any) -> None:
+        """Libera o que abrir_pasta reservou."""
+
+    # --- Derivados das primitivas ---
+    def criar_pasta(self, caminho: Caminho, parents: bool = False) -> None:
+        """
+        Como Path.mkdir: com parents=True cria também os pais ausentes.
+
+        Sobe até o primeiro pai existente e cria o que falta de cima para
+        baixo, sem recursão (qualquer profundidade).
+        """
+        try:
+            self.mkdir(caminho)
+            return
+        except FileNotFoundError:
+            if not parents or PurePath(caminho).parent == PurePath(caminho):
+                raise
+
+        faltando = [PurePath(caminho)]
+        while True:
+            pai = faltando[-1].parent
+            try:
+                self.mkdir(pai)
+                break
+            except FileNotFoundError:
+                if pai.parent == pai:
+                    raise
+                faltando.append(pai)
+            except FileExistsError:
+                break  # Outro trabalhador criou o pai ao mesmo tempo
+        for pasta in reversed(faltando[1:]):
+            try:
+                self.mkdir(pasta)
+            except FileExistsError:
+                pass  # Idem, para os pais intermediários
+        self.mkdir(faltando[0])
+
+    def iterar(self, caminho: Caminho) -> Iterator[Entrada]:
+        """Como scandir, mas pode entregar aos poucos (pastas com milhões de itens)."""
+        return iter(self.scandir(caminho))
+
+    def existe(self, caminho: Caminho) -> bool:
+        try:
+            self.stat(caminho)
+            return True
+        except OSError:
+            return False
+
+    def is_dir(self, caminho: Caminho) -> bool:
+        try:
+            return _stat.S_ISDIR(self.stat(caminho).st_mode)
+        except OSError:
+            return False
+
+
+# ------------------------------------------------------------
+# DISCO LOCAL (ou compartilhamento montado)
+# ------------------------------------------------------------
+def _ocultar(caminho: Caminho, ocultar: bool = True) -> None:
+    """Liga/desliga o atributo "oculto" no Windows (nos demais, o "." já oculta)."""
+    if sys.platform != "win32":
+        return
+    try:
+        ctypes.windll.kernel32.SetFileAttributesW(
+            str(caminho), _ATRIBUTO_OCULTO if ocultar else _ATRIBUTO_NORMAL
+        )
+    except (AttributeError, OSError):
+        pass
+
+
+class SistemaLocal(SistemaArquivos):
+    """O sistema de arquivos real (os.mkdir, os.scandir, ...)."""
+
+    def mkdir(self, caminho: Caminho) -> None:
+        os.mkdir(caminho)
+
+    def rmdir(self, caminho: Caminho) -> None:
+        os.rmdir(caminho)
+
+    def scandir(self, caminho: Caminho) -> List[Entrada]:
+        with os.scandir(caminho) as it:
+            return [Entrada(e.name, e.is_dir()) for e in it]
+
+    def iterar(self, caminho: Caminho) -> Iterator[Entrada]:
+        with os.scandir(caminho) as it:
+            for e in it:
+                yield Entrada(e.name, e.is_dir())
+
+    def stat(self, caminho: Caminho) -> Estado:
+        st = os.stat(caminho)
+        return Estado(st.st_mode, st.st_size, st.st_mtime, st.st_dev)
+
+    def rename(self, origem: Caminho, destino: Caminho) -> None:
+        os.rename(origem, destino)
+
+    def abrir_pasta(self, caminho: Caminho, pai: Any = None, nome: str = "") -> Any:
+        if not DIR_FD_DISPONIVEL:
+            return super().abrir_pasta(caminho)
+        if isinstance(pai, int):
+            return os.open(nome, os.O_RDONLY | os.O_DIRECTORY, dir_fd=pai)
+        return os.open(caminho, os.O_RDONLY | os.O_DIRECTORY)
+
+    def mkdir_em(self, pasta: Any, nome: str, caminho: Caminho) -> None:
+        if isinstance(pasta, int):
+            os.mkdir(nome, dir_fd=pasta)  # O SO só resolve 'nome', não o caminho inteiro
+        else:
+            os.mkdir(caminho)
+
+    def fechar_pasta(self, pasta: Any) -> None:
+        if isinstance(pasta, int):
+            os.close(pasta)
+
+    def ler_texto(self, caminho: Caminho) -> str:
+        with open(caminho, encoding="utf-8") as f:
+            return f.read()
+
+    def escrever_texto(self, caminho: Caminho, texto: str, oculto: bool = False) -> None:
+        # Grava ao lado e troca com os.replace: quem lê (ou uma queda no meio)
+        # vê o arquivo antigo inteiro ou o novo inteiro, nunca um pela metade.
+        pasta, nome = os.path.split(os.fspath(caminho))
+        descritor, temporario = tempfile.mkstemp(prefix=f".{nome}.", suffix=".tmp", dir=pasta or None)
+        try:
+            with os.fdopen(descritor, "w", encoding="utf-8") as f:
+                f.write(texto)
+            # No Windows a troca por cima de um arquivo oculto pode ser recusada
+            if oculto and os.path.exists(caminho):
+                _ocultar(caminho, False)
+            os.replace(temporario, caminho)
+        except BaseException:
+            try:
+                os.unlink(temporario)
+            except OSError:
+                pass
+            raise
+        if oculto:
+            _ocultar(caminho)
+
+
+SISTEMA_LOCAL = SistemaLocal()
+
+
+# ------------------------------------------------------------
+# EM MEMÓRIA (testes e medições sem disco)
+# ------------------------------------------------------------
+class SistemaMemoria(SistemaArquivos):
+    """
+    Árvore de pastas/arquivos mantida em dicionários.
+
+    A raiz de qualquer caminho absoluto ("/", "C:\\", "\\\\Servidor\\Share")
+    existe desde o início. O mtime de uma pasta muda quando um filho é
+    criado, removido ou renomeado, como em um disco de verdade.
+    """
+
+    def __init__(self) -> None:
+        self._trava = threading.Lock()
+        # pasta (partes do caminho) -> {nome: é_pasta}
+        self._filhos: Dict[Tuple[str, ...], Dict[str, bool]] = {}
+        self._mtimes: Dict[Tuple[str, ...], float] = {}
+        self._arquivos: Dict[Tuple[str, ...], str] = {}
+
+    @staticmethod
+    def _partes(caminho: Caminho) -> Tuple[str, ...]:
+        return PurePath(caminho).parts
+
+    @staticmethod
+    def _eh_raiz(partes: Tuple[str, ...]) -> bool:
+        """Raiz de caminho: "/", "C:\\", "\\\\Servidor\\Share\\" (ou vazio, se relativo)."""
+        return not partes or (len(partes) == 1 and bool(PurePath(partes[0]).anchor))
+
+    def _pasta_existe(self, partes: Tuple[str, ...]) -> bool:
+        return self._eh_raiz(partes) or partes in self._filhos
+
+    def _erro(self, codigo: int, caminho: Caminho) -> OSError:
+        return OSError(codigo, os.strerror(codigo), str(caminho))
+
+    def _tocar(self, pasta: Tuple[str, ...]) -> None:
+        self._mtimes[pasta] = time.time()
+
+    def _conteudo(self, pasta: Tuple[str, ...]) -> Dict[str, bool]:
+        return self._filhos.setdefault(pasta, {}) if self._eh_raiz(pasta) else self._filhos[pasta]
+
+    def mkdir(self, caminho: Caminho) -> None:
+        partes = self._partes(caminho)
+        with self._trava:
+            if self._eh_raiz(partes) or partes in self._filhos or partes in self._arquivos:
+                raise self._erro(errno.EEXIST, caminho)
+            pai, nome = partes[:-1], partes[-1]
+            if not self._pasta_existe(pai):
+                raise self._erro(errno.ENOTDIR if pai in self._arquivos else errno.ENOENT, caminho)
+            self._conteudo(pai)[nome] = True
+            self._filhos[partes] = {}
+            self._tocar(partes)
+            self._tocar(pai)
+
+    def rmdir(self, caminho: Caminho) -> None:
+        partes = self._partes(caminho)
+        with self._trava:
+            if partes in self._arquivos:
+                raise self._erro(errno.ENOTDIR, caminho)
+            if self._eh_raiz(partes) or partes not in self._filhos:
+                raise self._erro(errno.ENOENT, caminho)
+            if self._filhos[partes]:
+                raise self._erro(errno.ENOTEMPTY, caminho)
+            del self._filhos[partes]
+            self._mtimes.pop(partes, None)
+            del self._conteudo(partes[:-1])[partes[-1]]
+            self._tocar(partes[:-1])
+
+    def scandir(self, caminho: Caminho) -> List[Entrada]:
+        partes = self._partes(caminho)
+        with self._trava:
+            if partes in self._arquivos:
+                raise self._erro(errno.ENOTDIR, caminho)
+            if not self._pasta_existe(partes):
+                raise self._erro(errno.ENOENT, caminho)
+            return [Entrada(n, p) for n, p in self._conteudo(partes).items()]
+
+    def stat(self, caminho: Caminho) -> Estado:
+        partes = self._partes(caminho)
+        with self._trava:
+            if partes in self._arquivos:
+                texto = self._arquivos[partes]
+                return Estado(_stat.S_IFREG | 0o644, len(texto.encode("utf-8")), self._mtimes.get(partes, 0.0), 0)
+            if self._pasta_existe(partes):
+                return Estado(_stat.S_IFDIR | 0o755, 0, self._mtimes.get(partes, 0.0), 0)
+            raise self._erro(errno.ENOENT, caminho)
+
+    def rename(self, origem: Caminho, destino: Caminho) -> None:
+        de, para = self._partes(origem), self._partes(destino)
+        with self._trava:
+            if de not in self._filhos and de not in self._arquivos:
+                raise self._erro(errno.ENOENT, origem)
+            if not self._pasta_existe(para[:-1]):
+                raise self._erro(errno.ENOENT, destino)
+            if para in self._arquivos or self._filhos.get(para):
+                raise self._erro(errno.EEXIST, destino)
+            if para[: len(de)] == de:
+                raise self._erro(errno.EINVAL, destino)  # Mover para dentro de si mesma
+
+            eh_pasta = de in self._filhos
+            del self._conteudo(de[:-1])[de[-1]]
+            self._filhos.pop(para, None)
+            self._conteudo(para[:-1])[para[-1]] = eh_pasta
+            # Reescreve o prefixo de tudo que estava abaixo de 'de'
+            for tabela in (self._filhos, self._arquivos, self._mtimes):
+                for chave in [k for k in tabela if k[: len(de)] == de]:
+                    tabela[para + chave[len(de):]] = tabela.pop(chave)
+            self._tocar(de[:-1])
+            self._tocar(para[:-1])
+
+    def ler_texto(self, caminho: Caminho) -> str:
+        partes = self._partes(caminho)
+        with self._trava:
+            if partes not in self._arquivos:
+                raise self._erro(errno.EISDIR if partes in self._filhos else errno.ENOENT, caminho)
+            return self._arquivos[partes]
+
+    def escrever_texto(self, caminho: Caminho, texto: str, oculto: bool = False) -> None:
+        partes = self._partes(caminho)
+        with self._trava:
+            if not self._pasta_existe(partes[:-1]):
+                raise self._erro(errno.ENOENT, caminho)
+            if partes in self._filhos:
+                raise self._erro(errno.EISDIR, caminho)
+            self._conteudo(partes[:-1])[partes[-1]] = False
+            self._arquivos[partes] = texto
+            self._tocar(partes)
+            self._tocar(partes[:-1])
+
+
+# ------------------------------------------------------------
+# LATÊNCIA E FALHAS SIMULADAS (compartilhamento de rede "de mentira")
+# ------------------------------------------------------------
+class SistemaLatente(SistemaArquivos):
+    """
+    Envolve outro SistemaArquivos acrescentando atraso e falhas.
+
+    • latencia: segundos de espera por chamada (ida e volta na rede).
+    • variacao: desvio aleatório (±) somado à latência.
+    • latencias: latência específica por operação, ex.: {"scandir": 0.02}.
+    • taxa_falha: probabilidade (0–1) de a chamada falhar com TimeoutError
+      (um OSError transitório, como um SMB que não respondeu a tempo).
+    • semente: torna as falhas/variações reprodutíveis.
+    """
+
+    def __init__(
+        self,
+        interno: SistemaArquivos,
+        latencia: float = 0.0,
+        variacao: float = 0.0,
+        taxa_falha: float = 0.0,
+        latencias: Optional[Dict[str, float]] = None,
+        semente: Optional[int] = None,
+    ) -> None:
+        self.interno = interno
+        self.latencia = latencia
+        self.variacao = variacao
+        self.taxa_falha = taxa_falha
+        self.latencias = dict(latencias or {})
+        self._aleatorio = random.Random(semente)
+        self._trava = threading.Lock()
+
+    def _ida_e_volta(self, operacao: str, caminho: Caminho) -> None:
+        with self._trava:
+            espera = self.latencias.get(operacao, self.latencia)
+            if self.variacao:
+                espera += self._aleatorio.uniform(-self.variacao, self.variacao)
+            falhar = self.taxa_falha > 0 and self._aleatorio.random() < self.taxa_falha
+        if espera > 0:
+            time.sleep(espera)
+        if falhar:
+            raise TimeoutError(errno.ETIMEDOUT, f"falha simulada em {operacao}", str(caminho))
+
+    def mkdir(self, caminho: Caminho) -> None:
+        self._ida_e_volta("mkdir", caminho)
+        self.interno.mkdir(caminho)
+
+    def rmdir(self, caminho: Caminho) -> None:
+        self._ida_e_volta("rmdir", caminho)
+        self.interno.rmdir(caminho)
+
+    def scandir(self, caminho: Caminho) -> List[Entrada]:
+        self._ida_e_volta("scandir", caminho)
+        return self.interno.scandir(caminho)
+
+    def stat(self, caminho: Caminho) -> Estado:
+        self._ida_e_volta("stat", caminho)
+        return self.interno.stat(caminho)
+
+    def rename(self, origem: Caminho, destino: Caminho) -> None:
+        self._ida_e_volta("rename", origem)
+        self.interno.rename(origem, destino)
+
+    def abrir_pasta(self, caminho: Caminho, pai: Any = None, nome: str = "") -> Any:
+        self._ida_e_volta("abrir_pasta", caminho)
+        return self.interno.abrir_pasta(caminho, pai, nome)
+
+    def mkdir_em(self, pasta: Any, nome: str, caminho: Caminho) -> None:
+        self._ida_e_volta("mkdir", caminho)
+        self.interno.mkdir_em(pasta, nome, caminho)
+
+    def fechar_pasta(self, pasta: Any) -> None:
+        self.interno.fechar_pasta(pasta)
+
+    def ler_texto(self, caminho: Caminho) -> str:
+        self._ida_e_volta("ler_texto", caminho)
+        return self.interno.ler_texto(caminho)
+
+    def escrever_texto(self, caminho: Caminho, texto: str, oculto: bool = False) -> None:
+        self._ida_e_volta("escrever_texto", caminho)
+        self.interno.escrever_texto(caminho, texto, oculto)
+
+
+# ------------------------------------------------------------
+# CONTAGEM DE CHAMADAS (benchmarks e diagnóstico)
+# ------------------------------------------------------------
+class SistemaContador(SistemaArquivos):
+    """
+    Envolve outro SistemaArquivos contando as chamadas de cada primitiva.
+
+    Cada primitiva corresponde a (pelo menos) uma chamada ao sistema
+    operacional — ou a uma ida e volta na rede, em um compartilhamento.
+
+    'componentes' soma os nomes que o SO precisou resolver: uma chamada com
+    caminho completo resolve todos os componentes do caminho; mkdir_em e
+    abrir_pasta relativos a um descritor resolvem só o nome da filha.
+    """
+
+    def __init__(self, interno: SistemaArquivos) -> None:
+        self.interno = interno
+        self.chamadas: Dict[str, int] = {}
+        self.componentes = 0
+        self._trava = threading.Lock()
+
+    def _contar(self, operacao: str, caminho: Optional[Caminho] = None, componentes: int = 0) -> None:
+        if caminho is not None:
+            componentes = len(PurePath(caminho).parts)
+        with self._trava:
+            self.chamadas[operacao] = self.chamadas.get(operacao, 0) + 1
+            self.componentes += componentes
+
+    @property
+    def total(self) -> int:
+        return sum(self.chamadas.values())
+
+    def zerar(self) -> None:
+        with self._trava:
+            self.chamadas.clear()
+            self.componentes = 0
+
+    def mkdir(self, caminho: Caminho) -> None:
+        self._contar("mkdir", caminho)
+        self.interno.mkdir(caminho)
+
+    def rmdir(self, caminho: Caminho) -> None:
+        self._contar("rmdir", caminho)
+        self.interno.rmdir(caminho)
+
+    def scandir(self, caminho: Caminho) -> List[Entrada]:
+        self._contar("scandir", caminho)
+        return self.interno.scandir(caminho)
+
+    def stat(self, caminho: Caminho) -> Estado:
+        self._contar("stat", caminho)
+        return self.interno.stat(caminho)
+
+    def rename(self, origem: Caminho, destino: Caminho) -> None:
+        self._contar("rename", componentes=len(PurePath(origem).parts) + len(PurePath(destino).parts))
+        self.interno.rename(origem, destino)
+
+    def abrir_pasta(self, caminho: Caminho, pai: Any = None, nome: str = "") -> Any:
+        pasta = self.interno.abrir_pasta(caminho, pai, nome)
+        if not isinstance(pasta, PurePath):  # Sem descritor, nada foi aberto
+            if pai is None or isinstance(pai, PurePath):
+                self._contar("abrir_pasta", caminho)
+            else:
+                self._contar("abrir_pasta", componentes=1)
+        return pasta
+
+    def mkdir_em(self, pasta: Any, nome: str, caminho: Caminho) -> None:
+        if isinstance(pasta, PurePath):
+            self._contar("mkdir", caminho)  # Sem descritor: é um mkdir comum
+        else:
+            self._contar("mkdir_em", componentes=1)
+        self.interno.mkdir_em(pasta, nome, caminho)
+
+    def fechar_pasta(self, pasta: Any) -> None:
+        if not isinstance(pasta, PurePath):
+            self._contar("fechar_pasta")
+        self.interno.fechar_pasta(pasta)
+
+    def ler_texto(self, caminho: Caminho) -> str:
+        self._contar("ler_texto", caminho)
+        return self.interno.ler_texto(caminho)
+
+    def escrever_texto(self, caminho: Caminho, texto: str, oculto: bool = False) -> None:
+        self._contar("escrever_texto", caminho)
+        self.interno.escrever_texto(caminho, texto, oculto)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mede o tempo entre abrir o aplicativo e a janela principal aparecer.
+
+    python medir_inicializacao.py dist\\LicitagovEstruturas.exe dist\\LicitagovEstruturas_rapido\\LicitagovEstruturas.exe
+    python medir_inicializacao.py LicitagovEstruturasApp.py --vezes 5 --json inicio.json
+
+Cada alvo (um .exe ou um .py) é aberto várias vezes, em sequência. O
+aplicativo, ao ver a variável LICITAGOV_MEDIR_INICIO, anota a hora em que a
+janela apareceu e fecha sozinho. A primeira abertura é mostrada à parte:
+é a que sofre com cache frio e com a varredura do antivírus (rode logo após
+copiar o build, ou após reiniciar a máquina, para medir o pior caso).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+VARIAVEL_MEDIR_INICIO = "LICITAGOV_MEDIR_INICIO"  # Mesma de LicitagovEstruturasApp.py
+LIMITE_S = 120.0  # Desiste de uma abertura que não mostra a janela nesse tempo
+
+
+def medir_abertura(alvo: str) -> float:
+    """Abre 'alvo' uma vez e devolve os segundos até a janela aparecer."""
+    comando = [sys.executable, alvo] if alvo.lower().endswith(".py") else [alvo]
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "janela.txt")
+        ambiente = dict(os.environ, **{VARIAVEL_MEDIR_INICIO: arquivo})
+        inicio = time.time()
+        processo = subprocess.Popen(comando, env=ambiente)
+        try:
+            processo.wait(timeout=LIMITE_S)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+            raise RuntimeError(f"{alvo}: a janela não apareceu em {LIMITE_S:.0f} s")
+        try:
+            with open(arquivo, encoding="utf-8") as f:
+                janela = float(f.read())
+        except (OSError, ValueError):
+            raise RuntimeError(f"{alvo}: terminou (código {processo.returncode}) sem abrir a janela")
+    return janela - inicio
+
+
+def medir_alvo(alvo: str, vezes: int) -> Dict[str, Any]:
+    """Abre 'alvo' 'vezes' vezes; resume a primeira abertura e as seguintes."""
+    tempos: List[float] = [medir_abertura(alvo) for _ in range(max(1, vezes))]
+    seguintes = tempos[1:] or tempos
+    return {
+        "alvo": alvo,
+        "vezes": len(tempos),
+        "primeira_ms": round(tempos[0] * 1000, 1),
+        "min_ms": round(min(seguintes) * 1000, 1),
+        "mediana_ms": round(statistics.median(seguintes) * 1000, 1),
+        "max_ms": round(max(seguintes) * 1000, 1),
+        "tempos_ms": [round(t * 1000, 1) for t in tempos],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tempo até a primeira janela do Licitagov Estruturas.")
+    parser.add_argument("alvos", nargs="+", help="executáveis (.exe) ou LicitagovEstruturasApp.py")
+    parser.add_argument("--vezes", type=int, default=10, metavar="N", help="aberturas por alvo (padrão: 10)")
+    parser.add_argument("--json", metavar="ARQUIVO", help="grava os resultados em JSON")
+    args = parser.parse_args()
+
+    resultados = []
+    for alvo in args.alvos:
+        try:
+            dados = medir_alvo(alvo, args.vezes)
+        except (OSError, RuntimeError) as e:
+            print(f"[ERRO] {e}", file=sys.stderr)
+            return 1
+        resultados.append(dados)
+        print(
+            f"{alvo}\n  primeira abertura: {dados['primeira_ms']:.0f} ms | "
+            f"demais: mín {dados['min_ms']:.0f} ms, mediana {dados['mediana_ms']:.0f} ms, "
+            f"máx {dados['max_ms']:.0f} ms"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fixtures comuns: disco em memória e pastas de dados/modelos temporárias.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from licitagov_estruturas import modelos_externos
+from licitagov_estruturas.registro import VARIAVEL_DADOS
+from licitagov_estruturas.sistema_arquivos import SistemaMemoria
+
+RAIZ = Path("/clientes")
+
+
+@pytest.fixture(autouse=True)
+def dados(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Pasta de dados do usuário isolada (cache de modelos, índice, logs)."""
+    pasta = tmp_path / "dados"
+    monkeypatch.setenv(VARIAVEL_DADOS, str(pasta))
+    monkeypatch.setattr(modelos_externos, "_MEMORIA", {})
+    return pasta
+
+
+@pytest.fixture
+def modelos(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Pasta de modelos externos (LICITAGOV_MODELOS) vazia."""
+    pasta = tmp_path / "modelos"
+    pasta.mkdir()
+    monkeypatch.setenv(modelos_externos.VARIAVEL_MODELOS, str(pasta))
+    return pasta
+
+
+@pytest.fixture
+def memoria() -> SistemaMemoria:
+    """Disco em memória com a raiz de clientes (RAIZ) já criada."""
+    sistema = SistemaMemoria()
+    sistema.mkdir(RAIZ)
+    return sistema
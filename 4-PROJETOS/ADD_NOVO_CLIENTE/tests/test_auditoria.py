@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""
+auditar_raiz: pastas faltando, extras e nomes errados.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, criar_arvore
+from licitagov_estruturas.auditoria import AuditoriaCliente, auditar_raiz
+from licitagov_estruturas.motor import TokenCancelamento
+from licitagov_estruturas.sistema_arquivos import SistemaMemoria
+
+from .conftest import RAIZ
+
+
+def _clientes(memoria: SistemaMemoria, n: int) -> None:
+    for i in range(n):
+        criar_arvore(RAIZ / f"C{i:02d}", ESTRUTURA_PADRAO, sistema=memoria, marcador=True)
+
+
+def test_diferencas_por_cliente(memoria: SistemaMemoria) -> None:
+    _clientes(memoria, 5)
+    c1 = RAIZ / "C01"
+    memoria.rmdir(c1 / "00. Editais_ANALISAR")
+    memoria.rename(c1 / "02. Empresa" / "02. Socios", c1 / "02. Empresa" / "02. Sócio")
+    memoria.mkdir(c1 / "02. Empresa" / "Fotos")
+    memoria.escrever_texto(c1 / "02. Empresa" / "doc.pdf", "x")  # Arquivo não é extra
+    memoria.mkdir(RAIZ / "C03" / "extra")
+    memoria.mkdir(RAIZ / ".C09.montagem")  # Oculta: não é cliente
+
+    itens: List[AuditoriaCliente] = []
+    resumo = auditar_raiz(RAIZ, ESTRUTURA_PADRAO, itens.append, sistema=memoria, trabalhadores=3)
+
+    assert (resumo.clientes, resumo.conformes, resumo.divergentes, resumo.erros) == (5, 3, 2, 0)
+    por_nome = {item.pasta.name: item for item in itens}
+    c1_auditado = por_nome["C01"]
+    assert c1_auditado.faltando == ["00. Editais_ANALISAR"]
+    assert c1_auditado.nome_errado == [(str(Path("02. Empresa/02. Socios")), "02. Sócio")]
+    assert c1_auditado.extras == [str(Path("02. Empresa/Fotos"))]
+    assert por_nome["C03"].extras == ["extra"] and por_nome["C03"].faltando == []
+    assert por_nome["C00"].situacao == "CONFORME" and por_nome["C00"].versao is not None
+
+
+def test_cancelamento_para_a_raiz(memoria: SistemaMemoria) -> None:
+    _clientes(memoria, 3)
+    cancelamento = TokenCancelamento()
+    cancelamento.cancelar()
+
+    resumo = auditar_raiz(RAIZ, ESTRUTURA_PADRAO, sistema=memoria, cancelamento=cancelamento)
+    assert resumo.cancelado and resumo.clientes == 0
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""
+bench: veredito de regressão de comparar() e código de saída do "bench --baseline".
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from licitagov_estruturas import bench
+from licitagov_estruturas.cli import SAIDA_COM_ERROS, SAIDA_OK, SAIDA_USO, main
+
+CENARIO = "profundo_500_memoria"  # Pequeno, em memória e determinístico
+
+
+def _resultado(**valores: Any) -> Dict[str, Any]:
+    cenario = {
+        "pastas_por_s": 1000.0,
+        "chamadas_por_pasta": 2.0,
+        "componentes_por_pasta": 3.0,
+        "pico_memoria_kb": 1000.0,
+        "com_falhas": False,
+    }
+    cenario.update(valores)
+    return {"cenarios": {"c": cenario}}
+
+
+def test_comparar_dentro_da_tolerancia() -> None:
+    base = _resultado()
+    assert bench.comparar(base, base) == []
+    assert bench.comparar(_resultado(pastas_por_s=800.0), base, tolerancia=0.25) == []
+    assert bench.comparar(_resultado(pico_memoria_kb=1060.0), base) == []  # Ruído de memória
+    assert bench.comparar({"cenarios": {"outro": base["cenarios"]["c"]}}, base) == []  # Só de um lado
+
+
+@pytest.mark.parametrize(
+    "valores, trecho",
+    [
+        ({"pastas_por_s": 700.0}, "pastas/s caiu"),
+        ({"chamadas_por_pasta": 2.1}, "chamadas/pasta subiu"),
+        ({"componentes_por_pasta": 3.1}, "componentes/pasta subiu"),
+        ({"pico_memoria_kb": 2000.0}, "pico de memória subiu"),
+    ],
+)
+def test_comparar_aponta_regressao(valores: Dict[str, Any], trecho: str) -> None:
+    (regressao,) = bench.comparar(_resultado(**valores), _resultado(), tolerancia=0.25)
+    assert regressao.startswith("c: ") and trecho in regressao
+
+
+def test_comparar_ignora_chamadas_com_falhas_injetadas() -> None:
+    atual = _resultado(chamadas_por_pasta=3.0, componentes_por_pasta=5.0, com_falhas=True)
+    assert bench.comparar(atual, _resultado()) == []
+    sem_componentes = _resultado()
+    del sem_componentes["cenarios"]["c"]["componentes_por_pasta"]  # Linha de base antiga
+    assert bench.comparar(_resultado(componentes_por_pasta=9.0), sem_componentes) == []
+
+
+def test_cli_bench_contra_linha_de_base(tmp_path: Path) -> None:
+    medido = tmp_path / "atual.json"
+    opcoes = ["bench", "--rapido", "--cenario", CENARIO, "--repeticoes", "1", "-q"]
+    assert main([*opcoes, "--saida", str(medido)]) == SAIDA_OK
+    resultado = bench.ler_resultado(medido)
+    assert list(resultado["cenarios"]) == [CENARIO]
+
+    # A mesma medição como linha de base (tempo com folga larga): sem regressão
+    assert main([*opcoes, "--baseline", str(medido), "--tolerancia", "0.99"]) == SAIDA_OK
+
+    # Linha de base com menos chamadas por pasta: regressão determinística
+    melhor = tmp_path / "melhor.json"
+    resultado["cenarios"][CENARIO]["chamadas_por_pasta"] /= 2
+    melhor.write_text(json.dumps(resultado), encoding="utf-8")
+    assert main([*opcoes, "--baseline", str(melhor), "--tolerancia", "0.99"]) == SAIDA_COM_ERROS
+
+    invalida = tmp_path / "invalida.json"
+    invalida.write_text("[]", encoding="utf-8")
+    assert main([*opcoes, "--baseline", str(invalida)]) == SAIDA_USO
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+"""
+Linha de comando: códigos de saída de create, batch, audit e migrate.
+"""
+
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, TokenCancelamento, cli, criar_arvore
+from licitagov_estruturas.cli import SAIDA_CANCELADO, SAIDA_COM_ERROS, SAIDA_FALHA, SAIDA_OK, SAIDA_USO, main
+from licitagov_estruturas.motor import MARCADOR
+
+
+@pytest.fixture
+def cancelado(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Como se o usuário tivesse apertado Ctrl+C antes do primeiro cliente/pasta."""
+
+    @contextmanager
+    def ja_cancelado() -> Iterator[TokenCancelamento]:
+        token = TokenCancelamento()
+        token.cancelar()
+        yield token
+
+    monkeypatch.setattr(cli, "_ctrl_c_cancela", ja_cancelado)
+
+
+def _csv(tmp_path: Path, *linhas: str) -> Path:
+    arquivo = tmp_path / "clientes.csv"
+    arquivo.write_text("\n".join(["nome;cnpj;raiz", *linhas]) + "\n", encoding="utf-8")
+    return arquivo
+
+
+# --- create ---
+def test_create(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    base = tmp_path / "clientes" / "Empresa X"
+    assert main(["create", str(base), "--json", "-q"]) == SAIDA_OK
+    assert json.loads(capsys.readouterr().out)["ok"] is True
+    assert (base / "02. Empresa" / "07. Certidoes").is_dir() and (base / MARCADOR).is_file()
+
+    assert main(["create", str(base), "--json", "-q"]) == SAIDA_OK  # Marcador: nada a fazer
+    assert json.loads(capsys.readouterr().out)["pulado"] is True
+
+
+def test_create_codigos_de_erro(tmp_path: Path) -> None:
+    base = tmp_path / "c"
+    base.mkdir()
+    (base / "02. Empresa").write_text("")  # Arquivo no lugar de uma pasta do modelo
+    assert main(["create", str(base), "-q"]) == SAIDA_COM_ERROS
+
+    (tmp_path / "arquivo").write_text("")
+    assert main(["create", str(tmp_path / "arquivo" / "x"), "-q"]) == SAIDA_FALHA  # Base impossível
+    assert main(["create", str(tmp_path / "y"), "--template", str(tmp_path / "nao_existe.json"), "-q"]) == SAIDA_USO
+    assert not (tmp_path / "y").exists()
+
+
+def test_create_cancelado(tmp_path: Path, cancelado: None) -> None:
+    assert main(["create", str(tmp_path / "c"), "-q"]) == SAIDA_CANCELADO
+    assert not (tmp_path / "c" / "02. Empresa").exists()
+
+
+# --- batch ---
+def test_batch(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    raiz = tmp_path / "clientes"
+    arquivo = _csv(tmp_path, f"A;1;{raiz}", f"B;2;{raiz}")
+    assert main(["batch", str(arquivo), "--json", "-q"]) == SAIDA_OK
+    assert json.loads(capsys.readouterr().out)["ok"] == 2
+    assert (raiz / "B" / "02. Empresa").is_dir()
+    assert (tmp_path / "clientes_relatorio.csv").is_file()
+
+
+def test_batch_codigos_de_erro(tmp_path: Path) -> None:
+    (tmp_path / "arquivo").write_text("")
+    falha = _csv(tmp_path, f"A;1;{tmp_path / 'clientes'}", f"B;2;{tmp_path / 'arquivo'}")
+    assert main(["batch", str(falha), "-q"]) == SAIDA_COM_ERROS
+
+    invalido = _csv(tmp_path, f"../fora;1;{tmp_path}")
+    assert main(["batch", str(invalido), "-q"]) == SAIDA_USO
+    assert main(["batch", str(tmp_path / "nao_existe.csv"), "-q"]) == SAIDA_USO
+
+
+def test_batch_cancelado(tmp_path: Path, cancelado: None) -> None:
+    arquivo = _csv(tmp_path, f"A;1;{tmp_path / 'clientes'}")
+    assert main(["batch", str(arquivo), "-q"]) == SAIDA_CANCELADO
+
+
+# --- audit ---
+def test_audit(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    raiz = tmp_path / "clientes"
+    for nome in ("A", "B"):
+        criar_arvore(raiz / nome, ESTRUTURA_PADRAO, marcador=True)
+    saida = tmp_path / "auditoria.jsonl"
+    assert main(["audit", str(raiz), "--saida", str(saida), "--json", "-q"]) == SAIDA_OK
+    assert json.loads(capsys.readouterr().out)["conformes"] == 2
+    assert len(saida.read_text(encoding="utf-8").splitlines()) == 2
+
+    (raiz / "B" / "02. Empresa" / "07. Certidoes").rmdir()
+    assert main(["audit", str(raiz), "-q"]) == SAIDA_COM_ERROS
+
+
+def test_audit_codigos_de_erro(tmp_path: Path, cancelado: None) -> None:
+    assert main(["audit", str(tmp_path / "nao_existe"), "-q"]) == SAIDA_FALHA
+    assert main(["audit", str(tmp_path), "--template", str(tmp_path / "nao_existe.toml"), "-q"]) == SAIDA_USO
+    criar_arvore(tmp_path / "clientes" / "A", ESTRUTURA_PADRAO)
+    assert main(["audit", str(tmp_path / "clientes"), "-q"]) == SAIDA_CANCELADO
+
+
+# --- migrate ---
+def test_migrate(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    raiz = tmp_path / "clientes"
+    criar_arvore(raiz / "A", ESTRUTURA_PADRAO, marcador=True)
+    assert main(["migrate", str(raiz), "--json", "-q"]) == SAIDA_OK
+    assert json.loads(capsys.readouterr().out)["por_situacao"] == {"EM DIA": 1}
+
+    criar_arvore(raiz / "B", ESTRUTURA_PADRAO, marcador=True)
+    (raiz / "B" / MARCADOR).write_text(json.dumps({"versao": "x"}), encoding="utf-8")
+    assert main(["migrate", str(raiz), "-q"]) == SAIDA_COM_ERROS
+
+
+def test_migrate_codigos_de_erro(tmp_path: Path, cancelado: None) -> None:
+    assert main(["migrate", str(tmp_path / "nao_existe"), "-q"]) == SAIDA_FALHA
+    assert main(["migrate", str(tmp_path), "--saida", str(tmp_path / "nao_existe" / "x.jsonl"), "-q"]) == SAIDA_USO
+    criar_arvore(tmp_path / "clientes" / "A", ESTRUTURA_PADRAO, marcador=True)
+    assert main(["migrate", str(tmp_path / "clientes"), "-q"]) == SAIDA_CANCELADO
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+Concorrência adaptativa: janela AIMD, novas tentativas e falhas simuladas.
+"""
+
+from __future__ import annotations
+
+import errno
+from pathlib import Path
+from typing import Set
+
+import pytest
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, compilar_plano, criar_arvore
+from licitagov_estruturas import concorrencia
+from licitagov_estruturas.concorrencia import JANELA_MINIMA, ControleConcorrencia, SistemaResiliente
+from licitagov_estruturas.sistema_arquivos import Caminho, SistemaLatente, SistemaMemoria
+
+from .conftest import RAIZ
+
+
+@pytest.fixture(autouse=True)
+def sem_espera(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Novas tentativas sem a espera exponencial (os testes não dormem)."""
+    monkeypatch.setattr(concorrencia, "espera_com_variacao", lambda _tentativa: 0.0)
+
+
+def _janela(controle: ControleConcorrencia, segundos: float, falhou: bool = False) -> None:
+    for _ in range(max(JANELA_MINIMA, controle.limite)):
+        controle.registrar(segundos, falhou=falhou)
+
+
+def test_janela_sobe_e_cai_pela_metade() -> None:
+    controle = ControleConcorrencia(maximo=32, inicial=2)
+
+    limites = []
+    for _ in range(4):
+        _janela(controle, 0.01)
+        limites.append(controle.limite)
+    assert limites == [4, 8, 16, 32]  # Partida lenta: dobra até o teto
+
+    _janela(controle, 0.01, falhou=True)
+    assert controle.limite == 16 and controle.falhas_transitorias == 32
+
+    _janela(controle, 0.01)
+    assert controle.limite == 17  # Depois da primeira falha, sobe de um em um
+    assert controle.pico == 32 and controle.como_dict()["final"] == 17
+
+
+def test_latencia_saturada_desce_um() -> None:
+    controle = ControleConcorrencia(maximo=8, inicial=4)
+    _janela(controle, 0.01)  # Referência: 10 ms
+    assert controle.limite == 8
+
+    _janela(controle, 0.05)  # 5x a referência: saturando
+    assert controle.limite == 7
+    _janela(controle, 0.018)  # Entre 1,5x e 2x: fica onde está
+    assert controle.limite == 7
+
+
+class SempreTimeout(SistemaMemoria):
+    def __init__(self) -> None:
+        super().__init__()
+        self.chamadas = 0
+
+    def mkdir(self, caminho: Caminho) -> None:
+        self.chamadas += 1
+        raise TimeoutError(errno.ETIMEDOUT, "sem resposta", str(caminho))
+
+
+def test_novas_tentativas_esgotadas() -> None:
+    interno = SempreTimeout()
+    controle = ControleConcorrencia(maximo=4)
+    sistema = SistemaResiliente(interno, controle, tentativas=3)
+
+    with pytest.raises(TimeoutError):
+        sistema.mkdir(Path("/x"))
+    assert interno.chamadas == 4 and controle.retentativas == 3
+
+    # Erro definitivo: sem nova tentativa
+    with pytest.raises(FileExistsError):
+        SistemaResiliente(SistemaMemoria(), controle).mkdir(Path("/"))
+    assert controle.retentativas == 3
+
+
+class TimeoutDepoisDeCriar(SistemaMemoria):
+    """A primeira resposta de cada mkdir se perde (a pasta foi criada no servidor)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.respondidas: Set[str] = set()
+
+    def mkdir(self, caminho: Caminho) -> None:
+        super().mkdir(caminho)
+        if str(caminho) not in self.respondidas:
+            self.respondidas.add(str(caminho))
+            raise TimeoutError(errno.ETIMEDOUT, "resposta perdida", str(caminho))
+
+
+def test_timeout_que_criou_conta_como_criada() -> None:
+    memoria = TimeoutDepoisDeCriar()
+    log = []
+    r = criar_arvore(RAIZ / "C", ESTRUTURA_PADRAO, log.append, sistema=memoria, adaptativo=True, trabalhadores=4)
+
+    total = len(compilar_plano(ESTRUTURA_PADRAO))
+    assert r.ok and len(r.criadas) == total and r.existentes == []
+    assert sum(linha.strip().startswith("Criado:") for linha in log) == total
+    assert r.concorrencia is not None and r.concorrencia["retentativas"] >= total
+
+
+def test_falhas_simuladas_sao_repetidas(memoria: SistemaMemoria) -> None:
+    instavel = SistemaLatente(memoria, taxa_falha=0.2, semente=7)
+
+    fixo = criar_arvore(RAIZ / "Fixo", ESTRUTURA_PADRAO, sistema=instavel, trabalhadores=4)
+    assert not fixo.ok
+
+    r = criar_arvore(RAIZ / "Adaptativo", ESTRUTURA_PADRAO, sistema=instavel, adaptativo=True, trabalhadores=8)
+    assert r.ok and len(r.criadas) == len(compilar_plano(ESTRUTURA_PADRAO))
+    assert r.concorrencia is not None
+    assert r.concorrencia["retentativas"] > 0 and r.concorrencia["falhas_transitorias"] > 0
+    assert r.concorrencia["final"] <= r.concorrencia["maximo"] == 8
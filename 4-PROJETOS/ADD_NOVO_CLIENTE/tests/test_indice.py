@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""
+IndiceClientes: atualização e consulta das pastas faltando.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, IndiceClientes, criar_arvore
+from licitagov_estruturas.sistema_arquivos import SistemaMemoria
+
+from .conftest import RAIZ
+
+ALVO = Path("02. Empresa") / "07. Certidoes"
+
+
+def test_faltando_e_atualizacao(tmp_path: Path, memoria: SistemaMemoria) -> None:
+    for i in range(4):
+        criar_arvore(RAIZ / f"c{i}", ESTRUTURA_PADRAO, sistema=memoria, marcador=True)
+    memoria.rmdir(RAIZ / "c2" / ALVO)
+
+    with IndiceClientes(tmp_path / "indice.sqlite3") as indice:
+        r = indice.atualizar(RAIZ, ESTRUTURA_PADRAO, sistema=memoria, trabalhadores=2)
+        assert (r.novos, r.reauditados, r.removidos) == (4, 0, 0)
+
+        assert [c["nome"] for c in indice.faltando(ALVO.name)] == ["c2"]
+        assert [c["nome"] for c in indice.faltando(str(ALVO).upper())] == ["c2"]
+        assert indice.faltando("Nao Existe") == []
+
+        memoria.mkdir(RAIZ / "c2" / ALVO)
+        memoria.rmdir(RAIZ / "c3" / "00. Editais_ANALISAR")
+        criar_arvore(RAIZ / "c9", ESTRUTURA_PADRAO, sistema=memoria)
+        memoria.rename(RAIZ / "c0", RAIZ / ".c0")  # Oculta: some da raiz
+        r = indice.atualizar(RAIZ, ESTRUTURA_PADRAO, sistema=memoria)
+        assert (r.novos, r.reauditados, r.removidos) == (1, 3, 1)
+
+        assert indice.faltando(ALVO.name) == []
+        assert [c["nome"] for c in indice.faltando("00. Editais_ANALISAR")] == ["c3"]
+        assert [c["nome"] for c in indice.clientes(situacao="divergente")] == ["c3"]
+
+
+def test_indice_de_outro_esquema_e_descartado(tmp_path: Path, memoria: SistemaMemoria) -> None:
+    criar_arvore(RAIZ / "c0", ESTRUTURA_PADRAO, sistema=memoria)
+    arquivo = tmp_path / "indice.sqlite3"
+    with IndiceClientes(arquivo) as indice:
+        indice.atualizar(RAIZ, ESTRUTURA_PADRAO, sistema=memoria)
+        indice._conexao.execute("UPDATE meta SET valor = '1' WHERE chave = 'esquema'")
+        indice._conexao.commit()
+
+    with IndiceClientes(arquivo) as indice:
+        assert indice.clientes() == []
+        assert indice.atualizar(RAIZ, ESTRUTURA_PADRAO, sistema=memoria).novos == 1
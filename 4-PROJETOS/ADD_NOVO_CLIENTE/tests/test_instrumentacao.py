@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+Instrumentacao: contagens por pasta em resumo() e faixas de histograma().
+"""
+
+from __future__ import annotations
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, compilar_plano, criar_arvore
+from licitagov_estruturas.instrumentacao import FAIXAS_MS, Instrumentacao, MedicaoNo
+from licitagov_estruturas.sistema_arquivos import SistemaMemoria
+
+from .conftest import RAIZ
+
+TOTAL = len(compilar_plano(ESTRUTURA_PADRAO))
+
+
+def test_resumo_conta_cada_pasta(memoria: SistemaMemoria) -> None:
+    base = RAIZ / "A"
+    memoria.mkdir(base)
+    memoria.mkdir(base / "02. Empresa")  # Já existia: mkdir + stat
+
+    instr = Instrumentacao()
+    criar_arvore(base, ESTRUTURA_PADRAO, sistema=memoria, instrumentacao=instr)
+    instr.encerrar()
+    resumo = instr.resumo()
+
+    assert resumo["pastas"] == len(instr.nos) == TOTAL
+    assert {s: d["pastas"] for s, d in resumo["por_situacao"].items()} == {"criada": TOTAL - 1, "existente": 1}
+    assert resumo["por_situacao"]["criada"]["chamadas"] == TOTAL - 1
+    assert resumo["por_situacao"]["existente"]["chamadas"] == 2
+    assert resumo["chamadas"] == {"mkdir": TOTAL, "stat": 1}
+    assert resumo["log"]["linhas"] == TOTAL
+    assert sum(f["pastas"] for f in resumo["histograma"]) == TOTAL
+    assert resumo["ms_por_pasta"]["p50"] is not None
+
+    # Incremental: a listagem confirma tudo; nenhuma pasta tem tempo próprio
+    instr = Instrumentacao()
+    criar_arvore(base, ESTRUTURA_PADRAO, sistema=memoria, incremental=True, instrumentacao=instr)
+    resumo = instr.resumo()
+    assert resumo["por_situacao"] == {"listada": {"pastas": TOTAL, "segundos": 0.0, "chamadas": 0}}
+    assert set(resumo["chamadas"]) == {"scandir"}
+    assert resumo["fases"]["listagem"]["chamadas"] == resumo["chamadas"]["scandir"]
+    assert sum(f["pastas"] for f in resumo["histograma"]) == 0
+    assert resumo["ms_por_pasta"]["p50"] is None
+
+
+def test_histograma_por_faixa() -> None:
+    instr = Instrumentacao()
+    for ms in (0.05, 0.1, 0.3, 7.0, 2000.0):
+        instr.nos.append(MedicaoNo(f"/p{ms}", "criada", ms / 1000.0, 1))
+    instr.nos.append(MedicaoNo("/listada", "listada", 0.0, 0))  # Sem chamadas: fora do histograma
+
+    faixas = {f["ate_ms"]: f["pastas"] for f in instr.histograma()}
+    assert len(faixas) == len(FAIXAS_MS) + 1
+    assert faixas[0.1] == 2 and faixas[0.5] == 1 and faixas[10.0] == 1 and faixas[None] == 1
+    assert sum(faixas.values()) == 5
+    assert instr.resumo()["ms_por_pasta"]["max"] == 2000.0
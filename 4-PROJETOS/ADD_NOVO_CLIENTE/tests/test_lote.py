@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""
+Modo lote: leitura do CSV, vários clientes, tipos de modelo e tipo inválido.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, ClienteLote, compilar_plano, ler_clientes_csv, provisionar_lote
+from licitagov_estruturas.motor import ler_marcador
+from licitagov_estruturas.sistema_arquivos import SistemaMemoria
+
+from .conftest import RAIZ
+
+
+def test_lote_cria_todos(memoria: SistemaMemoria) -> None:
+    clientes = [ClienteLote(f"C{i}", str(i), RAIZ) for i in range(6)]
+    relatorio = provisionar_lote(clientes, ESTRUTURA_PADRAO, sistema=memoria, marcador=True)
+
+    assert relatorio.contar("OK") == 6
+    assert sorted(e.nome for e in memoria.scandir(RAIZ)) == [c.nome for c in clientes]
+    assert all(ler_marcador(c.pasta, memoria)["hash"] == compilar_plano(ESTRUTURA_PADRAO).hash for c in clientes)
+
+
+def test_tipo_invalido_falha_so_o_cliente(memoria: SistemaMemoria, modelos: Path) -> None:
+    (modelos / "sp.json").write_text(json.dumps({"base": "padrao", "adicionar": {"07. SP": {}}}), encoding="utf-8")
+    clientes = [
+        ClienteLote("A", "", RAIZ),
+        ClienteLote("B", "", RAIZ, tipo="naoexiste"),
+        ClienteLote("C", "", RAIZ, tipo="sp"),
+    ]
+    log = []
+    relatorio = provisionar_lote(clientes, ESTRUTURA_PADRAO, log.append, sistema=memoria, marcador=True)
+
+    por_nome = {item.cliente.nome: item for item in relatorio.itens}
+    assert por_nome["A"].situacao == "OK" and por_nome["C"].situacao == "OK"
+    assert por_nome["B"].situacao == "FALHOU" and "naoexiste" in por_nome["B"].erro
+    assert not memoria.existe(RAIZ / "B")
+    assert any("[ERRO]" in linha and "naoexiste" in linha for linha in log)
+
+    assert memoria.existe(RAIZ / "C" / "07. SP") and not memoria.existe(RAIZ / "A" / "07. SP")
+    assert ler_marcador(RAIZ / "C", memoria)["modelo"] == "sp"
+    assert ler_marcador(RAIZ / "A", memoria)["modelo"] == "padrao"
+    assert relatorio.como_dict()["falharam"] == 1
+
+
+def test_csv_le_clientes(tmp_path: Path) -> None:
+    csv = tmp_path / "clientes.csv"
+    csv.write_text("Nome;CNPJ;Raiz;Tipo\nEmpresa X;1;/clientes;sp\n;;;\nEmpresa Y;2;/clientes;\n", encoding="utf-8")
+
+    assert ler_clientes_csv(csv) == [
+        ClienteLote("Empresa X", "1", Path("/clientes"), "sp"),
+        ClienteLote("Empresa Y", "2", Path("/clientes")),
+    ]
+
+
+@pytest.mark.parametrize("nome", ["../x", "..", "a/b", "a\\b", "C:\\x", "/abs", "a<b", "a?", "fim."])
+def test_csv_recusa_nome_que_nao_e_pasta(tmp_path: Path, nome: str) -> None:
+    csv = tmp_path / "clientes.csv"
+    csv.write_text(f"nome;cnpj;raiz\nOK;1;/clientes\n{nome};2;/clientes\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Linha 3"):
+        ler_clientes_csv(csv)
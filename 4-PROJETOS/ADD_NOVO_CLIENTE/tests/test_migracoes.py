@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""
+migrar_raiz: passos por versão, idempotência e clientes de outro modelo.
+"""
+
+from __future__ import annotations
+
+from pathlib import PurePath
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, adicionar, criar_arvore, migrar_raiz, mover, renomear
+from licitagov_estruturas.migracoes import MigracaoCliente, ResumoMigracao, validar_migracoes
+from licitagov_estruturas.motor import MARCADOR, ler_marcador
+from licitagov_estruturas.sistema_arquivos import SistemaMemoria
+
+from .conftest import RAIZ
+
+MIGRACOES = {
+    2: [adicionar("02. Empresa/21. Novo_Cadastro"), renomear("01. Licitacao/03. Declinada", "03. Declinadas")],
+    3: [mover("00. Editais_ANALISAR", "01. Licitacao/00. Editais_ANALISAR")],
+}
+
+
+def _migrar(memoria: SistemaMemoria, **opcoes: Any) -> Tuple[ResumoMigracao, Dict[str, MigracaoCliente]]:
+    itens: List[MigracaoCliente] = []
+    resumo = migrar_raiz(RAIZ, itens.append, sistema=memoria, migracoes=MIGRACOES, versao_atual=3, **opcoes)
+    return resumo, {item.pasta.name: item for item in itens}
+
+
+def test_migracao_idempotente(memoria: SistemaMemoria) -> None:
+    for nome in ("A", "B"):
+        criar_arvore(RAIZ / nome, ESTRUTURA_PADRAO, sistema=memoria, marcador=True)
+    documento = RAIZ / "A" / "01. Licitacao" / "03. Declinada" / "doc.pdf"
+    memoria.escrever_texto(documento, "x")
+    criar_arvore(RAIZ / "semmarca", ["X"], sistema=memoria)
+    criar_arvore(RAIZ / "outro", ESTRUTURA_PADRAO, sistema=memoria, marcador=True, tipo_modelo="sp")
+
+    ensaio, _ = _migrar(memoria, ensaio=True)
+    assert ensaio.passos == 6 and ler_marcador(RAIZ / "A", memoria)["versao"] == 1
+
+    resumo, itens = _migrar(memoria)
+    assert resumo.ok and resumo.passos == 6
+    assert itens["A"].situacao == "MIGRADO" and itens["A"].para == 3
+    assert itens["semmarca"].situacao == "SEM MARCADOR"
+    assert itens["outro"].situacao == "OUTRO MODELO" and memoria.existe(RAIZ / "outro" / "00. Editais_ANALISAR")
+    assert memoria.ler_texto(RAIZ / "A" / "01. Licitacao" / "03. Declinadas" / "doc.pdf") == "x"
+    assert memoria.existe(RAIZ / "A" / "01. Licitacao" / "00. Editais_ANALISAR")
+    assert not memoria.existe(RAIZ / "A" / "00. Editais_ANALISAR")
+    assert ler_marcador(RAIZ / "A", memoria)["versao"] == 3
+
+    # Segunda execução: nada a fazer
+    resumo, itens = _migrar(memoria)
+    assert resumo.passos == 0 and itens["A"].situacao == "EM DIA" and itens["B"].situacao == "EM DIA"
+
+    # Cliente com parte dos passos já feita (ex.: execução interrompida): o passo é reconhecido
+    criar_arvore(RAIZ / "C", ESTRUTURA_PADRAO, sistema=memoria, marcador=True)
+    memoria.rename(RAIZ / "C" / "01. Licitacao" / "03. Declinada", RAIZ / "C" / "01. Licitacao" / "03. Declinadas")
+    resumo, itens = _migrar(memoria)
+    assert itens["C"].situacao == "MIGRADO"
+    assert itens["C"].ja_aplicados == [str(MIGRACOES[2][1])]
+
+
+class MemoriaSemMaiusculas(SistemaMemoria):
+    """Como um disco Windows/SMB: o caminho acha a pasta com qualquer combinação de maiúsculas."""
+
+    def _partes(self, caminho: Any) -> Tuple[str, ...]:
+        partes = PurePath(caminho).parts
+        resolvidas: Tuple[str, ...] = partes[:1]
+        for nome in partes[1:]:
+            filhos = self._filhos.get(resolvidas, {})
+            resolvidas += (next((n for n in filhos if n.casefold() == nome.casefold()), nome),)
+        return resolvidas
+
+
+def test_renomear_so_maiusculas_em_disco_sem_diferenca() -> None:
+    memoria = MemoriaSemMaiusculas()
+    memoria.mkdir(RAIZ)
+    migracoes = {2: [renomear("02. Empresa/Contratos", "contratos"), renomear("02. Empresa/Vazia", "VAZIA")]}
+    for nome in ("A", "B"):
+        criar_arvore(
+            RAIZ / nome, {"02. Empresa": ["Contratos", "Vazia"]}, sistema=memoria, marcador=True, tipo_modelo="padrao"
+        )
+    memoria.escrever_texto(RAIZ / "A" / "02. Empresa" / "Contratos" / "doc.pdf", "x")
+
+    itens: List[MigracaoCliente] = []
+    resumo = migrar_raiz(RAIZ, itens.append, sistema=memoria, migracoes=migracoes, versao_atual=2)
+
+    assert resumo.ok and {item.situacao for item in itens} == {"MIGRADO"}
+    assert [e.nome for e in memoria.scandir(RAIZ / "A" / "02. Empresa")] == ["contratos", "VAZIA"]
+    assert memoria.ler_texto(RAIZ / "A" / "02. Empresa" / "contratos" / "doc.pdf") == "x"
+
+    # Segunda execução (com o marcador de volta à versão 1): já aplicado
+    for nome in ("A", "B"):
+        memoria.escrever_texto(RAIZ / nome / MARCADOR, '{"versao": 1}')
+    itens.clear()
+    migrar_raiz(RAIZ, itens.append, sistema=memoria, migracoes=migracoes, versao_atual=2)
+    assert all(item.situacao == "MIGRADO" and not item.aplicados and len(item.ja_aplicados) == 2 for item in itens)
+
+
+def test_migracoes_invalidas() -> None:
+    for ruins in ({1: []}, {2: [renomear("a", "b/c")]}, {2: [mover("a", "a/b")]}, {2: [adicionar("../x")]}):
+        with pytest.raises(ValueError):
+            validar_migracoes(ruins, 3)
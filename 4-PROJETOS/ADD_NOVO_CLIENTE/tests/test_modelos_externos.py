@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+Modelos externos: leitura dos arquivos, cache, herança (base +
+remover/substituir/adicionar), padrao.json estendendo o embutido e erros.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, ErroModelo, carregar_modelo, compilar_plano, estender, listar_tipos
+
+
+def _gravar(pasta: Path, nome: str, dados: Any) -> None:
+    (pasta / nome).write_text(json.dumps(dados, ensure_ascii=False), encoding="utf-8")
+
+
+def _caminhos(modelo: Any) -> List[str]:
+    return [str(no.relativo) for no in modelo.plano]
+
+
+def test_documento_json_e_toml(modelos: Path) -> None:
+    _gravar(modelos, "igual.json", {"descricao": "cópia", "estrutura": ESTRUTURA_PADRAO})
+    (modelos / "bahia.toml").write_text(
+        'descricao = "Bahia"\n[estrutura]\n"00. Editais" = {}\n"01. Lic" = { "01. Part" = ["01. JAN", "02. FEV"] }\n',
+        encoding="utf-8",
+    )
+
+    assert set(listar_tipos()) == {"bahia", "igual", "padrao"}
+    igual = carregar_modelo("igual")
+    assert igual.descricao == "cópia" and igual.plano.hash == compilar_plano(ESTRUTURA_PADRAO).hash
+    bahia = carregar_modelo("bahia")
+    assert bahia.tipo == "bahia" and bahia.descricao == "Bahia"
+    assert _caminhos(bahia) == ["00. Editais", "01. Lic", "01. Lic/01. Part", "01. Lic/01. Part/01. JAN", "01. Lic/01. Part/02. FEV"]
+    assert carregar_modelo("padrao").origem == "embutido"
+
+
+def test_cache_e_arquivo_alterado(modelos: Path) -> None:
+    _gravar(modelos, "sp.json", {"estrutura": {"A": {}}})
+    assert carregar_modelo("sp").origem == "arquivo"
+    assert carregar_modelo("sp").origem in ("cache", "memoria")
+
+    _gravar(modelos, "sp.json", {"estrutura": {"A": {}, "B": {}}})
+    sp = carregar_modelo("sp")
+    assert sp.origem == "arquivo" and _caminhos(sp) == ["A", "B"]
+
+
+def test_arvore_com_pasta_chamada_estrutura(modelos: Path) -> None:
+    # Sem valor de texto e com uma chave que não é de documento: é a própria árvore
+    _gravar(modelos, "arvore.json", {"estrutura": {"a": {}}, "base": {}, "Outra": {}})
+    assert _caminhos(carregar_modelo("arvore")) == ["estrutura", "estrutura/a", "base", "Outra"]
+
+
+@pytest.mark.parametrize(
+    "dados",
+    [
+        {"a/b": {}},
+        {"x": {"Docs": {}, "DOCS": {}}},
+        {"x ": {}},
+        {"descricao": "sem árvore"},
+        {"estrutura": {"a": {}}, "extra": "?"},
+    ],
+)
+def test_modelo_invalido(modelos: Path, dados: Any) -> None:
+    _gravar(modelos, "ruim.json", dados)
+    with pytest.raises(ErroModelo):
+        carregar_modelo("ruim", usar_cache=False)
+
+
+def test_tipo_inexistente(modelos: Path) -> None:
+    with pytest.raises(ErroModelo):
+        carregar_modelo("nao_existe")
+
+
+GERAL = {
+    "base": "padrao",
+    "remover": ["02. Empresa/09. CAF_Digital_BA"],
+    "substituir": {"06. Biblioteca/02. Carimbos": ["Digitais", "Fisicos"]},
+    "adicionar": {"02. Empresa": {"21. Novo_Cadastro": {}}, "07. Extra": ["a"]},
+}
+
+
+def test_sobreposicao_sobre_o_padrao(modelos: Path) -> None:
+    _gravar(modelos, "geral.json", GERAL)
+    _gravar(modelos, "sp.json", {"base": "geral", "descricao": "São Paulo", "adicionar": {"07. Extra": ["b"]}})
+    (modelos / "rel.toml").write_text('base = "geral.json"\nremover = ["07. Extra"]\n', encoding="utf-8")
+
+    geral = carregar_modelo("geral")
+    caminhos = _caminhos(geral)
+    assert "02. Empresa/09. CAF_Digital_BA" not in caminhos
+    assert "02. Empresa/21. Novo_Cadastro" in caminhos
+    assert "06. Biblioteca/02. Carimbos/Digitais" in caminhos
+    assert caminhos[-2:] == ["07. Extra", "07. Extra/a"]
+    assert geral.base == "padrao"
+
+    # Mesmo resultado pela API: a sobreposição não depende do arquivo
+    sobreposicao = {k: v for k, v in GERAL.items() if k != "base"}
+    assert estender(ESTRUTURA_PADRAO, sobreposicao).hash == geral.plano.hash
+
+    sp = carregar_modelo("sp")
+    assert sp.descricao == "São Paulo" and _caminhos(sp)[-3:] == ["07. Extra", "07. Extra/a", "07. Extra/b"]
+    assert "07. Extra" not in _caminhos(carregar_modelo("rel"))
+
+
+def test_base_alterada_recompila_o_filho(modelos: Path) -> None:
+    _gravar(modelos, "geral.json", GERAL)
+    _gravar(modelos, "sp.json", {"base": "geral", "adicionar": {"08. SP": {}}})
+    assert carregar_modelo("sp").origem == "arquivo"
+    assert carregar_modelo("sp").origem in ("cache", "memoria")
+
+    _gravar(modelos, "geral.json", {"base": "padrao", "adicionar": {"09. Outro": {}}})
+    sp = carregar_modelo("sp")
+    assert "09. Outro" in _caminhos(sp) and "07. Extra" not in _caminhos(sp)
+
+
+def test_padrao_json_estende_o_embutido(modelos: Path) -> None:
+    _gravar(modelos, "padrao.json", {"base": "padrao", "adicionar": {"99. Local": {}}})
+
+    modelo = carregar_modelo("padrao")
+    assert modelo.arquivo == modelos / "padrao.json"
+    assert _caminhos(modelo) == [str(no.relativo) for no in compilar_plano(ESTRUTURA_PADRAO)] + ["99. Local"]
+
+
+@pytest.mark.parametrize(
+    "dados",
+    [
+        {"base": "padrao", "remover": ["nao/existe"]},
+        {"base": "padrao", "estrutura": {}},
+        {"estrutura": {"a": {}}, "remover": []},
+        {"base": "padrao", "adicionar": {"01. LICITACAO": {}}},
+        {"base": "inexistente"},
+    ],
+)
+def test_sobreposicao_invalida(modelos: Path, dados: Any) -> None:
+    _gravar(modelos, "ruim.json", dados)
+    with pytest.raises(ErroModelo):
+        carregar_modelo("ruim", usar_cache=False)
+
+
+def test_heranca_circular(modelos: Path) -> None:
+    _gravar(modelos, "c1.json", {"base": "c2"})
+    _gravar(modelos, "c2.json", {"base": "c1"})
+    with pytest.raises(ErroModelo):
+        carregar_modelo("c1")
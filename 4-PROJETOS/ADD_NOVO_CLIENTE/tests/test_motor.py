@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+criar_arvore e o plano compilado.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path, PurePath
+from typing import List
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, compilar_plano, criar_arvore
+from licitagov_estruturas.motor import MARCADOR, Progresso, TokenCancelamento, ler_marcador
+from licitagov_estruturas.sistema_arquivos import SistemaArquivos, SistemaMemoria
+
+from .conftest import RAIZ
+
+CLIENTE = RAIZ / "Cliente"
+
+
+def _pastas(sistema: SistemaArquivos, base: Path) -> List[str]:
+    """Todas as pastas sob 'base' (caminhos relativos, ordenados)."""
+    encontradas: List[str] = []
+    pendentes = [base]
+    while pendentes:
+        pasta = pendentes.pop()
+        for entrada in sistema.scandir(pasta):
+            if entrada.pasta:
+                encontradas.append(str((pasta / entrada.nome).relative_to(base)))
+                pendentes.append(pasta / entrada.nome)
+    return sorted(encontradas)
+
+
+def test_plano_na_ordem_do_modelo() -> None:
+    modelo = {"B": {"B2": {}, "B1": ["x", "y"]}, "A": {}}
+    plano = compilar_plano(modelo)
+
+    assert [str(no.relativo) for no in plano] == ["B", "B/B2", "B/B1", "B/B1/x", "B/B1/y", "A"]
+    assert [no.nivel for no in plano] == [0, 1, 1, 2, 2, 0]
+    assert [no.pai for no in plano] == [-1, 0, 0, 2, 2, -1]
+    assert compilar_plano(dict(modelo)) is plano  # Memoizado pelo hash
+
+
+def test_cria_na_ordem_do_plano(memoria: SistemaMemoria) -> None:
+    log: List[str] = []
+    r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, log.append, sistema=memoria)
+
+    plano = compilar_plano(ESTRUTURA_PADRAO)
+    assert r.ok and r.criadas == [CLIENTE / no.relativo for no in plano]
+    assert log == [f"{'  ' * no.nivel}Criado: {CLIENTE / no.relativo}" for no in plano]
+    assert _pastas(memoria, CLIENTE) == sorted(str(no.relativo) for no in plano)
+
+
+def test_paralelo_gera_o_mesmo_log() -> None:
+    resultados = []
+    for trabalhadores in (1, 8):
+        sistema = SistemaMemoria()
+        sistema.mkdir(RAIZ)
+        log: List[str] = []
+        r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, log.append, sistema=sistema, trabalhadores=trabalhadores)
+        resultados.append((log, r.criadas, _pastas(sistema, CLIENTE)))
+
+    assert resultados[0] == resultados[1]
+
+
+def test_incremental_nao_recria(memoria: SistemaMemoria) -> None:
+    criar_arvore(CLIENTE, ESTRUTURA_PADRAO, sistema=memoria)
+    memoria.rmdir(CLIENTE / "00. Editais_ANALISAR")
+
+    r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, sistema=memoria, incremental=True)
+    assert r.ok and r.criadas == [CLIENTE / "00. Editais_ANALISAR"]
+    assert r.listagens > 0
+
+    r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, sistema=memoria, incremental=True)
+    assert r.ok and r.criadas == [] and len(r.existentes) == len(compilar_plano(ESTRUTURA_PADRAO))
+
+
+def test_marcador_pula_cliente_pronto(memoria: SistemaMemoria) -> None:
+    r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, sistema=memoria, marcador=True)
+    assert r.ok and not r.pulado
+
+    dados = ler_marcador(CLIENTE, memoria)
+    assert dados is not None
+    assert dados["hash"] == compilar_plano(ESTRUTURA_PADRAO).hash and dados["modelo"] == "padrao"
+
+    memoria.rmdir(CLIENTE / "00. Editais_ANALISAR")
+    r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, sistema=memoria, marcador=True)
+    assert r.pulado and r.criadas == [] and r.listagens == 0
+
+    # verificar=True ignora o marcador e confere pasta a pasta
+    r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, sistema=memoria, marcador=True, verificar=True, incremental=True)
+    assert not r.pulado and r.criadas == [CLIENTE / "00. Editais_ANALISAR"]
+
+
+def test_marcador_de_outro_modelo_nao_pula(memoria: SistemaMemoria) -> None:
+    criar_arvore(CLIENTE, ["A"], sistema=memoria, marcador=True)
+    assert ler_marcador(CLIENTE, memoria)["modelo"] is None  # Modelo avulso
+
+    r = criar_arvore(CLIENTE, ["A", "B"], sistema=memoria, marcador=True, incremental=True)
+    assert not r.pulado and r.criadas == [CLIENTE / "B"]
+
+
+def test_por_descritor_equivale_ao_normal(tmp_path: Path, memoria: SistemaMemoria) -> None:
+    # Memória (sem dir_fd) e disco local (com dir_fd, onde houver)
+    r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, sistema=memoria, por_descritor=True, trabalhadores=4)
+    assert r.ok and _pastas(memoria, CLIENTE) == sorted(str(no.relativo) for no in compilar_plano(ESTRUTURA_PADRAO))
+
+    logs = []
+    for nome, por_descritor in (("normal", False), ("descritor", True)):
+        base = tmp_path / nome
+        base.mkdir()
+        log: List[str] = []
+        r = criar_arvore(base, ESTRUTURA_PADRAO, log.append, por_descritor=por_descritor)
+        assert r.ok
+        logs.append([linha.replace(str(base), "X") for linha in log])
+        assert sorted(str(p.relative_to(base)) for p in base.rglob("*")) == _pastas(memoria, CLIENTE)
+    assert logs[0] == logs[1]
+
+
+def test_montagem_move_a_arvore_pronta(memoria: SistemaMemoria) -> None:
+    r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, sistema=memoria, montagem=True, marcador=True)
+
+    assert r.ok and r.montada
+    assert [e.nome for e in memoria.scandir(RAIZ)] == ["Cliente"]  # Nada de pasta de montagem
+    assert len(_pastas(memoria, CLIENTE)) == len(compilar_plano(ESTRUTURA_PADRAO))
+    assert memoria.existe(CLIENTE / MARCADOR)
+
+    # Base já preenchida: caminho normal (o marcador pula)
+    r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, sistema=memoria, montagem=True, marcador=True)
+    assert r.pulado and not r.montada
+
+
+def test_cancelamento_no_meio(memoria: SistemaMemoria) -> None:
+    cancelamento = TokenCancelamento()
+
+    class CancelaAos10(Progresso):
+        def avancar(self, n: int = 1) -> None:
+            super().avancar(n)
+            if self.feitos >= 10:
+                cancelamento.cancelar()
+
+    total = len(compilar_plano(ESTRUTURA_PADRAO))
+    r = criar_arvore(
+        CLIENTE, ESTRUTURA_PADRAO, sistema=memoria, marcador=True,
+        cancelamento=cancelamento, progresso=CancelaAos10(total),
+    )
+
+    assert r.cancelado and len(r.criadas) == 10
+    assert sorted(str(PurePath(p).relative_to(CLIENTE)) for p in r.criadas) == _pastas(memoria, CLIENTE)
+    assert not memoria.existe(CLIENTE / MARCADOR)
+    assert "pastas_criadas" in r.como_dict()
+
+    # Uma execução incremental continua de onde parou
+    r = criar_arvore(CLIENTE, ESTRUTURA_PADRAO, sistema=memoria, incremental=True)
+    assert r.ok and len(r.criadas) == total - 10
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+Perfil: arquivos .pstats e .txt, threads perfiladas e falha ao gravar.
+"""
+
+from __future__ import annotations
+
+import pstats
+from pathlib import Path
+
+import pytest
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, criar_arvore
+from licitagov_estruturas.cli import SAIDA_OK, main
+from licitagov_estruturas.perfil import Perfil
+from licitagov_estruturas.sistema_arquivos import SistemaMemoria
+
+from .conftest import RAIZ
+
+
+def test_grava_pstats_e_resumo(tmp_path: Path, memoria: SistemaMemoria) -> None:
+    with Perfil("teste", pasta=tmp_path) as perfil:
+        # Com trabalhadores, os mkdir acontecem nas threads do pool
+        criar_arvore(RAIZ / "A", ESTRUTURA_PADRAO, sistema=memoria, trabalhadores=4)
+
+    assert perfil.erro == "" and perfil.arquivos is not None
+    arquivo_pstats, arquivo_txt = perfil.arquivos
+    assert arquivo_pstats.parent == tmp_path and arquivo_pstats.name.startswith("perfil_teste_")
+    assert arquivo_pstats.suffix == ".pstats" and arquivo_txt.suffix == ".txt"
+
+    estatisticas = pstats.Stats(str(arquivo_pstats))
+    funcoes = {chave[2] for chave in estatisticas.stats}  # type: ignore[attr-defined]
+    assert {"criar_arvore", "mkdir"} <= funcoes
+
+    texto = arquivo_txt.read_text(encoding="utf-8")
+    assert texto.startswith("Perfil 'teste'")
+    assert "maior tempo acumulado" in texto and "maior tempo próprio" in texto
+    assert "criar_arvore" in texto
+
+
+def test_falha_ao_gravar_nao_interrompe(tmp_path: Path) -> None:
+    arquivo = tmp_path / "arquivo"
+    arquivo.write_text("")
+    with Perfil("teste", pasta=arquivo / "nao_e_pasta") as perfil:
+        sum(range(1000))
+    assert perfil.arquivos is None and perfil.erro
+
+
+def test_cli_profile_grava_na_pasta_de_logs(
+    tmp_path: Path, dados: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert main(["create", str(tmp_path / "A"), "--profile", "-q"]) == SAIDA_OK
+    gravados = sorted(p.suffix for p in (dados / "logs").glob("perfil_create_*"))
+    assert gravados == [".pstats", ".txt"]
+    assert "Perfil gravado em:" in capsys.readouterr().err
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""
+Plano compilado: hash igual ao do json.dumps, modelos muito profundos e
+o cache de planos.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from pathlib import PurePath
+from types import MappingProxyType
+from typing import Any, Dict
+
+import pytest
+
+from licitagov_estruturas import ESTRUTURA_PADRAO, compilar_plano, hash_modelo
+from licitagov_estruturas import plano as plano_modulo
+from licitagov_estruturas.plano import _json_em_partes, _json_modelo
+
+MODELOS = [
+    ESTRUTURA_PADRAO,
+    {},
+    [],
+    ["a", "b"],
+    ("a", "b"),
+    {"A": {"B": ["x", "y"], "C": {}}, "D": []},
+    {"Ação": {"Licitação 2024": ["São Paulo", "Ñandú", "日本", "emoji 📁"]}},
+    {'as "aspas"': {"barra \\ invertida": {}, "tab\tquebra\nfim": {}, "\x01controle": []}},
+    {"folhas": {"nulo": None, "verdadeiro": True, "falso": False, "numero": 3, "real": 1.5}},
+    {1: {}, 2.5: {}, True: {}, None: {}},
+    {"proxy": MappingProxyType({"dentro": {"x": {}}})},
+]
+
+
+@pytest.mark.parametrize("modelo", MODELOS)
+def test_serializacao_iterativa_igual_ao_json(modelo: Any) -> None:
+    esperado = json.dumps(modelo, ensure_ascii=False, default=_json_modelo)
+    assert "".join(_json_em_partes(modelo)) == esperado
+    assert hash_modelo(modelo) == hashlib.sha256(esperado.encode("utf-8")).hexdigest()
+
+
+def _profundo(niveis: int) -> Dict[str, Any]:
+    modelo: Dict[str, Any] = {"fundo": ["a", "b"]}
+    for i in range(niveis - 1, 0, -1):
+        modelo = {f"{i:04d}. Nível": modelo, f"{i:04d}. Irmã": {}}
+    return modelo
+
+
+def test_modelo_com_mil_niveis() -> None:
+    modelo = _profundo(1000)
+    with pytest.raises(RecursionError):
+        json.dumps(modelo)  # Por isso o caminho iterativo existe
+
+    # Com limite de recursão folgado o json consegue: o texto tem de ser o mesmo
+    limite = sys.getrecursionlimit()
+    sys.setrecursionlimit(20000)
+    try:
+        esperado = json.dumps(modelo, ensure_ascii=False, default=_json_modelo)
+    finally:
+        sys.setrecursionlimit(limite)
+    assert "".join(_json_em_partes(modelo)) == esperado
+    assert hash_modelo(modelo) == hashlib.sha256(esperado.encode("utf-8")).hexdigest()
+
+    plano = compilar_plano(modelo)
+    assert max(no.nivel for no in plano) == 1000
+    assert len(plano) == 2 * 999 + 1 + 2
+    # Pré-ordem: desce tudo até "fundo" e as irmãs vêm na volta, da mais funda à primeira
+    assert [no.nome for no in plano.nos[999:1003]] == ["fundo", "a", "b", "0999. Irmã"]
+    assert plano.nos[-1].relativo == PurePath("0001. Irmã")
+
+
+def test_referencia_circular() -> None:
+    modelo: Dict[str, Any] = {"a": {}}
+    modelo["a"]["b"] = modelo
+    with pytest.raises(ValueError):
+        "".join(_json_em_partes(modelo))
+
+
+def test_cache_de_planos_limitado(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(plano_modulo, "LIMITE_PLANOS", 3)
+    primeiro = compilar_plano(["cache-0"])
+    for i in range(1, 6):
+        compilar_plano([f"cache-{i}"])
+        assert compilar_plano(["cache-0"]) is primeiro  # Usado agora: continua
+
+    assert len(plano_modulo._PLANOS_COMPILADOS) <= 3
+    assert plano_modulo._plano_em_cache(hash_modelo(["cache-1"])) is None  # O mais antigo saiu
+
+
+def test_mesmo_objeto_nao_e_serializado_de_novo(monkeypatch: pytest.MonkeyPatch) -> None:
+    modelo = {"Identidade": {"A": {}, "B": ["x"]}}
+    plano = compilar_plano(modelo)
+    padrao = compilar_plano(ESTRUTURA_PADRAO)
+
+    def falhar(_modelo: Any) -> str:
+        raise AssertionError("hash_modelo chamado para um objeto já compilado")
+
+    monkeypatch.setattr(plano_modulo, "hash_modelo", falhar)
+    assert compilar_plano(modelo) is plano
+    assert compilar_plano(ESTRUTURA_PADRAO) is padrao
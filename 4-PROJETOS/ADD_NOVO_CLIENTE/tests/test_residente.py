@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+Modo residente: arquivo de contato, segredo e entrega dos argumentos.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from licitagov_estruturas import residente
+from licitagov_estruturas.residente import ServidorResidente, atender_relancamento, enviar_para_residente
+
+
+@pytest.fixture
+def servidor(dados: Path) -> Iterator["queue.Queue[List[str]]"]:
+    """Instância residente atendendo; a fila recebe os argv entregues a ela."""
+    dados.mkdir(parents=True, exist_ok=True)
+    recebidos: "queue.Queue[List[str]]" = queue.Queue()
+    instancia = ServidorResidente(recebidos.put)
+    assert instancia.iniciar()
+    yield recebidos
+    instancia.encerrar()
+    assert not (dados / residente.RESIDENTE).exists()
+
+
+def test_relancamento_sem_opcoes_entrega_a_residente(servidor: "queue.Queue[List[str]]") -> None:
+    # Duplo clique comum (nenhuma opção): também vai para a instância aberta
+    assert atender_relancamento([]) is True
+    assert servidor.get(timeout=2) == []
+    assert atender_relancamento([r"C:\Clientes\Empresa X", "--profile"]) is True
+    assert servidor.get(timeout=2) == [r"C:\Clientes\Empresa X", "--profile"]
+
+
+def test_segredo_errado_e_recusado(servidor: "queue.Queue[List[str]]", dados: Path) -> None:
+    arquivo = dados / residente.RESIDENTE
+    contato = json.loads(arquivo.read_text(encoding="utf-8"))
+    arquivo.write_text(json.dumps({**contato, "token": "0" * 32}), encoding="utf-8")
+    assert enviar_para_residente(["--encerrar"]) is False
+    assert atender_relancamento([]) is False  # Abre normalmente
+    assert servidor.empty()
+    arquivo.write_text(json.dumps(contato), encoding="utf-8")  # Para encerrar() reconhecer o arquivo
+
+
+def test_sem_residente(dados: Path) -> None:
+    assert enviar_para_residente([]) is False
+    assert atender_relancamento([]) is False
+    assert atender_relancamento(["--encerrar"]) is True  # Não há o que fechar
+
+    # Arquivo que sobrou de uma instância que caiu: ninguém na porta
+    dados.mkdir(parents=True, exist_ok=True)
+    (dados / residente.RESIDENTE).write_text(json.dumps({"porta": 9, "token": "x"}), encoding="utf-8")
+    assert atender_relancamento(["--residente"]) is False
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+"""
+SistemaArquivos: interface abstrata e gravação atômica do SistemaLocal.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from licitagov_estruturas.sistema_arquivos import SISTEMA_LOCAL, SistemaArquivos, SistemaMemoria
+
+
+def test_primitivas_sao_obrigatorias() -> None:
+    class SoMkdir(SistemaArquivos):
+        def mkdir(self, caminho: object) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="scandir"):
+        SoMkdir()  # type: ignore[abstract]
+    SistemaMemoria()
+
+
+def test_escrever_texto_substitui_sem_deixar_temporario(tmp_path: Path) -> None:
+    arquivo = tmp_path / ".marcador.json"
+    SISTEMA_LOCAL.escrever_texto(arquivo, "v1", oculto=True)
+    SISTEMA_LOCAL.escrever_texto(arquivo, "v2 — ç", oculto=True)
+    assert SISTEMA_LOCAL.ler_texto(arquivo) == "v2 — ç"
+    assert os.listdir(tmp_path) == [arquivo.name]
+
+
+def test_escrever_texto_falho_mantem_o_anterior(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    arquivo = tmp_path / "marcador.json"
+    SISTEMA_LOCAL.escrever_texto(arquivo, "antigo")
+
+    def sem_espaco(_origem: str, _destino: str) -> None:
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "replace", sem_espaco)
+    with pytest.raises(OSError):
+        SISTEMA_LOCAL.escrever_texto(arquivo, "novo")
+    assert arquivo.read_text(encoding="utf-8") == "antigo"
+    assert os.listdir(tmp_path) == [arquivo.name]